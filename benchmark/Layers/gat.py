@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Benchmark of the PyTorch `GraphAttention` (dense attention) and
+`SparseGraphAttention` (edge-wise attention) layers, it reports the time
+of a forward and backward pass and the peak CUDA memory (if available)
+for growing graphs.
+
+python gat.py
+"""
+import time
+import torch
+import numpy as np
+import scipy.sparse as sp
+
+from graphgallery import functional as gf
+from graphgallery.nn.layers.pytorch import GraphAttention, SparseGraphAttention
+
+
+def random_graph(num_nodes, avg_degree, seed=42):
+    rng = np.random.RandomState(seed)
+    num_edges = num_nodes * avg_degree // 2
+    row = rng.randint(0, num_nodes, size=num_edges)
+    col = rng.randint(0, num_nodes, size=num_edges)
+    adj_matrix = sp.csr_matrix((np.ones(num_edges, dtype=np.float32), (row, col)),
+                               shape=(num_nodes, num_nodes))
+    return adj_matrix.maximum(adj_matrix.T).tocsr()
+
+
+def forward_backward(layer, x, adj, device, repeat=3):
+    if device.type == "cuda":
+        torch.cuda.reset_peak_memory_stats(device)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        layer.zero_grad()
+        layer([x, adj]).sum().backward()
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+        peak = torch.cuda.max_memory_allocated(device) / 2**20
+    else:
+        peak = float("nan")
+    return (time.perf_counter() - start) / repeat, peak
+
+
+if __name__ == "__main__":
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    in_channels, out_channels, heads = 64, 8, 8
+
+    print(f"{'num_nodes':>10} {'num_edges':>10} {'layer':>8} {'time(s)':>8} {'peak(MiB)':>10}")
+    for num_nodes in (10**3, 10**4, 3 * 10**4, 10**5):
+        adj_matrix = gf.add_selfloops(random_graph(num_nodes, avg_degree=10))
+        x = torch.randn(num_nodes, in_channels, device=device)
+        adj_matrix = adj_matrix.tocoo()
+        adj = torch.sparse_coo_tensor(np.vstack([adj_matrix.row, adj_matrix.col]),
+                                      adj_matrix.data, adj_matrix.shape,
+                                      dtype=torch.float32, device=device).coalesce()
+        for name, Layer in (("dense", GraphAttention), ("sparse", SparseGraphAttention)):
+            # the dense layer holds N x N attention for each head
+            if name == "dense" and num_nodes > 3 * 10**4:
+                print(f"{num_nodes:>10} {adj_matrix.nnz:>10} {name:>8} {'OOM':>8} {'-':>10}")
+                continue
+            layer = Layer(in_channels, out_channels, attn_heads=heads).to(device)
+            elapsed, peak = forward_backward(layer, x, adj, device)
+            print(f"{num_nodes:>10} {adj_matrix.nnz:>10} {name:>8} {elapsed:8.3f} {peak:10.1f}")
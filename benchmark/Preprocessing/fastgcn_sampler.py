@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Benchmark of the importance sampling of `FastGCNBatchSequence`,
+it reports the time of sampling a batch against the previous
+implementation, which summed the batch rows and renormalized the
+distribution with `np.random.choice` for each batch.
+
+python fastgcn_sampler.py
+"""
+import timeit
+import numpy as np
+import scipy.sparse as sp
+
+from graphgallery import functional as gf
+from graphgallery.sequence import FastGCNBatchSequence
+
+
+def random_graph(num_nodes, avg_degree, seed=42):
+    rng = np.random.RandomState(seed)
+    num_edges = num_nodes * avg_degree // 2
+    row = rng.randint(0, num_nodes, size=num_edges)
+    col = rng.randint(0, num_nodes, size=num_edges)
+    adj_matrix = sp.csr_matrix((np.ones(num_edges, dtype=np.float32), (row, col)),
+                               shape=(num_nodes, num_nodes))
+    return adj_matrix.maximum(adj_matrix.T).tocsr()
+
+
+def legacy_sample(adj_matrix, p, rank):
+    distr = adj_matrix.sum(0).A1.nonzero()[0]
+    if rank > distr.size:
+        return distr
+    return np.random.choice(distr, rank, replace=False, p=p[distr] / p[distr].sum())
+
+
+if __name__ == "__main__":
+    batch_size, rank, number = 256, 100, 20
+    print(f"{'num_nodes':>10} {'num_edges':>10} {'legacy(ms)':>11} {'sample(ms)':>11} {'replace(ms)':>12}")
+    for num_nodes in (10**4, 10**5, 10**6):
+        adj_matrix = gf.normalize_adj(random_graph(num_nodes, avg_degree=20))
+        node_attr = np.zeros((num_nodes, 1), dtype=np.float32)
+        sequence = FastGCNBatchSequence([node_attr, adj_matrix], np.zeros(num_nodes),
+                                        batch_size=batch_size, rank=rank)
+        replace_sequence = FastGCNBatchSequence([node_attr, adj_matrix], np.zeros(num_nodes),
+                                                batch_size=batch_size, rank=rank, replace=True)
+        batch = adj_matrix[:batch_size]
+        legacy = timeit.timeit(lambda: legacy_sample(batch, sequence.p, rank),
+                               number=number) / number
+        fast = timeit.timeit(lambda: sequence.sample(batch), number=number) / number
+        replace = timeit.timeit(lambda: replace_sequence.sample(batch), number=number) / number
+        print(f"{num_nodes:>10} {adj_matrix.nnz:>10} {legacy * 1e3:11.2f} {fast * 1e3:11.2f} {replace * 1e3:12.2f}")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Benchmark of the graph partitioners for ClusterGCN in
+`graphgallery.functional`, it reports the partition time and the
+edge-cut ratio (the ratio of edges dropped by ClusterGCN) on graphs
+with community structure.
+
+python graph_partition.py
+"""
+import time
+import numpy as np
+import scipy.sparse as sp
+
+from graphgallery import functional as gf
+from graphgallery.functional.adj_matrix.graph_partition import (metis, metis_clustering,
+                                                                random_clustering)
+
+
+def random_graph(num_nodes, avg_degree, n_communities, p_in=0.9, seed=42):
+    """A random graph where a ratio `p_in` of edges are within communities."""
+    rng = np.random.RandomState(seed)
+    num_edges = num_nodes * avg_degree // 2
+    community = rng.randint(0, n_communities, size=num_nodes)
+    members = np.argsort(community, kind="stable")
+    offsets = np.r_[0, np.cumsum(np.bincount(community, minlength=n_communities))]
+
+    row = rng.randint(0, num_nodes, size=num_edges)
+    c = community[row]
+    intra = members[offsets[c] + (rng.rand(num_edges) * (offsets[c + 1] - offsets[c])).astype(int)]
+    col = np.where(rng.rand(num_edges) < p_in, intra,
+                   rng.randint(0, num_nodes, size=num_edges))
+    adj_matrix = sp.csr_matrix((np.ones(num_edges, dtype=np.float32), (row, col)),
+                               shape=(num_nodes, num_nodes))
+    return adj_matrix.maximum(adj_matrix.T).tocsr()
+
+
+PARTITIONERS = {
+    "random": lambda adj_matrix, n_clusters: random_clustering(adj_matrix.shape[0], n_clusters),
+    "bfs": gf.bfs_clustering,
+}
+if metis:
+    PARTITIONERS["metis"] = metis_clustering
+
+
+if __name__ == "__main__":
+    # compile
+    gf.bfs_clustering(random_graph(100, 5, 4), 4)
+
+    print(f"{'num_nodes':>10} {'num_edges':>10} {'n_clusters':>10} {'method':>7} {'time(s)':>8} {'edge-cut':>9}")
+    for num_nodes in (10**4, 10**5, 10**6):
+        adj_matrix = random_graph(num_nodes, avg_degree=20, n_communities=num_nodes // 500)
+        for n_clusters in (10, 100):
+            for method, partition in PARTITIONERS.items():
+                start = time.perf_counter()
+                parts = partition(adj_matrix, n_clusters)
+                elapsed = time.perf_counter() - start
+                cut = gf.edge_cut(adj_matrix, np.asarray(parts))
+                print(f"{num_nodes:>10} {adj_matrix.nnz:>10} {n_clusters:>10} {method:>7} {elapsed:8.2f} {cut:9.3f}")
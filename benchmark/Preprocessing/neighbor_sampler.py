@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Benchmark of `graphgallery.functional.neighbor_sampler`
+against the per-node Python loop it replaces.
+
+python neighbor_sampler.py
+"""
+import time
+import numpy as np
+import scipy.sparse as sp
+
+from graphgallery import functional as gf
+
+
+def random_graph(num_nodes, avg_degree, seed=42):
+    rng = np.random.RandomState(seed)
+    num_edges = num_nodes * avg_degree
+    row = rng.randint(0, num_nodes, size=num_edges)
+    col = rng.randint(0, num_nodes, size=num_edges)
+    adj_matrix = sp.csr_matrix((np.ones(num_edges, dtype=np.float32), (row, col)),
+                               shape=(num_nodes, num_nodes))
+    return adj_matrix
+
+
+def loop_neighbor_sampler(adj_matrix, max_degree=25):
+    N = adj_matrix.shape[0]
+    neighbors_matrix = N * np.ones((N + 1, max_degree), dtype=np.int32)
+    for nodeid in range(N):
+        neighbors = adj_matrix[nodeid].indices
+        size = neighbors.size
+        if size == 0:
+            continue
+        if size > max_degree:
+            neighbors = np.random.choice(neighbors, max_degree, replace=False)
+        elif size < max_degree:
+            neighbors = np.random.choice(neighbors, max_degree, replace=True)
+        neighbors_matrix[nodeid] = neighbors
+    np.random.shuffle(neighbors_matrix.T)
+    return neighbors_matrix
+
+
+def timeit(func, *args, repeat=3, **kwargs):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    # compile
+    gf.neighbor_sampler(random_graph(100, 5), max_degree=5)
+
+    print(f"{'num_nodes':>10} {'max_degree':>10} {'loop (s)':>10} {'numba (s)':>10}")
+    for num_nodes in (10**4, 10**5, 10**6, 2 * 10**6):
+        adj_matrix = random_graph(num_nodes, avg_degree=10)
+        for max_degree in (10, 25, 50):
+            if num_nodes <= 10**5:
+                loop = f"{timeit(loop_neighbor_sampler, adj_matrix, max_degree, repeat=1):10.3f}"
+            else:
+                loop = f"{'-':>10}"
+            fast = timeit(gf.neighbor_sampler, adj_matrix, max_degree=max_degree)
+            print(f"{num_nodes:>10} {max_degree:>10} {loop} {fast:10.3f}")
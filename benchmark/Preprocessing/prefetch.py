@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Benchmark of `graphgallery.sequence.PrefetchSequence`, it reports
+batches/sec of a `SAGEMiniBatchSequence` with and without prefetching,
+where the model step is simulated by a fixed amount of dense compute.
+
+python prefetch.py
+"""
+import time
+import numpy as np
+import scipy.sparse as sp
+
+from graphgallery import functional as gf
+from graphgallery.sequence import SAGEMiniBatchSequence, PrefetchSequence
+
+
+def random_graph(num_nodes, avg_degree, seed=42):
+    rng = np.random.RandomState(seed)
+    num_edges = num_nodes * avg_degree
+    row = rng.randint(0, num_nodes, size=num_edges)
+    col = rng.randint(0, num_nodes, size=num_edges)
+    adj_matrix = sp.csr_matrix((np.ones(num_edges, dtype=np.float32), (row, col)),
+                               shape=(num_nodes, num_nodes))
+    return adj_matrix
+
+
+def model_step(inputs, weight):
+    # stands in for the forward/backward pass
+    x = np.random.rand(2048, weight.shape[0]).astype(np.float32)
+    for _ in range(5):
+        x = np.tanh(x @ weight)
+    return x
+
+
+def batches_per_sec(sequence, weight, epochs=3):
+    n_batches = 0
+    start = time.perf_counter()
+    for _ in range(epochs):
+        for inputs, labels in sequence:
+            model_step(inputs, weight)
+            n_batches += 1
+        sequence.on_epoch_end()
+    return n_batches / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    num_nodes, num_attrs = 10**6, 64
+    adj_matrix = random_graph(num_nodes, avg_degree=15)
+    node_attr = np.random.rand(num_nodes + 1, num_attrs).astype(np.float32)
+    labels = np.random.randint(0, 10, size=num_nodes)
+    train_nodes = np.random.permutation(num_nodes)[:100000]
+    weight = np.random.rand(256, 256).astype(np.float32)
+    # compile
+    gf.sample_batch_neighbors(adj_matrix, train_nodes[:10], 5)
+
+    sequence = SAGEMiniBatchSequence([node_attr, adj_matrix, train_nodes],
+                                     labels[train_nodes], n_samples=(15, 5),
+                                     batch_size=512, shuffle=True)
+
+    print(f"{'workers':>8} {'ordered':>8} {'batches/sec':>12}")
+    print(f"{0:>8} {'-':>8} {batches_per_sec(sequence, weight):12.2f}")
+    for workers in (1, 2, 4):
+        for ordered in (True, False):
+            prefetch = PrefetchSequence(sequence, workers=workers,
+                                        max_queue_size=10, ordered=ordered)
+            print(f"{workers:>8} {str(ordered):>8} {batches_per_sec(prefetch, weight):12.2f}")
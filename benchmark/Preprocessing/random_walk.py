@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Benchmark of the random walk generators in `graphgallery.utils.walker`,
+it reports walks/sec for growing graphs, and the peak memory of
+materializing all sentences versus streaming them with `WalkCorpus`.
+
+python random_walk.py
+"""
+import time
+import resource
+import numpy as np
+import scipy.sparse as sp
+import multiprocessing as mp
+
+from graphgallery.utils.walker import (deepwalk_random_walk, node2vec_random_walk,
+                                       WalkCorpus)
+
+
+def random_graph(num_nodes, avg_degree, seed=42):
+    rng = np.random.RandomState(seed)
+    num_edges = num_nodes * avg_degree // 2
+    row = rng.randint(0, num_nodes, size=num_edges)
+    col = rng.randint(0, num_nodes, size=num_edges)
+    adj_matrix = sp.csr_matrix((np.ones(num_edges, dtype=np.float32), (row, col)),
+                               shape=(num_nodes, num_nodes))
+    return adj_matrix.maximum(adj_matrix.T).tocsr()
+
+
+def walks_per_sec(walk_fn, adj_matrix, **kwargs):
+    start = time.perf_counter()
+    walks = walk_fn(adj_matrix, **kwargs)
+    return walks.shape[0] / (time.perf_counter() - start)
+
+
+def _consume_sentences(args):
+    num_nodes, stream = args
+    adj_matrix = random_graph(num_nodes, avg_degree=20)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    corpus = WalkCorpus(adj_matrix, walk_length=80, walks_per_node=10)
+    if stream:
+        n_tokens = sum(len(sentence) for sentence in corpus)
+    else:
+        sentences = list(corpus)
+        n_tokens = sum(len(sentence) for sentence in sentences)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    return n_tokens, elapsed, peak / 2**10
+
+
+def sentence_memory(num_nodes, stream):
+    # a fresh process for each run, so that peak RSS is not shared
+    with mp.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+        return pool.apply(_consume_sentences, ((num_nodes, stream),))
+
+
+if __name__ == "__main__":
+    # compile
+    deepwalk_random_walk(random_graph(100, 5), walk_length=5, walks_per_node=1)
+    node2vec_random_walk(random_graph(100, 5), walk_length=5, walks_per_node=1)
+
+    print(f"{'num_nodes':>10} {'num_edges':>10} {'walker':>9} {'p':>5} {'q':>5} {'walks/sec':>12}")
+    for num_nodes in (10**4, 10**5, 10**6):
+        adj_matrix = random_graph(num_nodes, avg_degree=20)
+        speed = walks_per_sec(deepwalk_random_walk, adj_matrix,
+                              walk_length=80, walks_per_node=1)
+        print(f"{num_nodes:>10} {adj_matrix.nnz:>10} {'deepwalk':>9} {'-':>5} {'-':>5} {speed:12.0f}")
+        for p, q in ((1.0, 1.0), (0.5, 2.0), (4.0, 0.25)):
+            speed = walks_per_sec(node2vec_random_walk, adj_matrix,
+                                  walk_length=80, walks_per_node=1, p=p, q=q)
+            print(f"{num_nodes:>10} {adj_matrix.nnz:>10} {'node2vec':>9} {p:>5} {q:>5} {speed:12.0f}")
+
+    print()
+    print(f"{'num_nodes':>10} {'sentences':>10} {'tokens':>12} {'time(s)':>8} {'peak(MiB)':>10}")
+    for num_nodes in (10**4, 10**5):
+        for stream in (False, True):
+            n_tokens, elapsed, peak = sentence_memory(num_nodes, stream)
+            mode = "stream" if stream else "list"
+            print(f"{num_nodes:>10} {mode:>10} {n_tokens:>12} {elapsed:8.2f} {peak:10.1f}")
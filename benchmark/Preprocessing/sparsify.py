@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Benchmark of `graphgallery.functional.top_k_matrix` and
+`graphgallery.functional.clip_matrix` against the LIL/`np.vectorize`
+versions they replace, on matrices with 1M+ nonzeros.
+
+python sparsify.py
+"""
+import time
+import numpy as np
+import scipy.sparse as sp
+
+from graphgallery import functional as gf
+
+
+def random_matrix(num_nodes, nnz_per_row, seed=42):
+    rng = np.random.RandomState(seed)
+    nnz = num_nodes * nnz_per_row
+    row = rng.randint(0, num_nodes, size=nnz)
+    col = rng.randint(0, num_nodes, size=nnz)
+    data = rng.rand(nnz)
+    return sp.csr_matrix((data, (row, col)), shape=(num_nodes, num_nodes))
+
+
+def lil_top_k_matrix(matrix, k):
+    matrix = matrix.tolil()
+    data = matrix.data
+    for row in range(matrix.shape[0]):
+        t = np.asarray(data[row])
+        t[np.argsort(-t)[k:]] = 0.
+        data[row] = t.tolist()
+    matrix = matrix.tocsr()
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def vectorize_clip_matrix(matrix, threshold):
+    matrix = matrix.tocsr()
+    thres = np.vectorize(lambda x: x if x >= threshold else 0.)
+    matrix.data = thres(matrix.data)
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def timeit(func, matrix, *args):
+    # both implementations may work in place
+    matrix = matrix.copy()
+    start = time.perf_counter()
+    func(matrix, *args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    # compile
+    gf.top_k_matrix(random_matrix(100, 5), 2)
+
+    print(f"{'nnz':>10} {'op':>12} {'before (s)':>11} {'after (s)':>10}")
+    for num_nodes, nnz_per_row in ((10**5, 16), (10**5, 128), (10**6, 32)):
+        matrix = random_matrix(num_nodes, nnz_per_row)
+        nnz = matrix.nnz
+        print(f"{nnz:>10} {'top_k(16)':>12} {timeit(lil_top_k_matrix, matrix, 16):11.3f} "
+              f"{timeit(gf.top_k_matrix, matrix, 16):10.3f}")
+        print(f"{nnz:>10} {'clip(0.5)':>12} {timeit(vectorize_clip_matrix, matrix, 0.5):11.3f} "
+              f"{timeit(gf.clip_matrix, matrix, 0.5):10.3f}")
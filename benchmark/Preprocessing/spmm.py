@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Benchmark of `graphgallery.functional.spmm`, the multithreaded
+product of a CSR matrix and a dense matrix, against the single-threaded
+scipy product, across the number of nonzeros and feature widths.
+
+python spmm.py
+NUMBA_NUM_THREADS=8 python spmm.py
+"""
+import timeit
+import numba
+import numpy as np
+import scipy.sparse as sp
+
+from graphgallery import functional as gf
+
+
+def random_graph(num_nodes, avg_degree, seed=42):
+    rng = np.random.RandomState(seed)
+    num_edges = num_nodes * avg_degree // 2
+    row = rng.randint(0, num_nodes, size=num_edges)
+    col = rng.randint(0, num_nodes, size=num_edges)
+    adj_matrix = sp.csr_matrix((np.ones(num_edges, dtype=np.float32), (row, col)),
+                               shape=(num_nodes, num_nodes))
+    return adj_matrix.maximum(adj_matrix.T).tocsr()
+
+
+if __name__ == "__main__":
+    number = 5
+    print(f"threads: {numba.get_num_threads()}")
+    print(f"{'num_nodes':>10} {'nnz':>10} {'width':>6} {'scipy(ms)':>10} {'spmm(ms)':>9} {'speedup':>8}")
+    for num_nodes, avg_degree in ((10**4, 10), (10**5, 20), (10**6, 20)):
+        adj_matrix = gf.normalize_adj(random_graph(num_nodes, avg_degree))
+        for width in (16, 64, 256):
+            x = np.random.rand(num_nodes, width).astype(np.float32)
+            out = np.empty_like(x)
+            assert np.allclose(gf.spmm(adj_matrix, x, out=out), adj_matrix @ x, atol=1e-5)
+            scipy_time = timeit.timeit(lambda: adj_matrix @ x, number=number) / number
+            spmm_time = timeit.timeit(lambda: gf.spmm(adj_matrix, x, out=out), number=number) / number
+            print(f"{num_nodes:>10} {adj_matrix.nnz:>10} {width:>6} {scipy_time * 1e3:10.2f} "
+                  f"{spmm_time * 1e3:9.2f} {scipy_time / spmm_time:7.2f}x")
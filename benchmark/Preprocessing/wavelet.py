@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""Benchmark of `graphgallery.functional.wavelet_basis`, it reports the time
+and the peak memory of computing the wavelet basis and its inverse against
+the previous implementation, which built the Chebyshev polynomials
+as full sparse matrix products.
+
+python wavelet.py
+"""
+import time
+import resource
+import numpy as np
+import scipy.sparse as sp
+import multiprocessing as mp
+
+from sklearn.preprocessing import normalize
+
+from graphgallery import functional as gf
+from graphgallery.functional.adj_matrix.wavelet import laplacian, compute_cheb_coeff_basis
+
+
+def random_graph(num_nodes, avg_degree, seed=42):
+    rng = np.random.RandomState(seed)
+    num_edges = num_nodes * avg_degree // 2
+    row = rng.randint(0, num_nodes, size=num_edges)
+    col = rng.randint(0, num_nodes, size=num_edges)
+    adj_matrix = sp.csr_matrix((np.ones(num_edges, dtype=np.float32), (row, col)),
+                               shape=(num_nodes, num_nodes))
+    return adj_matrix.maximum(adj_matrix.T).tocsr()
+
+
+def legacy_wavelet_basis(adj_matrix, order=3, wavelet_s=1.0,
+                         threshold=1e-4, wavelet_normalize=False):
+    lap = laplacian(adj_matrix)
+    N = adj_matrix.shape[0]
+    I = sp.eye(N)
+    L = lap - I
+    monome = {0: I, 1: L}
+
+    for k in range(2, order + 1):
+        monome[k] = 2 * L @ monome[k - 1] - monome[k - 2]
+
+    def compute_walelet(tau):
+        coeffs = compute_cheb_coeff_basis(tau, order)
+        w = np.sum([coeffs[k] * monome[k] for k in range(order + 1)])
+        return gf.clip_matrix(w, threshold, strict=True)
+
+    Wavelet = compute_walelet(wavelet_s)
+    Wavelet_inverse = compute_walelet(-wavelet_s)
+
+    if wavelet_normalize:
+        Wavelet = normalize(Wavelet, norm='l1', axis=1)
+        Wavelet_inverse = normalize(Wavelet_inverse, norm='l1', axis=1)
+
+    return Wavelet, Wavelet_inverse
+
+
+def _run(args):
+    num_nodes, order, method, max_nnz = args
+    adj_matrix = random_graph(num_nodes, avg_degree=5)
+    if method == "legacy":
+        fn = legacy_wavelet_basis
+        kwargs = {}
+    else:
+        fn = gf.wavelet_basis
+        kwargs = dict(max_nnz=max_nnz)
+        # compile
+        fn(random_graph(100, 5), order=order)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    wavelet, wavelet_inverse = fn(adj_matrix, order=order, wavelet_s=1.2,
+                                  wavelet_normalize=True, **kwargs)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    return wavelet.nnz + wavelet_inverse.nnz, elapsed, peak / 2**10
+
+
+def run(num_nodes, order, method, max_nnz=None):
+    # a fresh process for each run, so that peak RSS is not shared
+    with mp.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+        return pool.apply(_run, ((num_nodes, order, method, max_nnz),))
+
+
+if __name__ == "__main__":
+    print(f"{'num_nodes':>10} {'order':>6} {'method':>12} {'nnz':>12} {'time(s)':>8} {'peak(MiB)':>10}")
+    for num_nodes in (10**4, 5 * 10**4):
+        for order in (3, 4):
+            for method, max_nnz in (("legacy", None), ("single-pass", None), ("single-pass", 64)):
+                nnz, elapsed, peak = run(num_nodes, order, method, max_nnz)
+                name = method if max_nnz is None else f"top-{max_nnz}"
+                print(f"{num_nodes:>10} {order:>6} {name:>12} {nnz:>12} {elapsed:8.2f} {peak:10.1f}")
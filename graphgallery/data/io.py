@@ -1,16 +1,23 @@
 import os
+import json
 import errno
+import pickle
 import zipfile
 import os.path as osp
 import numpy as np
+import scipy.sparse as sp
 from tensorflow.keras.utils import get_file
 from typing import List
 
 __all__ = [
     'download_file', 'files_exist', 'makedirs', 'makedirs_from_filepath',
-    'extract_zip', 'clean', 'load_npz'
+    'extract_zip', 'clean', 'load_npz', 'save_npy_dir', 'load_npy_dir',
+    'is_npy_dir'
 ]
 
+_MANIFEST = "manifest.json"
+_OBJECTS = "objects.pkl"
+
 
 def download_file(raw_paths: List[str], urls: List[str]) -> None:
     if isinstance(raw_paths, str):
@@ -97,3 +104,80 @@ def load_npz(filepath):
             return loader
     else:
         raise ValueError(f"{filepath} doesn't exist.")
+
+
+def is_npy_dir(dirpath: str) -> bool:
+    """Check whether `dirpath` is a directory saved by `save_npy_dir`."""
+    dirpath = osp.abspath(osp.expanduser(dirpath))
+    return osp.isfile(osp.join(dirpath, _MANIFEST))
+
+
+def save_npy_dir(dirpath: str, data_dict: dict) -> str:
+    """Save a dict of arrays to a directory of uncompressed `.npy` files
+    with a small JSON manifest, so that it can be opened with memory mapping.
+
+    Numpy arrays are saved as `{key}.npy` and sparse matrices as
+    `{key}.indptr.npy`, `{key}.indices.npy` and `{key}.data.npy` in CSR format.
+    Other (small) objects are pickled into a single file.
+    """
+    dirpath = osp.abspath(osp.expanduser(dirpath))
+    makedirs(dirpath)
+    # the manifest is written at last and marks a complete directory
+    clean(osp.join(dirpath, _MANIFEST))
+
+    arrays, objects = {}, {}
+    for key, value in data_dict.items():
+        if sp.isspmatrix(value):
+            value = value.tocsr(copy=False)
+            for name in ("indptr", "indices", "data"):
+                np.save(osp.join(dirpath, f"{key}.{name}.npy"), getattr(value, name))
+            arrays[key] = {"format": "csr", "shape": list(value.shape)}
+        elif isinstance(value, np.ndarray) and value.dtype.kind not in {'O', 'U'}:
+            np.save(osp.join(dirpath, f"{key}.npy"), value)
+            arrays[key] = {"format": "ndarray", "shape": list(value.shape)}
+        else:
+            objects[key] = value
+
+    if objects:
+        with open(osp.join(dirpath, _OBJECTS), "wb") as f:
+            pickle.dump(objects, f)
+
+    with open(osp.join(dirpath, _MANIFEST), "w") as f:
+        json.dump({"arrays": arrays, "objects": sorted(objects)}, f, indent=2)
+    return dirpath
+
+
+def load_npy_dir(dirpath: str, mmap_mode: str = 'r') -> dict:
+    """Load a directory saved by `save_npy_dir`, where arrays
+    are opened with `np.load(mmap_mode=mmap_mode)`, i.e., in O(1)
+    and the pages can be shared by several processes.
+
+    Parameters:
+    -----------
+    dirpath: the directory.
+    mmap_mode: {None, 'r+', 'r', 'w+', 'c'}, see `np.load`.
+        use 'c' (copy-on-write) if the arrays would be modified in place,
+        or None to load them into memory.
+    """
+    dirpath = osp.abspath(osp.expanduser(dirpath))
+    if not is_npy_dir(dirpath):
+        raise ValueError(f"{dirpath} doesn't exist or is incomplete.")
+
+    with open(osp.join(dirpath, _MANIFEST)) as f:
+        manifest = json.load(f)
+
+    loader = {}
+    for key, info in manifest["arrays"].items():
+        if info["format"] == "csr":
+            data, indices, indptr = (np.load(osp.join(dirpath, f"{key}.{name}.npy"),
+                                             mmap_mode=mmap_mode)
+                                     for name in ("data", "indices", "indptr"))
+            loader[key] = sp.csr_matrix((data, indices, indptr),
+                                        shape=tuple(info["shape"]), copy=False)
+        else:
+            loader[key] = np.load(osp.join(dirpath, f"{key}.npy"), mmap_mode=mmap_mode)
+
+    if manifest["objects"]:
+        with open(osp.join(dirpath, _OBJECTS), "rb") as f:
+            loader.update(pickle.load(f))
+    return loader
@@ -6,7 +6,7 @@ import numpy as np
 
 from typing import Optional, List, Tuple, Union, Callable
 from .in_memory_dataset import InMemoryDataset
-from ..data.io import makedirs, files_exist, download_file
+from ..data.io import makedirs, files_exist, download_file, is_npy_dir
 from ..data.graph import Graph
 
 _DATASETS = {
@@ -61,11 +61,19 @@ class NPZDataset(InMemoryDataset):
         return self.root
 
     def _process(self) -> dict:
-        graph = Graph.from_npz(self.raw_paths[0])
+        path = self.raw_paths[0]
+        if is_npy_dir(path):
+            # memory-mapped, see `Graph.to_npy`
+            graph = Graph.from_npy(path)
+        else:
+            graph = Graph.from_npz(path)
         return dict(graph=graph)
 
     @property
     def processed_path(self) -> str:
+        # never pickled, so that `_process` always opens `raw_paths`, where an
+        # npy directory (memory-mapped) takes precedence over the npz file;
+        # a processed pickle would otherwise be loaded before both
         return None
 
     @property
@@ -74,7 +82,10 @@ class NPZDataset(InMemoryDataset):
 
     @property
     def raw_paths(self) -> List[str]:
-        return [f"{osp.join(self.download_dir, self.name)}.npz"]
+        npy_dir = osp.join(self.download_dir, self.name)
+        if is_npy_dir(npy_dir):
+            return [npy_dir]
+        return [f"{npy_dir}.npz"]
 
     def list_files(self):
         return self.raw_paths
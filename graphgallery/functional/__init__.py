@@ -1,4 +1,5 @@
 from .transforms import *
+from .transform_cache import *
 from .decorators import *
 from .functions import *
 from .edge_level import *
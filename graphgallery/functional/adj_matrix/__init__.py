@@ -1,12 +1,14 @@
-from .graph_partition import GraphPartition, graph_partition
+from .graph_partition import GraphPartition, graph_partition, partition_subgraphs, bfs_clustering, edge_cut, ClusterBlocks, cluster_mapping
 from .normalize_adj import NormalizeAdj, normalize_adj
 from .add_selfloops import AddSelfLoops, add_selfloops
 from .wavelet import WaveletBasis, wavelet_basis
-from .chebyshef import ChebyBasis, cheby_basis
-from .neighbor_sampler import NeighborSampler, neighbor_sampler
+from .chebyshef import ChebyBasis, cheby_basis, ChebyOperator, scaled_laplacian, largest_eigval
+from .neighbor_sampler import NeighborSampler, neighbor_sampler, sample_batch_neighbors
 from .gdc import GDC, gdc
 from .svd import SVD, svd
+from .sparsify import clip_matrix, top_k_matrix
+from .spmm import spmm
 from .to_edge import sparse_adj_to_edge, SparseAdjToEdge
 from .augment_adj import augment_adj
 from .sparse_reshape import SparseReshape, sparse_reshape
-from .sample import find_4o_nbrs
\ No newline at end of file
+from .sample import find_4o_nbrs, sample_independent_nodes, neighbors_to_csr
\ No newline at end of file
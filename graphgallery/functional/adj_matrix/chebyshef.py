@@ -1,3 +1,4 @@
+import hashlib
 import scipy.sparse as sp
 import numpy as np
 
@@ -5,42 +6,129 @@ from .normalize_adj import normalize_adj
 from ..transforms import Transform
 from ..decorators import multiple
 
+__all__ = ['ChebyBasis', 'cheby_basis', 'ChebyOperator',
+           'scaled_laplacian', 'largest_eigval']
+
+# the largest eigenvalues of the computed Laplacians
+_EIGVALS = {}
+_MAX_EIGVALS = 128
+
 
 class ChebyBasis(Transform):
-    def __init__(self, order=2, rate=-0.5):
+    cacheable = True
+
+    def __init__(self, order=2, rate=-0.5, eigval="exact"):
+        super().__init__()
+        self.order = order
+        self.rate = rate
+        self.eigval = eigval
+
+    def __call__(self, adj_matrix):
+        return cheby_basis(adj_matrix, order=self.order, rate=self.rate, eigval=self.eigval)
+
+    def extra_repr(self):
+        return f"order={self.order}, rate={self.rate}, eigval={self.eigval}"
+
+
+class ChebyOperator(Transform):
+    """Return the scaled Laplacian only, ChebyNet applies the Chebyshev
+    recurrence to the hidden features at run time, i.e., `order` sparse-dense
+    products per layer, instead of materializing `T_k` for each order,
+    so that the memory is O(nnz) at any order."""
+    cacheable = True
+
+    def __init__(self, order=2, rate=-0.5, eigval="exact"):
         super().__init__()
         self.order = order
         self.rate = rate
+        self.eigval = eigval
 
     def __call__(self, adj_matrix):
-        return cheby_basis(adj_matrix, order=self.order, rate=self.rate)
+        return scaled_laplacian(adj_matrix, rate=self.rate, eigval=self.eigval)
 
     def extra_repr(self):
-        return f"order={self.order}, rate={self.rate}"
+        return f"order={self.order}, rate={self.rate}, eigval={self.eigval}"
 
 
 @multiple()
-def cheby_basis(adj_matrix, order=2, rate=-0.5):
-    """Calculate Chebyshev polynomials up to order k. Return a list of sparse matrices (tuple representation)."""
+def cheby_basis(adj_matrix, order=2, rate=-0.5, eigval="exact"):
+    """Calculate Chebyshev polynomials up to order k. Return a list of sparse matrices (tuple representation).
+
+    See `scaled_laplacian` for `eigval`.
+    """
 
     assert order >= 2
-    adj_normalized = normalize_adj(adj_matrix, rate=rate, fill_weight=1.0)
     I = sp.eye(adj_matrix.shape[0], dtype=adj_matrix.dtype).tocsr()
-    laplacian = I - adj_normalized
-    largest_eigval = sp.linalg.eigsh(laplacian,
-                                     1,
-                                     which='LM',
-                                     return_eigenvectors=False)[0]
-    scaled_laplacian = (2. / largest_eigval) * laplacian - I
+    scaled_lap = scaled_laplacian(adj_matrix, rate=rate, eigval=eigval)
 
     t_k = []
     t_k.append(I)
-    t_k.append(scaled_laplacian)
+    t_k.append(scaled_lap)
 
     def chebyshev_recurrence(t_k_minus_one, t_k_minus_two, scaled_lap):
         return 2 * scaled_lap.dot(t_k_minus_one) - t_k_minus_two
 
     for i in range(2, order + 1):
-        t_k.append(chebyshev_recurrence(t_k[-1], t_k[-2], scaled_laplacian))
+        t_k.append(chebyshev_recurrence(t_k[-1], t_k[-2], scaled_lap))
 
     return t_k
+
+
+@multiple()
+def scaled_laplacian(adj_matrix, rate=-0.5, eigval="exact"):
+    """Return the scaled Laplacian `2 / lambda_max * L - I`, where `L` is
+    the Laplacian of the normalized adjacency matrix with self-loops.
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the adjacency matrix of the graph.
+    rate : float, optional
+        the normalization rate, by default -0.5
+    eigval : str or float, optional
+        the largest eigenvalue `lambda_max` of `L`, by default "exact".
+        It could be "exact" (computed with `eigsh` and cached per graph),
+        "bound" (a cheap upper bound in O(nnz)), or a float scalar.
+    """
+    adj_normalized = normalize_adj(adj_matrix, rate=rate, fill_weight=1.0)
+    I = sp.eye(adj_matrix.shape[0], dtype=adj_matrix.dtype).tocsr()
+    laplacian = (I - adj_normalized).tocsr()
+    if eigval == "bound" and rate == -0.5:
+        # the symmetric normalized Laplacian has eigenvalues in [0, 2]
+        eigval = min(largest_eigval(laplacian, method="bound"), 2.)
+    elif isinstance(eigval, str):
+        eigval = largest_eigval(laplacian, method=eigval)
+    return ((2. / eigval) * laplacian - I).tocsr()
+
+
+def largest_eigval(laplacian, method="exact"):
+    """Return the largest eigenvalue of the (symmetric) `laplacian`.
+
+    Parameters
+    ----------
+    laplacian : sp.csr_matrix
+        the Laplacian matrix.
+    method : str, optional
+        "exact" (default) computes it with `eigsh`, which is cached for each
+        graph in this process, "bound" returns the Gershgorin upper bound,
+        i.e., the maximum absolute row sum, in O(nnz).
+    """
+    laplacian = laplacian.tocsr(copy=False)
+    if method == "bound":
+        return float(abs(laplacian).sum(1).max())
+    elif method != "exact":
+        raise ValueError(f"Invalid method '{method}', allowed: 'exact' and 'bound'.")
+
+    h = hashlib.blake2b(digest_size=20)
+    h.update(str(laplacian.shape).encode())
+    for array in (laplacian.indptr, laplacian.indices, laplacian.data):
+        h.update(memoryview(np.ascontiguousarray(array)).cast("B"))
+    key = h.hexdigest()
+    if key not in _EIGVALS:
+        if len(_EIGVALS) >= _MAX_EIGVALS:
+            _EIGVALS.clear()
+        _EIGVALS[key] = float(sp.linalg.eigsh(laplacian,
+                                              1,
+                                              which='LM',
+                                              return_eigenvectors=False)[0])
+    return _EIGVALS[key]
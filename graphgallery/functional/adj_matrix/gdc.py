@@ -1,26 +1,36 @@
+import os
 import numpy as np
 import scipy.sparse as sp
+from concurrent.futures import ThreadPoolExecutor
+from numba import njit
 from sklearn.preprocessing import normalize
 from scipy.linalg import expm
 
 from .normalize_adj import normalize_adj
+from .sparsify import clip_matrix, top_k_matrix, _top_k_row
 from ..transforms import Transform
 from ..decorators import multiple
 
 
 class GDC(Transform):
+    cacheable = True
+
     def __init__(self,
                  alpha: float = 0.3,
                  t: float = None,
                  eps: float = None,
                  k: int = 128,
-                 which: str = 'PPR'):
+                 which: str = 'PPR',
+                 approximate: bool = False,
+                 tol: float = 1e-4):
         super().__init__()
         self.alpha = alpha
         self.t = t
         self.eps = eps
         self.k = k
         self.which = which
+        self.approximate = approximate
+        self.tol = tol
 
     def __call__(self, adj_matrix):
         return gdc(adj_matrix,
@@ -28,10 +38,12 @@ class GDC(Transform):
                    t=self.t,
                    eps=self.eps,
                    k=self.k,
-                   which=self.which)
+                   which=self.which,
+                   approximate=self.approximate,
+                   tol=self.tol)
 
     def extra_repr(self):
-        return f"alpha={self.alpha}, t={self.t}, eps={self.eps}, k={self.k}, which={self.which}"
+        return f"alpha={self.alpha}, t={self.t}, eps={self.eps}, k={self.k}, which={self.which}, approximate={self.approximate}, tol={self.tol}"
 
 
 @multiple()
@@ -40,13 +52,53 @@ def gdc(adj_matrix: sp.csr_matrix,
         t: float = None,
         eps: float = None,
         k: int = 128,
-        which: str = 'PPR') -> sp.csr_matrix:
+        which: str = 'PPR',
+        approximate: bool = False,
+        tol: float = 1e-4) -> sp.csr_matrix:
+    """Graph Diffusion Convolution (GDC).
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the adjacency matrix of the graph.
+    alpha : float, optional
+        the teleport probability for PPR-based diffusion, by default 0.3
+    t : float, optional
+        the diffusion time for Heat-based diffusion, by default None
+    eps : float, optional
+        sparsify the diffusion matrix using threshold epsilon, by default None
+    k : int, optional
+        sparsify the diffusion matrix by row-wise top-k values, by default 128
+    which : str, optional
+        the diffusion, 'PPR' or 'Heat', by default 'PPR'
+    approximate : bool, optional
+        whether to compute the diffusion row by row (in parallel) with
+        a push-based approximation that never materializes a dense
+        N x N matrix, by default False, i.e., compute the exact
+        diffusion with matrix inverse or `expm`, which is only feasible
+        for small graphs. Use `approximate=True` for large graphs.
+    tol : float, optional
+        the residual tolerance of the approximation, by default 1e-4.
+        Smaller values are more accurate but slower.
+
+    Returns
+    -------
+    sp.csr_matrix
+        the column-normalized transition matrix on the diffused graph.
+    """
 
     if not (eps or k):
         raise RuntimeError('Either `eps` or `k` should be specified!')
     if eps and k:
         raise RuntimeError('Only one of `eps` and `k` should be specified!')
 
+    if approximate:
+        S = approximate_diffusion(adj_matrix, alpha=alpha, t=t, eps=eps, k=k,
+                                  which=which, tol=tol)
+        # Column-normalized transition matrix on graph S_tilde
+        T_S = normalize(S, norm='l1', axis=0)
+        return T_S.tocsr(copy=False)
+
     N = adj_matrix.shape[0]
 
     # Symmetric transition matrix
@@ -77,29 +129,233 @@ def gdc(adj_matrix: sp.csr_matrix,
     return T_S.tocsr(copy=False)
 
 
-def clip_matrix(matrix, threshold: float) -> sp.csr_matrix:
-    '''Sparsify using threshold epsilon'''
-    assert sp.isspmatrix(
-        matrix
-    ), 'Input matrix should be sparse matrix with format scipy.sparse.*_matrix.'
-    matrix = matrix.tocsr()
-    thres = np.vectorize(lambda x: x if x >= threshold else 0.)
-    matrix.data = thres(matrix.data)
-    matrix.eliminate_zeros()
-    return matrix
-
-
-def top_k_matrix(matrix, k: int) -> sp.csr_matrix:
-    '''Row-wise select top-k values'''
-    assert sp.isspmatrix(
-        matrix
-    ), 'Input matrix should be sparse matrix with format scipy.sparse.*_matrix.'
-    matrix = matrix.tolil()
-    data = matrix.data
-    for row in range(matrix.shape[0]):
-        t = np.asarray(data[row])
-        t[np.argsort(-t)[k:]] = 0.
-        data[row] = t.tolist()
-    matrix = matrix.tocsr()
-    matrix.eliminate_zeros()
-    return matrix
+def approximate_diffusion(adj_matrix: sp.csr_matrix,
+                          alpha: float = 0.3,
+                          t: float = None,
+                          eps: float = None,
+                          k: int = 128,
+                          which: str = 'PPR',
+                          tol: float = 1e-4,
+                          workers: int = None) -> sp.csr_matrix:
+    """Approximate the sparsified PPR or Heat diffusion matrix
+    on the symmetric transition matrix with self-loops, row by row.
+
+    Each row is computed by local propagation from its source node
+    (Andersen's push for PPR, truncated Taylor series for Heat) and
+    is sparsified (top-k or threshold) right away, so memory is bounded
+    by O(N * k) for the output plus O(N) of scratch per worker.
+    """
+    if which == 'PPR':
+        assert alpha, '`alpha` should be specified for PPR-based diffusion.'
+    elif which == 'Heat':
+        assert t, '`t` should be specified for Heat-based diffusion.'
+    else:
+        raise ValueError(f'Invalid argument of `{which}`.')
+
+    N = adj_matrix.shape[0]
+    adj_matrix = adj_matrix.tocsr(copy=False)
+    adj_matrix = adj_matrix + sp.eye(N, dtype=adj_matrix.dtype, format='csr')
+    degree = adj_matrix.sum(1).A1.astype('float64')
+    indptr = adj_matrix.indptr
+    indices = adj_matrix.indices
+    data = adj_matrix.data.astype('float64')
+    k = k or 0
+    eps = eps or 0.
+
+    workers = workers or os.cpu_count() or 1
+    n_chunks = min(N, workers * 8)
+    chunks = np.array_split(np.arange(N), n_chunks)
+
+    if which == 'PPR':
+        def compute(sources):
+            return _ppr_push(indptr, indices, data, degree, sources,
+                             alpha, tol, k, eps)
+    else:
+        def compute(sources):
+            return _heat_propagate(indptr, indices, data, degree, sources,
+                                   t, tol, k, eps)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(compute, chunks))
+
+    counts = np.concatenate([r[0] for r in results])
+    S_indptr = np.zeros(N + 1, dtype=np.int64)
+    np.cumsum(counts, out=S_indptr[1:])
+    S_indices = np.concatenate([r[1] for r in results])
+    S_data = np.concatenate([r[2] for r in results])
+    S = sp.csr_matrix((S_data, S_indices, S_indptr), shape=(N, N))
+    S.sort_indices()
+    return S
+
+
+@njit(nogil=True)
+def _collect(source, touched, n_touched, values, degree, k, eps,
+             counts, i, out_indices, out_data, nnz):
+    """Sparsify the propagated row (random walk normalization) of `source`,
+    rescale it to symmetric normalization and append it to the outputs."""
+    nodes = touched[:n_touched].copy()
+    vals = np.empty(n_touched)
+    scale = np.sqrt(degree[source])
+    for j in range(n_touched):
+        vals[j] = scale * values[nodes[j]] / np.sqrt(degree[nodes[j]])
+
+    if k > 0:
+        # the same selection (and ties) as `top_k_matrix`
+        _top_k_row(vals, k)
+        mask = vals != 0.
+    else:
+        mask = vals >= eps
+    nodes = nodes[mask]
+    vals = vals[mask]
+
+    m = nodes.size
+    if nnz + m > out_indices.size:
+        capacity = max(2 * out_indices.size, nnz + m)
+        new_indices = np.empty(capacity, dtype=out_indices.dtype)
+        new_data = np.empty(capacity, dtype=out_data.dtype)
+        new_indices[:nnz] = out_indices[:nnz]
+        new_data[:nnz] = out_data[:nnz]
+        out_indices, out_data = new_indices, new_data
+
+    out_indices[nnz:nnz + m] = nodes
+    out_data[nnz:nnz + m] = vals
+    counts[i] = m
+    return out_indices, out_data, nnz + m
+
+
+@njit(nogil=True)
+def _ppr_push(indptr, indices, data, degree, sources, alpha, tol, k, eps):
+    N = degree.size
+    p = np.zeros(N)
+    r = np.zeros(N)
+    is_touched = np.zeros(N, dtype=np.bool_)
+    touched = np.empty(N, dtype=np.int64)
+    in_stack = np.zeros(N, dtype=np.bool_)
+    stack = np.empty(N, dtype=np.int64)
+
+    counts = np.zeros(sources.size, dtype=np.int64)
+    capacity = sources.size * (k if k > 0 else 32)
+    out_indices = np.empty(max(capacity, 1), dtype=np.int64)
+    out_data = np.empty(max(capacity, 1))
+    nnz = 0
+
+    for i in range(sources.size):
+        source = sources[i]
+        r[source] = 1.
+        is_touched[source] = True
+        touched[0] = source
+        n_touched = 1
+        stack[0] = source
+        in_stack[source] = True
+        top = 1
+
+        while top > 0:
+            top -= 1
+            u = stack[top]
+            in_stack[u] = False
+            res = r[u]
+            p[u] += alpha * res
+            r[u] = 0.
+            push = (1. - alpha) * res / degree[u]
+            for j in range(indptr[u], indptr[u + 1]):
+                v = indices[j]
+                r[v] += push * data[j]
+                if not is_touched[v]:
+                    is_touched[v] = True
+                    touched[n_touched] = v
+                    n_touched += 1
+                if not in_stack[v] and r[v] >= tol * degree[v]:
+                    in_stack[v] = True
+                    stack[top] = v
+                    top += 1
+
+        out_indices, out_data, nnz = _collect(source, touched, n_touched, p, degree,
+                                              k, eps, counts, i,
+                                              out_indices, out_data, nnz)
+        for j in range(n_touched):
+            v = touched[j]
+            p[v] = 0.
+            r[v] = 0.
+            is_touched[v] = False
+
+    return counts, out_indices[:nnz], out_data[:nnz]
+
+
+@njit(nogil=True)
+def _heat_propagate(indptr, indices, data, degree, sources, t, tol, k, eps):
+    N = degree.size
+    h = np.zeros(N)
+    x = np.zeros(N)
+    x_next = np.zeros(N)
+    is_touched = np.zeros(N, dtype=np.bool_)
+    touched = np.empty(N, dtype=np.int64)
+    in_frontier = np.zeros(N, dtype=np.bool_)
+    frontier = np.empty(N, dtype=np.int64)
+    next_frontier = np.empty(N, dtype=np.int64)
+
+    counts = np.zeros(sources.size, dtype=np.int64)
+    capacity = sources.size * (k if k > 0 else 32)
+    out_indices = np.empty(max(capacity, 1), dtype=np.int64)
+    out_data = np.empty(max(capacity, 1))
+    nnz = 0
+
+    for i in range(sources.size):
+        source = sources[i]
+        # h = sum_k exp(-t) t^k / k! x_k with x_0 = e_source and x_{k+1} = x_k P
+        coeff = np.exp(-t)
+        mass = coeff
+        h[source] = coeff
+        x[source] = 1.
+        is_touched[source] = True
+        touched[0] = source
+        n_touched = 1
+        frontier[0] = source
+        size = 1
+        step = 0
+
+        while size > 0 and mass < 1. - tol and step < 100:
+            step += 1
+            coeff *= t / step
+            mass += coeff
+            next_size = 0
+            for f in range(size):
+                u = frontier[f]
+                push = x[u] / degree[u]
+                x[u] = 0.
+                for j in range(indptr[u], indptr[u + 1]):
+                    v = indices[j]
+                    x_next[v] += push * data[j]
+                    if not in_frontier[v]:
+                        in_frontier[v] = True
+                        next_frontier[next_size] = v
+                        next_size += 1
+
+            # truncate small entries to keep the propagation local
+            size = 0
+            for f in range(next_size):
+                v = next_frontier[f]
+                in_frontier[v] = False
+                value = x_next[v]
+                x_next[v] = 0.
+                if value >= tol * degree[v]:
+                    x[v] = value
+                    frontier[size] = v
+                    size += 1
+                    h[v] += coeff * value
+                    if not is_touched[v]:
+                        is_touched[v] = True
+                        touched[n_touched] = v
+                        n_touched += 1
+
+        for f in range(size):
+            x[frontier[f]] = 0.
+
+        out_indices, out_data, nnz = _collect(source, touched, n_touched, h, degree,
+                                              k, eps, counts, i,
+                                              out_indices, out_data, nnz)
+        for j in range(n_touched):
+            v = touched[j]
+            h[v] = 0.
+            is_touched[v] = False
+
+    return counts, out_indices[:nnz], out_data[:nnz]
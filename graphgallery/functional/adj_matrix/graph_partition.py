@@ -3,19 +3,35 @@ try:
 except ImportError:
     metis = None
 
+import warnings
 import numpy as np
-import networkx as nx
 import scipy.sparse as sp
+from numba import njit
 from scipy.sparse.csgraph import connected_components
 from graphgallery import intx
 
 from ..transforms import Transform
 
 
-def metis_clustering(graph, n_clusters):
-    """Partitioning graph using Metis"""
+def metis_clustering(adj_matrix, n_clusters):
+    """Partitioning graph using Metis, it is fed with
+    the CSR buffers of `adj_matrix` directly."""
+    adj_matrix = sp.csr_matrix(adj_matrix, copy=False)
+    # METIS requires an undirected graph without self-loops
+    adj_matrix = (adj_matrix + adj_matrix.T).tocsr()
+    adj_matrix.setdiag(0)
+    adj_matrix.eliminate_zeros()
+
+    dtype = np.dtype(metis.idx_t)
+    xadj = adj_matrix.indptr.astype(dtype)
+    adjncy = adj_matrix.indices.astype(dtype)
+    graph = metis.METIS_Graph(nvtxs=metis.idx_t(adj_matrix.shape[0]),
+                              ncon=metis.idx_t(1),
+                              xadj=(metis.idx_t * xadj.size).from_buffer(xadj),
+                              adjncy=(metis.idx_t * adjncy.size).from_buffer(adjncy),
+                              vwgt=None, vsize=None, adjwgt=None)
     _, parts = metis.part_graph(graph, n_clusters)
-    return parts
+    return np.asarray(parts)
 
 
 def random_clustering(num_nodes, n_clusters):
@@ -24,46 +40,335 @@ def random_clustering(num_nodes, n_clusters):
     return parts
 
 
+def bfs_clustering(adj_matrix, n_clusters, n_iter=5, imbalance=0.05, seed=None):
+    """Partitioning graph by growing balanced clusters with BFS, and then
+    refining them with size-constrained label propagation.
+    It preserves locality without depending on Metis.
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the adjacency matrix of the graph.
+    n_clusters : int
+        the number of clusters.
+    n_iter : int, optional
+        the number of label propagation passes, by default 5
+    imbalance : float, optional
+        the allowed imbalance of cluster sizes during label propagation,
+        i.e., clusters do not grow beyond `(1 + imbalance) * ceil(N / n_clusters)`
+        nodes or shrink below `(1 - imbalance) * ceil(N / n_clusters)` nodes,
+        by default 0.05
+    seed : int, optional
+        the random seed, by default None, i.e., drawn from `np.random`.
+
+    Returns
+    -------
+    np.ndarray
+        the cluster of each node.
+    """
+    adj_matrix = sp.csr_matrix(adj_matrix, copy=False)
+    # locality is defined on the undirected graph
+    adj_matrix = (adj_matrix + adj_matrix.T).tocsr()
+    if seed is None:
+        seed = np.random.randint(0, 2**31 - 1)
+    return _bfs_clustering(adj_matrix.indptr, adj_matrix.indices,
+                           n_clusters, n_iter, imbalance, seed)
+
+
+@njit(nogil=True)
+def _bfs_clustering(indptr, indices, n_clusters, n_iter, imbalance, seed):
+    np.random.seed(seed)
+    N = indptr.size - 1
+    capacity = (N + n_clusters - 1) // n_clusters
+    parts = np.empty(N, dtype=np.int64)
+    sizes = np.zeros(n_clusters, dtype=np.int64)
+    visited = np.zeros(N, dtype=np.bool_)
+    queue = np.empty(N, dtype=np.int64)
+    head = tail = 0
+    cluster = 0
+
+    # grow clusters of `capacity` nodes in BFS order, the frontier of
+    # a full cluster seeds the next one so that they stay adjacent
+    for source in np.random.permutation(N):
+        if visited[source]:
+            continue
+        visited[source] = True
+        queue[tail] = source
+        tail += 1
+        while head < tail:
+            u = queue[head]
+            head += 1
+            if sizes[cluster] == capacity and cluster < n_clusters - 1:
+                cluster += 1
+            parts[u] = cluster
+            sizes[cluster] += 1
+            for j in range(indptr[u], indptr[u + 1]):
+                v = indices[j]
+                if not visited[v]:
+                    visited[v] = True
+                    queue[tail] = v
+                    tail += 1
+
+    # move nodes to the cluster of most of their neighbors
+    max_size = int(capacity * (1 + imbalance))
+    min_size = max(1, int(capacity * (1 - imbalance)))
+    counts = np.zeros(n_clusters, dtype=np.int64)
+    for _ in range(n_iter):
+        moved = 0
+        for u in np.random.permutation(N):
+            current = parts[u]
+            for j in range(indptr[u], indptr[u + 1]):
+                counts[parts[indices[j]]] += 1
+            best = current
+            for j in range(indptr[u], indptr[u + 1]):
+                c = parts[indices[j]]
+                if counts[c] > counts[best] and sizes[c] < max_size:
+                    best = c
+            for j in range(indptr[u], indptr[u + 1]):
+                counts[parts[indices[j]]] = 0
+            if best != current and sizes[current] > min_size:
+                parts[u] = best
+                sizes[current] -= 1
+                sizes[best] += 1
+                moved += 1
+        if moved == 0:
+            break
+
+    return parts
+
+
+def edge_cut(adj_matrix, parts):
+    """The ratio of edges between different clusters."""
+    adj_matrix = sp.csr_matrix(adj_matrix, copy=False)
+    row = np.repeat(np.arange(adj_matrix.shape[0]), np.diff(adj_matrix.indptr))
+    return (parts[row] != parts[adj_matrix.indices]).mean()
+
+
 class GraphPartition(Transform):
-    def __init__(self, n_clusters: int, metis_partition: bool = True):
-        self.n_clusters = on_clustersrder
-        self.metis_partition = metis_partition
+    def __init__(self, n_clusters: int, partition: str = "auto", metis_partition: bool = None):
+        super().__init__()
+        self.n_clusters = n_clusters
+        self.partition = _deprecated_metis_partition(partition, metis_partition)
 
     def __call__(self, adj_matrix, node_attr):
-        return graph_partition(adj_matrix, node_attr, n_clusters=self.n_clusters, metis_partition=self.metis_partition)
+        return graph_partition(adj_matrix, node_attr, n_clusters=self.n_clusters, partition=self.partition)
 
     def __repr__(self):
-        return f"{self.__class__.__name__}(n_clusters={self.n_clusters}, metis_partition={self.metis_partition})"
+        return f"{self.__class__.__name__}(n_clusters={self.n_clusters}, partition={self.partition})"
 
 
 # TODO: accept a Graph and output a MultiGraph
-def graph_partition(adj_matrix, node_attr, n_clusters: int, metis_partition: bool = True):
+def graph_partition(adj_matrix, node_attr, n_clusters: int, partition: str = "auto",
+                    metis_partition: bool = None):
+    """Partition the graph into `n_clusters` clusters and extract
+    the subgraph of each cluster.
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the adjacency matrix of the graph.
+    node_attr : np.ndarray
+        the node attribute matrix of the graph.
+    n_clusters : int
+        the number of clusters.
+    partition : str, optional
+        the partitioning method, one of
+        'metis': using Metis, it requires the `metis` package;
+        'bfs': using the built-in `bfs_clustering`;
+        'random': assigning nodes to clusters randomly;
+        'auto': 'metis' if `metis` is installed, otherwise 'bfs'.
+        by default 'auto'.
+    metis_partition : bool, optional
+        deprecated, use `partition` instead. If given, `True` maps to
+        `partition='metis'` and `False` to `partition='random'`.
+
+    Returns
+    -------
+    batch_adj : list of sp.csr_matrix
+        the adjacency matrix of each cluster.
+    batch_x : list of np.ndarray
+        the node attribute matrix of each cluster.
+    cluster_member : list of np.ndarray
+        the (sorted) nodes of each cluster.
+    """
+    partition = _deprecated_metis_partition(partition, metis_partition)
+    adj_matrix = sp.csr_matrix(adj_matrix, copy=False)
+    if partition == "auto":
+        partition = "metis" if metis else "bfs"
+
     # partition graph
-    if metis_partition:
+    if partition == "metis":
         assert metis, "Please install `metis` package!"
-        nxgraph = nx.from_scipy_sparse_matrix(
-            adj_matrix, create_using=nx.DiGraph)
-        parts = metis_clustering(nxgraph, n_clusters)
-    else:
+        parts = metis_clustering(adj_matrix, n_clusters)
+    elif partition == "bfs":
+        parts = bfs_clustering(adj_matrix, n_clusters)
+    elif partition == "random":
         parts = random_clustering(adj_matrix.shape[0], n_clusters)
+    else:
+        raise ValueError(f"Unknown partition method '{partition}', "
+                         "allowed: 'auto', 'metis', 'bfs' and 'random'.")
 
-    cluster_member = [[] for _ in range(n_clusters)]
-    for node_index, part in enumerate(parts):
-        cluster_member[part].append(node_index)
+    return partition_subgraphs(adj_matrix, node_attr, parts, n_clusters)
 
-    mapper = {}
 
-    batch_adj, batch_x = [], []
+def _deprecated_metis_partition(partition, metis_partition):
+    if metis_partition is None:
+        return partition
+    warnings.warn("`metis_partition` is deprecated, use `partition='metis'` "
+                  "or `partition='random'` instead.",
+                  DeprecationWarning, stacklevel=3)
+    return "metis" if metis_partition else "random"
 
-    for cluster in range(n_clusters):
 
-        nodes = sorted(cluster_member[cluster])
-        mapper.update({old_id: new_id for new_id, old_id in enumerate(nodes)})
+def partition_subgraphs(adj_matrix, node_attr, parts, n_clusters: int):
+    """Extract the subgraphs of all clusters given the cluster
+    assignment `parts` of each node, in one pass over the edges."""
+    adj_matrix = sp.csr_matrix(adj_matrix, copy=False)
+    num_nodes = adj_matrix.shape[0]
+    parts = np.asarray(parts, dtype=intx())
+
+    # nodes grouped by cluster, and sorted within each cluster
+    order = np.argsort(parts, kind="stable").astype(intx(), copy=False)
+    sizes = np.bincount(parts, minlength=n_clusters)
+    offsets = np.zeros(n_clusters + 1, dtype=intx())
+    np.cumsum(sizes, out=offsets[1:])
+    cluster_member = np.split(order, offsets[1:-1])
 
-        mini_adj = adj_matrix[nodes][:, nodes]
-        mini_x = node_attr[nodes]
+    # keep the intra-cluster edges only, relabeled by the position
+    # in `order`, so that the clusters are diagonal blocks
+    position = np.empty(num_nodes, dtype=intx())
+    position[order] = np.arange(num_nodes, dtype=intx())
+    row = np.repeat(np.arange(num_nodes, dtype=intx()), np.diff(adj_matrix.indptr))
+    col = adj_matrix.indices
+    mask = parts[row] == parts[col]
+    block_diag = sp.csr_matrix((adj_matrix.data[mask], (position[row[mask]], position[col[mask]])),
+                               shape=adj_matrix.shape)
 
+    indptr, indices, data = block_diag.indptr, block_diag.indices, block_diag.data
+    node_attr = node_attr[order]
+    batch_adj, batch_x = [], []
+    for cluster in range(n_clusters):
+        start, end = offsets[cluster], offsets[cluster + 1]
+        lo, hi = indptr[start], indptr[end]
+        mini_adj = sp.csr_matrix((data[lo:hi], indices[lo:hi] - start,
+                                  indptr[start:end + 1] - lo),
+                                 shape=(end - start, end - start))
         batch_adj.append(mini_adj)
-        batch_x.append(mini_x)
+        batch_x.append(node_attr[start:end])
 
     return batch_adj, batch_x, cluster_member
+
+
+def cluster_mapping(cluster_member):
+    """Map each node to its cluster and its local index in the cluster.
+
+    Returns
+    -------
+    node_cluster, node_local : np.ndarray
+        the cluster of each node and its index within that cluster, i.e.,
+        `cluster_member[node_cluster[n]][node_local[n]] == n`.
+    """
+    sizes = np.asarray([len(nodes) for nodes in cluster_member])
+    order = np.concatenate(cluster_member)
+    node_cluster = np.empty(order.size, dtype=intx())
+    node_local = np.empty(order.size, dtype=intx())
+    node_cluster[order] = np.repeat(np.arange(sizes.size), sizes)
+    node_local[order] = np.arange(order.size) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return node_cluster, node_local
+
+
+class ClusterBlocks:
+    """A block-CSR index of a partitioned graph, which merges any set of
+    clusters into one subgraph, including the edges between them,
+    without slicing the full adjacency matrix again.
+
+    The adjacency matrix is permuted once so that the nodes of each cluster
+    are contiguous, and each edge is labeled by the cluster of its target.
+    Merging clusters then only touches the rows of the chosen clusters.
+
+    Example
+    -------
+    >>> blocks = ClusterBlocks(adj_matrix, cluster_member)
+    >>> adj, nodes = blocks.merge([0, 3, 5])
+    """
+
+    def __init__(self, adj_matrix, cluster_member):
+        """
+        Parameters
+        ----------
+        adj_matrix : sp.csr_matrix
+            the adjacency matrix of the graph.
+        cluster_member : list of np.ndarray
+            the nodes of each cluster, e.g., returned by `graph_partition`.
+        """
+        adj_matrix = sp.csr_matrix(adj_matrix, copy=False)
+        n_clusters = len(cluster_member)
+        sizes = np.asarray([len(nodes) for nodes in cluster_member])
+        self.offsets = np.zeros(n_clusters + 1, dtype=np.int64)
+        np.cumsum(sizes, out=self.offsets[1:])
+        self.order = np.concatenate(cluster_member).astype(intx(), copy=False)
+
+        parts = np.empty(adj_matrix.shape[0], dtype=np.int64)
+        parts[self.order] = np.repeat(np.arange(n_clusters), sizes)
+        adj_matrix = adj_matrix[self.order][:, self.order]
+        adj_matrix.sort_indices()
+        self.adj_matrix = adj_matrix
+        # the cluster of the target of each edge, and its local index
+        self.target_cluster = parts[self.order][adj_matrix.indices]
+        self.target_local = adj_matrix.indices - self.offsets[self.target_cluster]
+        self.n_clusters = n_clusters
+
+    def merge(self, clusters):
+        """Merge the subgraphs of `clusters`.
+
+        Returns
+        -------
+        adj_matrix : sp.csr_matrix
+            the adjacency matrix of the merged subgraph.
+        nodes : np.ndarray
+            the nodes of the merged subgraph, in the order of `clusters`.
+        """
+        clusters = np.asarray(clusters, dtype=np.int64)
+        adj_matrix = self.adj_matrix
+        indptr, indices, data = _merge_clusters(adj_matrix.indptr, adj_matrix.data,
+                                                self.target_cluster, self.target_local,
+                                                self.offsets, clusters, self.n_clusters)
+        nodes = np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]]
+                                for c in clusters])
+        return sp.csr_matrix((data, indices, indptr),
+                             shape=(nodes.size, nodes.size)), nodes
+
+
+@njit(nogil=True)
+def _merge_clusters(indptr, data, target_cluster, target_local, offsets, clusters, n_clusters):
+    # the offset of each chosen cluster in the merged subgraph, -1 otherwise
+    new_offsets = np.full(n_clusters, -1, dtype=np.int64)
+    num_nodes = 0
+    for c in clusters:
+        new_offsets[c] = num_nodes
+        num_nodes += offsets[c + 1] - offsets[c]
+
+    new_indptr = np.zeros(num_nodes + 1, dtype=indptr.dtype)
+    row = 0
+    for c in clusters:
+        for u in range(offsets[c], offsets[c + 1]):
+            count = 0
+            for j in range(indptr[u], indptr[u + 1]):
+                if new_offsets[target_cluster[j]] >= 0:
+                    count += 1
+            new_indptr[row + 1] = new_indptr[row] + count
+            row += 1
+
+    new_indices = np.empty(new_indptr[-1], dtype=indptr.dtype)
+    new_data = np.empty(new_indptr[-1], dtype=data.dtype)
+    e = 0
+    for c in clusters:
+        for u in range(offsets[c], offsets[c + 1]):
+            for j in range(indptr[u], indptr[u + 1]):
+                offset = new_offsets[target_cluster[j]]
+                if offset >= 0:
+                    new_indices[e] = offset + target_local[j]
+                    new_data[e] = data[j]
+                    e += 1
+
+    return new_indptr, new_indices, new_data
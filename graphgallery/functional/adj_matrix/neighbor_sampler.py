@@ -1,49 +1,166 @@
 import numpy as np
 import scipy.sparse as sp
 
+from numba import njit, prange
+
 from ..transforms import Transform
 from graphgallery import intx
 
+# nodes in the same chunk share one seeded random stream,
+# which makes the results independent of the number of threads
+CHUNK_SIZE = 1024
+
 
 class NeighborSampler(Transform):
 
     def __init__(self, max_degree: int = 25,
-                 selfloop: bool = False):
+                 selfloop: bool = False,
+                 seed: int = None):
         super().__init__()
         self.max_degree = max_degree
         self.selfloop = selfloop
+        self.seed = seed
 
     def __call__(self, adj_matrix: sp.csr_matrix):
         return neighbor_sampler(adj_matrix, max_degree=self.max_degree,
-                                selfloop=self.selfloop)
+                                selfloop=self.selfloop, seed=self.seed)
 
     def extra_repr(self):
-        return f"max_degree={self.max_degree}, selfloop={self.selfloop}"
+        return f"max_degree={self.max_degree}, selfloop={self.selfloop}, seed={self.seed}"
 
 
 def neighbor_sampler(adj_matrix: sp.csr_matrix, max_degree: int = 25,
-                     selfloop: bool = False):
+                     selfloop: bool = False, seed: int = None):
+    """Sample a fixed number of neighbors for each node.
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the adjacency matrix of the graph.
+    max_degree : int, optional
+        the number of sampled neighbors for each node, by default 25.
+        Nodes with more neighbors are sampled without replacement,
+        and nodes with fewer neighbors are sampled with replacement.
+    selfloop : bool, optional
+        reserved, by default False
+    seed : int, optional
+        the random seed, by default None, i.e., drawn from `np.random`,
+        so that it is controlled by `np.random.seed`.
+
+    Returns
+    -------
+    np.ndarray
+        shape [num_nodes + 1, max_degree], the sampled neighbors of each node,
+        where each row is in random order. The last row and the rows of
+        isolated nodes are filled with the dummy node `num_nodes`.
+    """
     adj_matrix = adj_matrix.tocsr(copy=False)
-    N = adj_matrix.shape[0]
-    neighbors_matrix = N * np.ones((N + 1, max_degree), dtype=intx())
-    for nodeid in range(N):
-        neighbors = adj_matrix[nodeid].indices
+    if seed is None:
+        seed = np.random.randint(0, 2**31 - 1)
 
-#         if not selfloop:
-#             neighbors = np.setdiff1d(neighbors, [nodeid])
-#         else:
-#             neighbors = np.intersect1d(neighbors, [nodeid])
+    return _neighbor_sampler(adj_matrix.indices, adj_matrix.indptr,
+                             max_degree, seed).astype(intx(), copy=False)
 
-        size = neighbors.size
-        if size == 0:
-            continue
 
-        if size > max_degree:
-            neighbors = np.random.choice(neighbors, max_degree, replace=False)
-        elif size < max_degree:
-            neighbors = np.random.choice(neighbors, max_degree, replace=True)
+def sample_batch_neighbors(adj_matrix: sp.csr_matrix, nodes,
+                           n_neighbors: int, replace: bool = False,
+                           seed: int = None):
+    """Sample neighbors for a batch of nodes only, it only touches
+    the rows of `nodes` and costs O(len(nodes) * n_neighbors).
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the adjacency matrix of the graph.
+    nodes : np.ndarray
+        the (batch) nodes to sample neighbors for.
+        The dummy node `num_nodes` is allowed and has no neighbors.
+    n_neighbors : int
+        the number of sampled neighbors for each node.
+    replace : bool, optional
+        whether to sample with replacement, by default False.
+        If False, nodes with fewer than `n_neighbors` neighbors
+        take all of them and fill the rest with replacement.
+    seed : int, optional
+        the random seed, by default None, i.e., drawn from `np.random`.
+
+    Returns
+    -------
+    np.ndarray
+        shape [len(nodes), n_neighbors], the sampled neighbors,
+        where isolated nodes are filled with the dummy node `num_nodes`.
+    """
+    adj_matrix = adj_matrix.tocsr(copy=False)
+    if seed is None:
+        seed = np.random.randint(0, 2**31 - 1)
+    nodes = np.asarray(nodes, dtype=adj_matrix.indices.dtype)
+    return _sample_batch_neighbors(adj_matrix.indices, adj_matrix.indptr,
+                                   nodes, n_neighbors, replace, seed).astype(intx(), copy=False)
+
+
+@njit(nogil=True)
+def _sample_row(indices, start, size, out, replace):
+    n_neighbors = out.size
+    if replace or size < n_neighbors:
+        # fill with replacement but keep all neighbors if possible
+        if replace:
+            offset = 0
+        else:
+            offset = size
+            for j in range(size):
+                out[j] = indices[start + j]
+        for j in range(offset, n_neighbors):
+            out[j] = indices[start + np.random.randint(0, size)]
+    else:
+        # reservoir sampling, i.e., without replacement
+        for j in range(n_neighbors):
+            out[j] = indices[start + j]
+        for j in range(n_neighbors, size):
+            r = np.random.randint(0, j + 1)
+            if r < n_neighbors:
+                out[r] = indices[start + j]
+
+    # shuffle the row so that any prefix is also a random sample
+    for j in range(n_neighbors - 1, 0, -1):
+        r = np.random.randint(0, j + 1)
+        out[j], out[r] = out[r], out[j]
+
+
+@njit(parallel=True, nogil=True)
+def _neighbor_sampler(indices, indptr, max_degree, seed):
+    N = indptr.size - 1
+    neighbors_matrix = np.full((N + 1, max_degree), N, dtype=indices.dtype)
+    n_chunks = (N + CHUNK_SIZE - 1) // CHUNK_SIZE
+    for chunk in prange(n_chunks):
+        np.random.seed(seed + chunk)
+        end = min(N, (chunk + 1) * CHUNK_SIZE)
+        for nodeid in range(chunk * CHUNK_SIZE, end):
+            start = indptr[nodeid]
+            size = indptr[nodeid + 1] - start
+            if size > 0:
+                _sample_row(indices, start, size,
+                            neighbors_matrix[nodeid], False)
+
+    return neighbors_matrix
+
 
-        neighbors_matrix[nodeid] = neighbors
+@njit(parallel=True, nogil=True)
+def _sample_batch_neighbors(indices, indptr, nodes, n_neighbors, replace, seed):
+    N = indptr.size - 1
+    B = nodes.size
+    neighbors_matrix = np.full((B, n_neighbors), N, dtype=indices.dtype)
+    n_chunks = (B + CHUNK_SIZE - 1) // CHUNK_SIZE
+    for chunk in prange(n_chunks):
+        np.random.seed(seed + chunk)
+        end = min(B, (chunk + 1) * CHUNK_SIZE)
+        for i in range(chunk * CHUNK_SIZE, end):
+            node = nodes[i]
+            if node >= N:
+                continue
+            start = indptr[node]
+            size = indptr[node + 1] - start
+            if size > 0:
+                _sample_row(indices, start, size,
+                            neighbors_matrix[i], replace)
 
-    np.random.shuffle(neighbors_matrix.T)
     return neighbors_matrix
@@ -5,7 +5,7 @@ from typing import List
 
 from graphgallery.typing import ArrayLike1D, SparseMatrix
 
-__all__ = ['find_4o_nbrs']
+__all__ = ['find_4o_nbrs', 'sample_independent_nodes']
 
 @njit
 def neighbors_mask(indices: ArrayLike1D, indptr: ArrayLike1D,
@@ -38,3 +38,63 @@ def find_4o_nbrs(adj_matrix: SparseMatrix,
     if candidates is None:
         candidates = np.arange(adj_matrix.shape[0])
     return list(_find_4o_nbrs(adj_matrix.indices, adj_matrix.indptr, candidates, radius=radius))
+
+
+def sample_independent_nodes(neighbors, n_samples: int, seed: int = None) -> np.ndarray:
+    """Greedily sample nodes that are not in the neighborhoods of each other,
+    i.e., visit the nodes in a random order and take a node if it is not
+    covered by the neighborhoods of the nodes taken before.
+    It stops after `n_samples` nodes are taken or all nodes are visited.
+
+    Parameters
+    ----------
+    neighbors : list of np.ndarray or tuple of (indices, indptr)
+        the neighborhood of each node, e.g., the outputs of `find_4o_nbrs`,
+        or the same in CSR layout.
+    n_samples : int
+        the maximum number of sampled nodes.
+    seed : int, optional
+        the random seed, by default None, i.e., drawn from `np.random`.
+
+    Returns
+    -------
+    np.ndarray
+        the sampled nodes.
+    """
+    if isinstance(neighbors, tuple):
+        indices, indptr = neighbors
+    else:
+        indices, indptr = neighbors_to_csr(neighbors)
+    if seed is None:
+        seed = np.random.randint(0, 2**31 - 1)
+    return _sample_independent_nodes(indices, indptr, n_samples, seed)
+
+
+def neighbors_to_csr(neighbors):
+    """Convert a list of neighborhoods into (indices, indptr)."""
+    indptr = np.zeros(len(neighbors) + 1, dtype=np.int64)
+    np.cumsum([len(nbrs) for nbrs in neighbors], out=indptr[1:])
+    if len(neighbors) > 0:
+        indices = np.concatenate(neighbors).astype(np.int64, copy=False)
+    else:
+        indices = np.zeros(0, dtype=np.int64)
+    return indices, indptr
+
+
+@njit(nogil=True)
+def _sample_independent_nodes(indices, indptr, n_samples, seed):
+    np.random.seed(seed)
+    N = indptr.size - 1
+    flag = np.zeros(N, dtype=np.bool_)
+    sampled = np.empty(min(n_samples, N), dtype=np.int64)
+    count = 0
+    for n in np.random.permutation(N):
+        if count == sampled.size:
+            break
+        if flag[n]:
+            continue
+        sampled[count] = n
+        count += 1
+        for j in range(indptr[n], indptr[n + 1]):
+            flag[indices[j]] = True
+    return sampled[:count]
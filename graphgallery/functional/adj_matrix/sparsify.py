@@ -0,0 +1,77 @@
+import numpy as np
+import scipy.sparse as sp
+
+from numba import njit, prange
+
+__all__ = ['clip_matrix', 'top_k_matrix']
+
+
+def clip_matrix(matrix, threshold: float, strict: bool = False) -> sp.csr_matrix:
+    '''Sparsify using threshold epsilon, i.e., drop the entries smaller than
+    `threshold` (or not larger than it if `strict=True`).
+
+    Note:
+    ----------
+    If `matrix` is a `sp.csr_matrix`, it is modified in place.
+    '''
+    assert sp.isspmatrix(
+        matrix
+    ), 'Input matrix should be sparse matrix with format scipy.sparse.*_matrix.'
+    matrix = matrix.tocsr()
+    if strict:
+        matrix.data[matrix.data <= threshold] = 0.
+    else:
+        matrix.data[matrix.data < threshold] = 0.
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def top_k_matrix(matrix, k: int) -> sp.csr_matrix:
+    '''Row-wise select top-k values.
+
+    Note:
+    ----------
+    If `matrix` is a `sp.csr_matrix`, it is modified in place.
+    '''
+    assert sp.isspmatrix(
+        matrix
+    ), 'Input matrix should be sparse matrix with format scipy.sparse.*_matrix.'
+    matrix = matrix.tocsr()
+    _top_k_rows(matrix.indptr, matrix.data, k)
+    matrix.eliminate_zeros()
+    return matrix
+
+
+@njit(parallel=True, nogil=True)
+def _top_k_rows(indptr, data, k):
+    N = indptr.size - 1
+    for row in prange(N):
+        _top_k_row(data[indptr[row]:indptr[row + 1]], k)
+
+
+@njit(nogil=True)
+def _top_k_row(values, k):
+    """Zero out all but the k largest entries of `values` in place."""
+    n = values.size
+    if n <= k:
+        return
+    if k == 0:
+        values[:] = 0.
+        return
+    # the k-th largest value of the row
+    kth = np.partition(values, n - k)[n - k]
+    n_greater = 0
+    for j in range(n):
+        if values[j] > kth:
+            n_greater += 1
+    # keep all values larger than `kth` and the first ties
+    n_ties = k - n_greater
+    for j in range(n):
+        value = values[j]
+        if value < kth:
+            values[j] = 0.
+        elif value == kth:
+            if n_ties > 0:
+                n_ties -= 1
+            else:
+                values[j] = 0.
@@ -0,0 +1,89 @@
+import numba
+import numpy as np
+import scipy.sparse as sp
+
+from numba import njit, prange
+
+import graphgallery as gg
+
+__all__ = ['spmm']
+
+
+def spmm(adj_matrix: sp.csr_matrix, x: np.ndarray,
+         out: np.ndarray = None, dtype=None) -> np.ndarray:
+    """Multithreaded product of a sparse matrix and a dense matrix,
+    i.e., `adj_matrix @ x`, as a drop-in for the single-threaded scipy product.
+
+    The rows are partitioned into chunks of (nearly) equal nonzeros,
+    and each thread accumulates its output rows in `dtype`.
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        shape [M, N], the sparse matrix.
+    x : np.ndarray
+        shape [N, F] or [N,], the dense matrix.
+    out : np.ndarray, optional
+        shape [M, F] or [M,], C-contiguous with `dtype`, the buffer
+        to write the outputs, which must not share memory with `x`.
+        By default None, i.e., a new array.
+    dtype : optional
+        the dtype of the outputs and accumulation, by default None,
+        i.e., the dtype of `out` if specified, else `graphgallery.floatx()`.
+
+    Returns
+    -------
+    np.ndarray
+        shape [M, F] or [M,], the product.
+    """
+    adj_matrix = adj_matrix.tocsr(copy=False)
+    if dtype is None:
+        dtype = out.dtype if out is not None else gg.floatx()
+    dtype = np.dtype(dtype)
+
+    x = np.asarray(x)
+    squeeze = x.ndim == 1
+    x = np.ascontiguousarray(x.reshape(x.shape[0], -1), dtype=dtype)
+    shape = (adj_matrix.shape[0], x.shape[1])
+    if adj_matrix.shape[1] != x.shape[0]:
+        raise ValueError(f"Incompatible shapes {adj_matrix.shape} and {x.shape}.")
+
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    else:
+        if out.dtype != dtype or not out.flags.c_contiguous or out.size != shape[0] * shape[1]:
+            raise ValueError(f"`out` must be a C-contiguous array of dtype {dtype} and shape {shape}.")
+        if np.may_share_memory(out, x):
+            raise ValueError("`out` must not share memory with `x`.")
+    result = out
+    out = out.reshape(shape)
+
+    data = adj_matrix.data.astype(dtype, copy=False)
+    _spmm(adj_matrix.indptr, adj_matrix.indices, data, x, out,
+          _row_partition(adj_matrix.indptr, 4 * numba.get_num_threads()))
+    if squeeze and result.ndim == 2:
+        return result.reshape(-1)
+    return result
+
+
+def _row_partition(indptr, n_chunks):
+    """Split the rows into `n_chunks` chunks with (nearly)
+    equal costs, i.e., the number of nonzeros and rows."""
+    cost = indptr + np.arange(indptr.size)
+    bounds = np.searchsorted(cost, np.linspace(0, cost[-1], n_chunks + 1))
+    bounds[0], bounds[-1] = 0, indptr.size - 1
+    return np.unique(bounds)
+
+
+@njit(parallel=True, nogil=True)
+def _spmm(indptr, indices, data, x, out, bounds):
+    F = x.shape[1]
+    for chunk in prange(bounds.size - 1):
+        for row in range(bounds[chunk], bounds[chunk + 1]):
+            o = out[row]
+            o[:] = 0.
+            for j in range(indptr[row], indptr[row + 1]):
+                value = data[j]
+                h = x[indices[j]]
+                for f in range(F):
+                    o[f] += value * h[f]
@@ -1,37 +1,109 @@
 import numpy as np
 import scipy.sparse as sp
+
+from concurrent.futures import ThreadPoolExecutor
+
 from ..transforms import Transform
 from ..functions import repeat
 
 
 class SVD(Transform):
+    cacheable = True
 
-    def __init__(self, k=50, threshold=0.01, binaryzation=False):
+    def __init__(self, k=50, threshold=0.01, binaryzation=False, top_k=None,
+                 block_size=None, workers=1, max_memory=2**27):
         super().__init__()
         self.k = k
         self.threshold = threshold
         self.binaryzation = binaryzation
+        self.top_k = top_k
+        self.block_size = block_size
+        self.workers = workers
+        self.max_memory = max_memory
 
     def __call__(self, adj_matrix):
         return svd(adj_matrix, k=self.k,
                    threshold=self.threshold,
-                   binaryzation=self.binaryzation)
+                   binaryzation=self.binaryzation,
+                   top_k=self.top_k,
+                   block_size=self.block_size,
+                   workers=self.workers,
+                   max_memory=self.max_memory)
 
     def extra_repr(self):
-        return f"k={self.k}, threshold={self.threshold}, binaryzation={self.binaryzation}"
+        # `block_size`, `workers` and `max_memory` do not change the outputs
+        return f"k={self.k}, threshold={self.threshold}, binaryzation={self.binaryzation}, top_k={self.top_k}"
+
 
+def svd(adj_matrix, k=50, threshold=0.01, binaryzation=False,
+        top_k=None, block_size=None, workers=1, max_memory=2**27):
+    """Return the rank-`k` reconstruction of `adj_matrix` as a sparse matrix.
 
-def svd(adj_matrix, k=50, threshold=0.01, binaryzation=False):
+    The reconstruction `(U * S) @ V` is computed in row blocks, and each
+    block keeps only the entries larger than `threshold` (and the largest
+    `top_k` entries of each row) before it is appended to the CSR outputs,
+    so that the dense N x N matrix is never built, and the peak memory is
+    O(N * k + nnz of the outputs).
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the adjacency matrix of the graph.
+    k : int, optional
+        the number of singular values, by default 50
+    threshold : float, optional
+        the entries not larger than `threshold` are dropped, by default 0.01.
+        If None, only zeros are dropped.
+    binaryzation : bool, optional
+        whether to set the kept entries to 1, by default False
+    top_k : int, optional
+        the maximum number of kept entries in each row,
+        by default None, i.e., unbounded
+    block_size : int, optional
+        the number of rows of each block, by default None,
+        i.e., as many as fit in `max_memory` bytes
+    workers : int, optional
+        the number of threads computing blocks concurrently, by default 1
+    max_memory : int, optional
+        the memory budget in bytes for each block, by default 128 MiB.
+        It is ignored if `block_size` is specified.
+    """
+    if top_k is not None and top_k < 1:
+        raise ValueError(f"`top_k` should be a positive integer, but got {top_k}.")
 
     adj_matrix = adj_matrix.asfptype()
     U, S, V = sp.linalg.svds(adj_matrix, k=k)
-    adj_matrix = (U * S) @ V
+    US = U * S
+    N, M = adj_matrix.shape
+    if not block_size:
+        block_size = max(1, max_memory // (M * US.dtype.itemsize))
+
+    def reconstruct(start):
+        block = US[start:start + block_size] @ V
+        if threshold is not None:
+            block[block <= threshold] = 0.
+        if top_k is not None and top_k < M:
+            # zero all but the `top_k` largest entries of each row
+            smallest = np.argpartition(block, M - top_k, axis=1)[:, :M - top_k]
+            np.put_along_axis(block, smallest, 0., axis=1)
+        rows, cols = np.nonzero(block)
+        return np.bincount(rows, minlength=block.shape[0]), cols, block[rows, cols]
 
-    if threshold is not None:
-        # sparsification
-        adj_matrix[adj_matrix <= threshold] = 0.
+    starts = range(0, N, block_size)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            blocks = list(executor.map(reconstruct, starts))
+    else:
+        blocks = [reconstruct(start) for start in starts]
 
-    adj_matrix = sp.csr_matrix(adj_matrix)
+    indptr = np.zeros(N + 1, dtype=np.int64)
+    if blocks:
+        np.cumsum(np.concatenate([block[0] for block in blocks]), out=indptr[1:])
+        indices = np.concatenate([block[1] for block in blocks])
+        data = np.concatenate([block[2] for block in blocks])
+    else:
+        indices, data = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=US.dtype)
+    adj_matrix = sp.csr_matrix((data, indices, indptr), shape=(N, M))
 
     if binaryzation:
         # TODO
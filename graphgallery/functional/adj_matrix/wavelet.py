@@ -1,7 +1,8 @@
 import scipy.sparse as sp
 import numpy as np
 
-from sklearn.preprocessing import normalize
+import numba
+from numba import njit, prange
 
 from ..transforms import Transform
 from ..decorators import multiple
@@ -84,26 +85,31 @@ from ..decorators import multiple
 
 
 class WaveletBasis(Transform):
+    cacheable = True
+
     def __init__(self,
                  order=3,
                  wavelet_s=1.2,
                  threshold=1e-4,
-                 wavelet_normalize=True):
+                 wavelet_normalize=True,
+                 max_nnz=None):
         super().__init__()
         self.order = order
         self.wavelet_s = wavelet_s
         self.threshold = threshold
         self.wavelet_normalize = wavelet_normalize
+        self.max_nnz = max_nnz
 
     def __call__(self, adj_matrix):
         return wavelet_basis(adj_matrix,
                              order=self.order,
                              wavelet_s=self.wavelet_s,
                              threshold=self.threshold,
-                             wavelet_normalize=self.wavelet_normalize)
+                             wavelet_normalize=self.wavelet_normalize,
+                             max_nnz=self.max_nnz)
 
     def extra_repr(self):
-        return f"order={self.order}, wavelet_s={self.wavelet_s}, threshold={self.threshold}, wavelet_normalize={self.wavelet_normalize}"
+        return f"order={self.order}, wavelet_s={self.wavelet_s}, threshold={self.threshold}, wavelet_normalize={self.wavelet_normalize}, max_nnz={self.max_nnz}"
 
 
 def laplacian(adj_matrix, normalized=True):
@@ -144,29 +150,300 @@ def wavelet_basis(adj_matrix,
                   order=3,
                   wavelet_s=1.0,
                   threshold=1e-4,
-                  wavelet_normalize=False):
-    lap = laplacian(adj_matrix)
+                  wavelet_normalize=False,
+                  max_nnz=None,
+                  block_size=4096):
+    """Return the wavelet basis and its inverse approximated with
+    Chebyshev polynomials of the Laplacian up to `order`.
+
+    Both bases are computed together, row by row (in parallel):
+    each row of the Chebyshev polynomials is a sparse vector over the
+    `order`-hop neighborhood of the node, and the rows of the bases are
+    truncated right away, so that the dense-growing polynomial matrices
+    are never built. The rows of each block are counted and buffered
+    (about 256 entries per row), and the rows beyond the buffer are recomputed
+    into their exact offsets of the outputs, so that the memory is
+    O(nnz of the outputs + block_size * 256) plus the scratch over the
+    largest neighborhood for each thread.
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the adjacency matrix of the graph.
+    order : int, optional
+        the order of Chebyshev polynomials, by default 3
+    wavelet_s : float, optional
+        the scale of the wavelet, by default 1.0
+    threshold : float, optional
+        the entries not larger than `threshold` are dropped, by default 1e-4
+    wavelet_normalize : bool, optional
+        whether to normalize each row to unit l1 norm, by default False
+    max_nnz : int, optional
+        the maximum number of nonzeros in each row, i.e., only the largest
+        `max_nnz` entries are kept, by default None, i.e., unbounded
+    block_size : int, optional
+        the number of rows computed in each step, by default 4096
+
+    Returns
+    -------
+    (sp.csr_matrix, sp.csr_matrix)
+        the wavelet basis and its inverse.
+    """
+    lap = laplacian(adj_matrix).tocsr()
     N = adj_matrix.shape[0]
-    I = sp.eye(N)
-    L = lap - I
-    monome = {0: I, 1: L}
+    L = (lap - sp.eye(N)).tocsr()
+    coeffs = np.stack([compute_cheb_coeff_basis(wavelet_s, order),
+                       compute_cheb_coeff_basis(-wavelet_s, order)])
+    max_nnz = max_nnz or 0
+    # the average number of entries of each row buffered in the first pass
+    cap = max_nnz or 256
+    n_workers = numba.get_num_threads()
+    index_dtype = np.int32 if N < 2**31 else np.int64
 
-    for k in range(2, order + 1):
-        monome[k] = 2 * L @ monome[k - 1] - monome[k - 2]
+    def compute(rows, pool, starts, out_indices, out_data):
+        return _wavelet_rows(L.indptr, L.indices, L.data, rows, coeffs, threshold,
+                             wavelet_normalize, max_nnz, n_workers,
+                             pool, starts, out_indices, out_data)
 
-    def compute_walelet(tau):
-        coeffs = compute_cheb_coeff_basis(tau, order)
-        w = np.sum([coeffs[k] * monome[k] for k in range(order + 1)])
-        w.data = thres(w.data)
-        w.eliminate_zeros()
-        return w
+    counts = np.zeros((2, N), dtype=np.int64)
+    indices, data = ([], []), ([], [])
+    for start in range(0, N, block_size):
+        rows = np.arange(start, min(start + block_size, N))
+        B = rows.size
+        # first pass: count the entries of each row, and keep the rows
+        # in a buffer of `cap` entries per row on average, shared by the
+        # rows of each worker, until it is full
+        pool = 2 * cap * -(-B // n_workers)
+        buffer_indices = np.empty(n_workers * pool, dtype=index_dtype)
+        buffer_data = np.empty(n_workers * pool)
+        buffered = np.empty((2, B), dtype=np.int64)
+        block_counts = compute(rows, pool, buffered, buffer_indices, buffer_data)
+        counts[:, rows] = block_counts
 
-    thres = np.vectorize(lambda x: x if x > threshold else 0.)
-    Wavelet = compute_walelet(wavelet_s)
-    Wavelet_inverse = compute_walelet(-wavelet_s)
+        # the exact offsets of the rows in the CSR buffer of the block,
+        # i.e., the rows of the basis followed by the rows of its inverse
+        offsets = np.zeros(2 * B + 1, dtype=np.int64)
+        np.cumsum(block_counts, out=offsets[1:])
+        block_indices = np.empty(offsets[-1], dtype=index_dtype)
+        block_data = np.empty(offsets[-1])
+        offsets = offsets[:-1].reshape(2, B)
+        fits = buffered >= 0
+        _copy_rows(buffer_indices, buffer_data, buffered[fits], block_indices, block_data,
+                   offsets[fits], block_counts[fits])
+        del buffer_indices, buffer_data
 
-    if wavelet_normalize:
-        Wavelet = normalize(Wavelet, norm='l1', axis=1)
-        Wavelet_inverse = normalize(Wavelet_inverse, norm='l1', axis=1)
+        # second pass: recompute the rows beyond the buffer into their offsets
+        overflow = np.nonzero(~fits.all(0))[0]
+        if overflow.size > 0:
+            compute(rows[overflow], 0, np.ascontiguousarray(offsets[:, overflow]),
+                    block_indices, block_data)
 
+        split = block_counts[0].sum()
+        for b, part in enumerate((slice(None, split), slice(split, None))):
+            indices[b].append(block_indices[part])
+            data[b].append(block_data[part])
+
+    bases = []
+    for b in range(2):
+        indptr = np.zeros(N + 1, dtype=np.int64)
+        np.cumsum(counts[b], out=indptr[1:])
+        bases.append(sp.csr_matrix((np.concatenate(data[b]), np.concatenate(indices[b]), indptr),
+                                   shape=(N, N)))
+
+    Wavelet, Wavelet_inverse = bases
     return Wavelet, Wavelet_inverse
+
+
+@njit(nogil=True)
+def _copy_rows(src_indices, src_data, src_starts, dst_indices, dst_data, dst_starts, counts):
+    for r in range(counts.size):
+        src, dst = src_starts[r], dst_starts[r]
+        for t in range(counts[r]):
+            dst_indices[dst + t] = src_indices[src + t]
+            dst_data[dst + t] = src_data[src + t]
+
+
+@njit(parallel=True, nogil=True)
+def _wavelet_rows(indptr, indices, data, rows, coeffs, threshold, normalize, max_nnz,
+                  n_workers, pool, starts, out_indices, out_data):
+    """Compute the given rows of both bases, i.e., `sum_k coeffs[b, k] * T_k(L)[row]`,
+    and return the number of kept entries of each row.
+
+    If `pool` is 0, the (truncated) entries of row `i` of basis `b` are written
+    at `starts[b, i]` of the outputs. Otherwise, each worker appends its rows
+    to its own `pool` entries of the outputs while they fit, and `starts[b, i]`
+    is set to the position of each row, or -1 if it does not fit."""
+    order = coeffs.shape[1] - 1
+    N = indptr.size - 1
+    B = rows.size
+    counts = np.zeros((2, B), dtype=np.int64)
+
+    for worker in prange(n_workers):
+        cursor, end = worker * pool, (worker + 1) * pool
+        # the sparse accumulators over the nodes touched by the recurrence,
+        # whose compact positions are looked up in an open-addressing hash table,
+        # so that the scratch grows with the largest neighborhood rather than N
+        table_keys = np.full(1024, -1, dtype=np.int64)
+        table_slots = np.empty(1024, dtype=np.int64)
+        touched = np.empty(256, dtype=np.int64)
+        positions = np.empty(256, dtype=np.int64)
+        prev, cur, nxt = np.zeros(256), np.zeros(256), np.zeros(256)
+        acc = np.zeros((2, 256))
+
+        for i in range(worker, B, n_workers):
+            row = rows[i]
+            h = _hash(row, table_keys.size - 1)
+            table_keys[h] = row
+            table_slots[h] = 0
+            touched[0] = row
+            positions[0] = h
+            n_touched = 1
+            # T_0 = I
+            cur[0] = 1.
+            acc[0, 0] = coeffs[0, 0]
+            acc[1, 0] = coeffs[1, 0]
+            for k in range(1, order + 1):
+                # T_k = 2 * T_{k-1} @ L - T_{k-2}, and T_1 = L
+                scale = 1. if k == 1 else 2.
+                n = n_touched
+                # make room for the nodes reached in this step beforehand,
+                # so that the scratch is not reallocated in the inner loop
+                capacity = n
+                for t in range(n):
+                    if cur[t] != 0.:
+                        j = touched[t]
+                        capacity += indptr[j + 1] - indptr[j]
+                capacity = min(capacity, N)
+                if capacity > touched.size:
+                    size = max(capacity, 2 * touched.size)
+                    touched, positions = _resize(touched, size), _resize(positions, size)
+                    prev, cur, nxt = _resize(prev, size), _resize(cur, size), _resize(nxt, size)
+                    acc = _resize2(acc, size)
+                if 2 * capacity > table_keys.size:
+                    table_keys, table_slots = _rehash(touched, positions, n_touched,
+                                                      _next_power_of_two(2 * capacity))
+                mask = table_keys.size - 1
+
+                for t in range(n):
+                    value = cur[t]
+                    if value == 0.:
+                        continue
+                    j = touched[t]
+                    for e in range(indptr[j], indptr[j + 1]):
+                        col = indices[e]
+                        h = _hash(col, mask)
+                        while table_keys[h] != col and table_keys[h] != -1:
+                            h = (h + 1) & mask
+                        if table_keys[h] == col:
+                            slot = table_slots[h]
+                        else:
+                            table_keys[h] = col
+                            table_slots[h] = n_touched
+                            touched[n_touched] = col
+                            positions[n_touched] = h
+                            slot = n_touched
+                            n_touched += 1
+                        nxt[slot] += scale * value * data[e]
+                for t in range(n_touched):
+                    if k > 1:
+                        nxt[t] -= prev[t]
+                    acc[0, t] += coeffs[0, k] * nxt[t]
+                    acc[1, t] += coeffs[1, k] * nxt[t]
+                    prev[t] = cur[t]
+                    cur[t] = nxt[t]
+                    nxt[t] = 0.
+
+            for b in range(2):
+                nodes = np.empty(n_touched, dtype=np.int64)
+                values = np.empty(n_touched)
+                n_kept = 0
+                for t in range(n_touched):
+                    if acc[b, t] > threshold:
+                        nodes[n_kept] = touched[t]
+                        values[n_kept] = acc[b, t]
+                        n_kept += 1
+                nodes, values = nodes[:n_kept], values[:n_kept]
+                if max_nnz > 0 and n_kept > max_nnz:
+                    nodes, values = _largest(nodes, values, max_nnz)
+                    n_kept = max_nnz
+                counts[b, i] = n_kept
+                if pool > 0:
+                    if cursor + n_kept > end:
+                        starts[b, i] = -1
+                        continue
+                    starts[b, i] = cursor
+                    cursor += n_kept
+                start = starts[b, i]
+                nodes, values = _sort_by_node(nodes, values)
+                norm = 1.
+                if normalize:
+                    norm = values.sum()
+                for t in range(n_kept):
+                    out_indices[start + t] = nodes[t]
+                    out_data[start + t] = values[t] / norm
+
+            # reset the accumulators
+            for t in range(n_touched):
+                table_keys[positions[t]] = -1
+                prev[t] = 0.
+                cur[t] = 0.
+                acc[0, t] = 0.
+                acc[1, t] = 0.
+
+    return counts
+
+
+@njit(nogil=True)
+def _hash(key, mask):
+    # Fibonacci hashing
+    return (key * 2654435761) & mask
+
+
+@njit(nogil=True)
+def _resize(array, size):
+    out = np.zeros(size, dtype=array.dtype)
+    out[:array.size] = array
+    return out
+
+
+@njit(nogil=True)
+def _resize2(array, size):
+    out = np.zeros((array.shape[0], size), dtype=array.dtype)
+    out[:, :array.shape[1]] = array
+    return out
+
+
+@njit(nogil=True)
+def _next_power_of_two(n):
+    size = 1
+    while size < n:
+        size *= 2
+    return size
+
+
+@njit(nogil=True)
+def _rehash(touched, positions, n_touched, size):
+    table_keys = np.full(size, -1, dtype=np.int64)
+    table_slots = np.empty(size, dtype=np.int64)
+    mask = size - 1
+    for t in range(n_touched):
+        h = _hash(touched[t], mask)
+        while table_keys[h] != -1:
+            h = (h + 1) & mask
+        table_keys[h] = touched[t]
+        table_slots[h] = t
+        positions[t] = h
+    return table_keys, table_slots
+
+
+@njit(nogil=True)
+def _largest(nodes, values, k):
+    """Return the `k` nodes with the largest values."""
+    order = np.argsort(-values, kind='mergesort')[:k]
+    return nodes[order], values[order]
+
+
+@njit(nogil=True)
+def _sort_by_node(nodes, values):
+    order = np.argsort(nodes)
+    return nodes[order], values[order]
@@ -1 +1,2 @@
 from .attr_transform import *
+from .propagate import *
@@ -0,0 +1,98 @@
+import numpy as np
+import scipy.sparse as sp
+
+import graphgallery as gg
+from ..transforms import Transform
+from ..adj_matrix.spmm import spmm
+from ..transform_cache import transform_cache
+
+__all__ = ['PropagateAttr', 'propagate_attr']
+
+
+class PropagateAttr(Transform):
+    def __init__(self, order: int = 1, chunk_size: int = None):
+        super().__init__()
+        self.order = order
+        self.chunk_size = chunk_size
+
+    def __call__(self, adj_matrix: sp.csr_matrix, node_attr):
+        return propagate_attr(adj_matrix, node_attr, order=self.order,
+                              chunk_size=self.chunk_size)
+
+    def extra_repr(self):
+        # `chunk_size` does not change the outputs
+        return f"order={self.order}"
+
+
+def propagate_attr(adj_matrix: sp.csr_matrix, node_attr,
+                   order: int = 1, chunk_size: int = None,
+                   max_memory: int = 2**28) -> np.ndarray:
+    """Propagate the node attributes over the graph for `order` times,
+    i.e., `adj_matrix^order @ node_attr`, as used by decoupled models
+    such as `SGC` and `FastGCN`.
+
+    The propagation is computed with the multithreaded `spmm` in column chunks
+    of `node_attr`, so that only a few dense chunks of shape [num_nodes, chunk_size]
+    are in memory.
+    If the transform cache is enabled (see `graphgallery.functional.set_transform_cache`),
+    the outputs are written chunk by chunk to a memory-mapped file in the cache,
+    keyed by `adj_matrix`, `node_attr` and `order`, so that they are reused
+    across runs and hyperparameter sweeps, and only the gathered rows
+    are loaded in memory. Models such as `SGC` and `FastGCN` keep these
+    outputs on the host and only move the gathered rows of each batch to the device.
+    Otherwise, the full output array of shape [num_nodes, num_node_attrs] is
+    allocated in memory, and only the intermediate chunks are bounded by `max_memory`.
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the (normalized) adjacency matrix of the graph.
+    node_attr : np.ndarray or sp.csr_matrix
+        the node attribute matrix.
+    order : int, optional
+        the number of propagation steps, by default 1.
+    chunk_size : int, optional
+        the number of columns in each chunk, by default None,
+        i.e., as many as fit in `max_memory` bytes.
+    max_memory : int, optional
+        the memory budget in bytes for each chunk, by default 256 MiB.
+        It is ignored if `chunk_size` is specified.
+
+    Returns
+    -------
+    np.ndarray
+        shape [num_nodes, num_node_attrs], the propagated attributes,
+        which is a (copy-on-write) memory-mapped array if the transform cache is enabled.
+    """
+    dtype = np.dtype(gg.floatx())
+    N, F = node_attr.shape
+    if not chunk_size:
+        chunk_size = max(1, max_memory // (3 * max(N, 1) * dtype.itemsize))
+
+    def fill(out):
+        adj = adj_matrix.tocsr(copy=False).astype(dtype, copy=False)
+        attr = node_attr.tocsc(copy=False) if sp.isspmatrix(node_attr) else node_attr
+        buffers = None
+        for start in range(0, F, chunk_size):
+            end = min(start + chunk_size, F)
+            h = attr[:, start:end]
+            h = h.toarray() if sp.isspmatrix(h) else np.asarray(h)
+            h = np.ascontiguousarray(h, dtype=dtype)
+            if buffers is None or buffers[0].shape != h.shape:
+                buffers = [np.empty_like(h), np.empty_like(h)]
+            for k in range(order):
+                h = spmm(adj, h, out=buffers[k % 2])
+            out[:, start:end] = h
+
+    cache = transform_cache()
+    if cache is None:
+        out = np.empty((N, F), dtype=dtype)
+        fill(out)
+        return out
+
+    transform = PropagateAttr(order=order)
+    key = cache.key(transform, (adj_matrix, node_attr, dtype.name))
+    out = cache.load(key)
+    if out is None:
+        out = cache.save_memmap(key, (N, F), dtype, fill)
+    return out
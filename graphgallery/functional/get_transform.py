@@ -8,12 +8,14 @@ from graphgallery.functional import AddSelfLoops
 from graphgallery.functional import NormalizeAttr
 from graphgallery.functional import WaveletBasis
 from graphgallery.functional import ChebyBasis
+from graphgallery.functional import ChebyOperator
 from graphgallery.functional import NeighborSampler
 from graphgallery.functional import GraphPartition
 from graphgallery.functional import SparseAdjToEdge
 from graphgallery.functional import SparseReshape
 
 from .transforms import *
+from .transform_cache import CachedTransform
 from .functions import *
 
 __all__ = ['get', 'Compose']
@@ -25,6 +27,7 @@ _TRANSFORMS = {"gdc": GDC,
                "add_selfloops": AddSelfLoops,
                "wavelet_basis": WaveletBasis,
                "cheby_basis": ChebyBasis,
+               "cheby_operator": ChebyOperator,
                "neighbor_sampler": NeighborSampler,
                "graph_partition": GraphPartition,
                "sparse_adj_to_edge": SparseAdjToEdge,
@@ -66,7 +69,7 @@ def get(transform: Union[str, Transform, None, List, Tuple, "Compose"]) -> Trans
         return Compose(*transform)
 
     if isinstance(transform, Transform) or callable(transform):
-        return transform
+        return _maybe_cached(transform)
     elif transform is None:
         return NullTransform()
     _transform = str(transform).lower()
@@ -74,4 +77,12 @@ def get(transform: Union[str, Transform, None, List, Tuple, "Compose"]) -> Trans
     if _transform is None:
         raise ValueError(
             f"Unknown transform: '{transform}', expected a string, callable function or None.")
-    return _transform()
+    return _maybe_cached(_transform())
+
+
+def _maybe_cached(transform):
+    """Expensive transforms are wrapped to use the transform cache,
+    see `graphgallery.functional.set_transform_cache`."""
+    if getattr(transform, "cacheable", False) and not isinstance(transform, CachedTransform):
+        return CachedTransform(transform)
+    return transform
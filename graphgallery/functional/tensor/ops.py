@@ -132,7 +132,6 @@ def sparse_edge_to_sparse_tensor(edge_index: np.ndarray,
     return module.sparse_edge_to_sparse_tensor(edge_index, edge_weight, shape)
 
 
-#### only works for tensorflow backend now #####################################
 def normalize_adj_tensor(adj,
                          rate=-0.5,
                          fill_weight=1.0,
@@ -141,6 +140,7 @@ def normalize_adj_tensor(adj,
     return module.normalize_adj_tensor(adj, rate=rate, fill_weight=fill_weight)
 
 
+#### only works for tensorflow backend now #####################################
 def add_selfloops_edge(edge_index,
                        edge_weight,
                        num_nodes=None,
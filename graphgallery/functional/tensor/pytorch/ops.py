@@ -84,8 +84,38 @@ def sparse_tensor_to_sparse_adj(x: torch.sparse.Tensor) -> sp.csr_matrix:
 
 
 def normalize_adj_tensor(adj, rate=-0.5, fill_weight=1.0):
-    # TODO
-    ...
+    """Normalize the adjacency matrix `adj` (dense or sparse COO Tensor)
+    on device, i.e., `D^{rate} (A + fill_weight * I) D^{rate}`.
+
+    For sparse Tensor, the output is a sparse Tensor whose values are scaled
+    by the gathered degree powers of their rows and columns, without
+    materializing any dense N x N matrix.
+    """
+    num_nodes = adj.size(0)
+    if adj.is_sparse:
+        adj = adj.coalesce()
+        if fill_weight:
+            range_arr = torch.arange(num_nodes, device=adj.device)
+            eye = torch.sparse_coo_tensor(torch.stack([range_arr, range_arr]),
+                                          torch.full((num_nodes,), fill_weight,
+                                                     dtype=adj.dtype, device=adj.device),
+                                          adj.size())
+            adj = (adj + eye).coalesce()
+        row, col = adj.indices()
+        edge_weight = adj.values()
+        d = torch.zeros(num_nodes, dtype=adj.dtype,
+                        device=adj.device).index_add_(0, row, edge_weight)
+        d_power = d.pow(rate)
+        d_power = d_power.masked_fill(torch.isinf(d_power), 0.)
+        edge_weight = d_power[row] * edge_weight * d_power[col]
+        return torch.sparse_coo_tensor(adj.indices(), edge_weight, adj.size())
+
+    if fill_weight:
+        adj = adj + fill_weight * torch.eye(num_nodes, dtype=adj.dtype, device=adj.device)
+    d = adj.sum(1)
+    d_power = d.pow(rate)
+    d_power = d_power.masked_fill(torch.isinf(d_power), 0.)
+    return d_power.view(-1, 1) * adj * d_power.view(1, -1)
 
 
 def add_selfloops_edge(edge_index,
@@ -50,12 +50,34 @@ def sparse_tensor_to_sparse_adj(x) -> sp.csr_matrix:
 
 
 def normalize_adj_tensor(adj, rate=-0.5, fill_weight=1.0):
+    """Normalize the adjacency matrix `adj` (dense Tensor or SparseTensor)
+    on device, i.e., `D^{rate} (A + fill_weight * I) D^{rate}`.
+
+    For SparseTensor, the output is a SparseTensor whose values are scaled
+    by the gathered degree powers of their rows and columns, without
+    materializing any dense N x N matrix.
+    """
+    if isinstance(adj, tf.SparseTensor):
+        if fill_weight:
+            num_nodes = adj.dense_shape[0]
+            adj = tf.sparse.add(adj, tf.sparse.eye(num_nodes, dtype=adj.dtype) * fill_weight)
+        d = tf.sparse.reduce_sum(adj, axis=1)
+        d_power = _degree_power(d, rate)
+        row, col = tf.unstack(adj.indices, axis=1)
+        values = tf.gather(d_power, row) * adj.values * tf.gather(d_power, col)
+        return tf.SparseTensor(adj.indices, values, adj.dense_shape)
+
     if fill_weight:
-        adj = adj + fill_weight * tf.eye(tf.shape(adj)[0], dtype=adj.dtype)
+        adj = tf.linalg.set_diag(adj, tf.linalg.diag_part(adj) + fill_weight)
     d = tf.reduce_sum(adj, axis=1)
+    d_power = _degree_power(d, rate)
+    return tf.expand_dims(d_power, 1) * adj * tf.expand_dims(d_power, 0)
+
+
+def _degree_power(d, rate):
     d_power = tf.pow(d, rate)
-    d_power_mat = tf.linalg.diag(d_power)
-    return d_power_mat @ adj @ d_power_mat
+    # nodes without edges
+    return tf.where(tf.math.is_inf(d_power), tf.zeros_like(d_power), d_power)
 
 
 def add_selfloops_edge(edge_index,
@@ -0,0 +1,272 @@
+import os
+import json
+import uuid
+import shutil
+import hashlib
+import os.path as osp
+import numpy as np
+import scipy.sparse as sp
+
+from typing import Any, Optional
+
+import graphgallery as gg
+from .transforms import Transform
+
+__all__ = ['TransformCache', 'CachedTransform', 'transform_cache',
+           'set_transform_cache', 'disable_transform_cache']
+
+_MANIFEST = "manifest.json"
+# the transform cache is disabled by default
+_CACHE = None
+
+
+class TransformCache:
+    """An on-disk cache for the outputs of expensive transforms,
+    e.g., `GDC`, `WaveletBasis`, `ChebyBasis` and `SVD`.
+
+    Each entry is keyed by the fingerprint of the inputs (e.g., the CSR buffers),
+    the transform parameters (`repr(transform)`) and the global dtypes
+    (`graphgallery.floatx()` and `graphgallery.intx()`), and stored as raw `.npy`
+    arrays with a small JSON manifest, so that they are loaded
+    with memory mapping. The least recently used entries are evicted
+    when the cache grows beyond `max_size` bytes.
+    """
+
+    def __init__(self, root: str = "~/.graphgallery/transform_cache",
+                 max_size: int = 20 * 2**30):
+        """
+        Parameters
+        ----------
+        root : str, optional
+            the cache directory, by default "~/.graphgallery/transform_cache"
+        max_size : int, optional
+            the maximum size of the cache in bytes, by default 20 GiB
+        """
+        self.root = osp.abspath(osp.expanduser(root))
+        self.max_size = max_size
+        os.makedirs(self.root, exist_ok=True)
+
+    def key(self, transform: Transform, inputs: tuple) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        h.update(repr(transform).encode())
+        # the outputs are cast to the global dtypes by the transforms
+        h.update(f"{gg.floatx()}{gg.intx()}".encode())
+        _update_hash(h, inputs)
+        return h.hexdigest()
+
+    def load(self, key: str) -> Any:
+        """Return the cached outputs of `key`, or None if it is not cached."""
+        path = osp.join(self.root, key)
+        manifest = osp.join(path, _MANIFEST)
+        try:
+            with open(manifest) as f:
+                structure = json.load(f)
+            outputs = _decode(structure, path)
+            # mark as recently used
+            os.utime(manifest)
+        except (OSError, ValueError):
+            # missing, incomplete or evicted by another process
+            return None
+        return outputs
+
+    def save(self, key: str, outputs: Any) -> bool:
+        """Save `outputs` under `key`, return False if the
+        outputs are not supported, e.g., not arrays or sparse matrices."""
+        tmp = osp.join(self.root, f".{key}.{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        try:
+            structure = _encode(outputs, tmp, [0])
+            with open(osp.join(tmp, _MANIFEST), "w") as f:
+                json.dump(structure, f)
+        except TypeError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+
+        self._commit(tmp, key)
+        self.evict()
+        return True
+
+    def save_memmap(self, key: str, shape: tuple, dtype, fill) -> np.ndarray:
+        """Create an array entry of `shape` and `dtype` under `key`,
+        which is filled in place by `fill(array)` on a memory-mapped
+        file, so that it never needs to fit in memory.
+        Return the (memory-mapped) array loaded from the cache."""
+        tmp = osp.join(self.root, f".{key}.{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        try:
+            filename = "0.npy"
+            array = np.lib.format.open_memmap(osp.join(tmp, filename), mode="w+",
+                                              dtype=dtype, shape=tuple(shape))
+            fill(array)
+            array.flush()
+            del array
+            with open(osp.join(tmp, _MANIFEST), "w") as f:
+                json.dump({"type": "ndarray", "file": filename}, f)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        self._commit(tmp, key)
+        # load before the eviction, which keeps the mapped file alive
+        outputs = self.load(key)
+        self.evict()
+        return outputs
+
+    def _commit(self, tmp: str, key: str):
+        path = osp.join(self.root, key)
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            # saved by another process in the meantime
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def entries(self) -> list:
+        """Return a list of (key, size in bytes, last used time),
+        the least recently used first."""
+        entries = []
+        for key in os.listdir(self.root):
+            path = osp.join(self.root, key)
+            manifest = osp.join(path, _MANIFEST)
+            if key.startswith(".") or not osp.exists(manifest):
+                continue
+            try:
+                size = sum(osp.getsize(osp.join(path, f)) for f in os.listdir(path))
+                entries.append((key, size, osp.getmtime(manifest)))
+            except OSError:
+                continue
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Remove the least recently used entries until
+        the cache size is within `max_size`."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(osp.join(self.root, key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        for key in os.listdir(self.root):
+            shutil.rmtree(osp.join(self.root, key), ignore_errors=True)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(root={self.root}, max_size={self.max_size})"
+
+
+class CachedTransform(Transform):
+    """Wrap a transform so that its outputs are loaded from the
+    transform cache if available. It falls back to calling the transform
+    directly when the cache is disabled.
+
+    See also
+    ----------
+        graphgallery.functional.set_transform_cache
+    """
+
+    def __init__(self, transform: Transform):
+        super().__init__()
+        self.transform = transform
+
+    def __call__(self, *inputs):
+        cache = transform_cache()
+        if cache is None:
+            return self.transform(*inputs)
+
+        key = cache.key(self.transform, inputs)
+        outputs = cache.load(key)
+        if outputs is None:
+            outputs = self.transform(*inputs)
+            cache.save(key, outputs)
+        return outputs
+
+    def __repr__(self) -> str:
+        return repr(self.transform)
+
+    def __getattr__(self, attr):
+        # delegate the parameters of the wrapped transform, e.g., `order`
+        if attr == 'transform':
+            raise AttributeError(attr)
+        return getattr(self.transform, attr)
+
+
+def transform_cache() -> Optional[TransformCache]:
+    """Returns the current transform cache, or None if it is disabled."""
+    return _CACHE
+
+
+def set_transform_cache(root: str = "~/.graphgallery/transform_cache",
+                        max_size: int = 20 * 2**30) -> TransformCache:
+    """Enable the on-disk cache for expensive transforms.
+
+    Example:
+    --------
+    >>> graphgallery.functional.set_transform_cache("/tmp/cache", max_size=2**30)
+    >>> model = GWNN(graph) # the wavelet basis is computed and cached
+    >>> model = GWNN(graph) # the wavelet basis is loaded from the cache
+    """
+    global _CACHE
+    _CACHE = TransformCache(root, max_size=max_size)
+    return _CACHE
+
+
+def disable_transform_cache():
+    global _CACHE
+    _CACHE = None
+
+
+def _update_hash(h, x):
+    if sp.isspmatrix(x):
+        x = x.tocsr(copy=False)
+        h.update(f"csr{x.shape}".encode())
+        for array in (x.indptr, x.indices, x.data):
+            _update_hash(h, array)
+    elif isinstance(x, np.ndarray):
+        h.update(f"ndarray{x.shape}{x.dtype}".encode())
+        h.update(memoryview(np.ascontiguousarray(x)).cast("B"))
+    elif isinstance(x, (list, tuple)):
+        h.update(f"{type(x).__name__}{len(x)}".encode())
+        for item in x:
+            _update_hash(h, item)
+    else:
+        h.update(repr(x).encode())
+
+
+def _encode(x, path, counter):
+    if sp.isspmatrix(x):
+        fmt = x.format if x.format in ("csr", "csc") else "csr"
+        x = x.asformat(fmt)
+        files = []
+        for array in (x.data, x.indices, x.indptr):
+            files.append(_encode(array, path, counter)["file"])
+        return {"type": fmt, "shape": list(x.shape), "files": files}
+    elif isinstance(x, np.ndarray) and x.dtype != "O":
+        filename = f"{counter[0]}.npy"
+        counter[0] += 1
+        np.save(osp.join(path, filename), x)
+        return {"type": "ndarray", "file": filename}
+    elif isinstance(x, (list, tuple)):
+        return {"type": type(x).__name__,
+                "items": [_encode(item, path, counter) for item in x]}
+    raise TypeError(f"Unsupported type {type(x)} for the transform cache.")
+
+
+def _decode(structure, path):
+    _type = structure["type"]
+    if _type in ("csr", "csc"):
+        # copy-on-write, so that in-place operations are allowed
+        data, indices, indptr = (np.load(osp.join(path, f), mmap_mode="c")
+                                 for f in structure["files"])
+        matrix = sp.csr_matrix if _type == "csr" else sp.csc_matrix
+        return matrix((data, indices, indptr), shape=tuple(structure["shape"]))
+    elif _type == "ndarray":
+        return np.load(osp.join(path, structure["file"]), mmap_mode="c")
+    elif _type == "list":
+        return [_decode(item, path) for item in structure["items"]]
+    elif _type == "tuple":
+        return tuple(_decode(item, path) for item in structure["items"])
+    raise ValueError(f"Unknown type {_type} in the transform cache.")
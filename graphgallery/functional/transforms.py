@@ -4,6 +4,9 @@ __all__ = ['Transform', 'NullTransform']
 
 
 class Transform:
+    # whether the outputs are a deterministic function of the inputs and
+    # `extra_repr`, and expensive enough to be stored in the transform cache
+    cacheable = False
 
     def __init__(self):
         super().__init__()
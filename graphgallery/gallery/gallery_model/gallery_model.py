@@ -23,6 +23,7 @@ from graphgallery.data import BaseGraph
 from graphgallery.utils.raise_error import raise_if_kwargs
 from graphgallery.utils import trainer
 from graphgallery.gallery import GraphModel
+from graphgallery.sequence import PrefetchSequence
 
 # Ignora warnings:
 #     UserWarning: Converting sparse IndexedSlices to a dense Tensor of unknown shape. This may consume a large amount of memory.
@@ -141,6 +142,8 @@ class GalleryModel(GraphModel):
               monitor='val_accuracy',
               early_stop_metric='val_loss',
               callbacks=None,
+              workers=0,
+              max_queue_size=10,
               **kwargs):
         """Train the model for the input `train_data` of nodes or `sequence`.
 
@@ -185,6 +188,13 @@ class GalleryModel(GraphModel):
             One of (val_loss, val_acc, loss, acc), it determines which metric will be
             used for early stopping. (default :obj: `val_loss`)
         callbacks: tensorflow.keras.callbacks. (default :obj: `None`)
+        workers: Non-negative integer
+            The number of background threads used to build the batches
+            ahead of the model step, see `graphgallery.sequence.PrefetchSequence`.
+            (default :obj: `0`, i.e., build the batches synchronously)
+        max_queue_size: Positive integer
+            The maximum number of batches built ahead when `workers > 0`.
+            (default :obj: `10`)
         kwargs: other keyword Parameters.
 
         Return:
@@ -218,6 +228,10 @@ class GalleryModel(GraphModel):
         if not isinstance(train_data, Sequence):
             train_data = self.train_sequence(train_data)
 
+        if workers:
+            train_data = PrefetchSequence(train_data, workers=workers,
+                                          max_queue_size=max_queue_size)
+
         self.train_data = train_data
 
         validation = val_data is not None
@@ -225,6 +239,9 @@ class GalleryModel(GraphModel):
         if validation:
             if not isinstance(val_data, Sequence):
                 val_data = self.test_sequence(val_data)
+            if workers:
+                val_data = PrefetchSequence(val_data, workers=workers,
+                                            max_queue_size=max_queue_size)
             self.val_data = val_data
             metrics_names = metrics_names + ["val_" + metric for metric in metrics_names]
 
@@ -318,7 +335,7 @@ class GalleryModel(GraphModel):
 
         return history
 
-    def test(self, data, verbose=1):
+    def test(self, data, verbose=1, workers=0, max_queue_size=10):
         """Test the output accuracy for the data.
 
         Note:
@@ -330,7 +347,12 @@ class GalleryModel(GraphModel):
         ----------
         data: Numpy array-like, `list` or `graphgallery.Sequence`
             The index of nodes (or sequence) that will be tested.
-
+        workers: Non-negative integer
+            The number of background threads used to build the batches.
+            (default :obj: `0`, i.e., build the batches synchronously)
+        max_queue_size: Positive integer
+            The maximum number of batches built ahead when `workers > 0`.
+            (default :obj: `10`)
 
         Return:
         ----------
@@ -350,6 +372,10 @@ class GalleryModel(GraphModel):
         else:
             test_data = self.test_sequence(data)
 
+        if workers:
+            test_data = PrefetchSequence(test_data, workers=workers,
+                                         max_queue_size=max_queue_size)
+
         self.test_data = test_data
 
         if verbose:
@@ -422,7 +448,8 @@ class GalleryModel(GraphModel):
         """
         return self.test_step_fn(self.model, sequence)
 
-    def predict(self, predict_data=None, return_prob=True):
+    def predict(self, predict_data=None, return_prob=True,
+                batch_size=None, out=None):
         """
         Predict the output probability for the input data.
 
@@ -440,13 +467,105 @@ class GalleryModel(GraphModel):
         return_prob: bool.
             whether to return the probability of prediction.
 
+        batch_size: integer, optional.
+            if specified, the outputs are computed and written chunk by chunk
+            (see `predict_iter`), which avoids the temporaries of
+            the softmax on the full output matrix.
+
+        out: Numpy 2D array or string, optional.
+            the array to write the outputs into, or a file path to
+            write them into a `.npy` memmap, so that large outputs
+            do not reside in memory. It requires the indices of nodes
+            as `predict_data` rather than a sequence.
+
         Return:
         ----------
         The predicted probability of each class for each node,
             shape (num_nodes, num_node_classes).
 
         """
+        if not self.model:
+            raise RuntimeError(
+                'You must compile your model before training/testing/predicting. Use `model.build()`.'
+            )
+
+        if predict_data is None:
+            predict_data = np.arange(self.graph.num_nodes, dtype=gg.intx())
+
+        if batch_size is None and out is None:
+            if not isinstance(predict_data, Sequence):
+                predict_data = self.predict_sequence(predict_data)
+
+            self.predict_data = predict_data
+
+            logit = self.predict_step(predict_data)
+            if return_prob:
+                logit = softmax(logit)
+            return logit
+
+        if isinstance(out, str):
+            if isinstance(predict_data, Sequence):
+                raise ValueError(
+                    "Writing outputs to a memmap requires the indices of nodes as `predict_data`."
+                )
+            num_outputs = len(predict_data)
+        else:
+            num_outputs = None
+
+        chunks = []
+        offset = 0
+        for chunk in self.predict_iter(predict_data, batch_size=batch_size,
+                                       return_prob=return_prob):
+            if out is None:
+                chunks.append(chunk)
+                continue
+            if isinstance(out, str):
+                out = np.lib.format.open_memmap(out, mode='w+', dtype=chunk.dtype,
+                                                shape=(num_outputs, chunk.shape[1]))
+            out[offset:offset + chunk.shape[0]] = chunk
+            offset += chunk.shape[0]
+
+        if out is None:
+            if not chunks:
+                # nothing to predict
+                return np.zeros((0, self.graph.num_node_classes), dtype=self.floatx)
+            return np.vstack(chunks) if len(chunks) > 1 else chunks[0]
+
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+    def predict_iter(self, predict_data=None, batch_size=None, return_prob=True):
+        """
+        Predict the output probability for the input data chunk by chunk,
+        in the order of `predict_data`.
+
+        Note:
+        ----------
+        For full-batch (propagation-based) models, the full-graph forward
+        runs only once and its outputs are sliced into chunks.
+        For mini-batch models, each batch of the prediction sequence
+        is forwarded when its chunks are requested.
+
+        Parameters:
+        ----------
+        predict_data: Numpy 1D array or `Sequence`, optional.
+            The indices of nodes to predict.
+            if None, predict the all nodes.
 
+        batch_size: integer, optional.
+            The maximum number of nodes in each chunk.
+            if None, each chunk is the output of a batch of the sequence.
+
+        return_prob: bool.
+            whether to return the probability of prediction.
+
+        Yield:
+        ----------
+        The predicted probability of each class for a chunk of nodes,
+            shape (chunk_size, num_node_classes).
+
+        """
         if not self.model:
             raise RuntimeError(
                 'You must compile your model before training/testing/predicting. Use `model.build()`.'
@@ -460,10 +579,19 @@ class GalleryModel(GraphModel):
 
         self.predict_data = predict_data
 
-        logit = self.predict_step(predict_data)
-        if return_prob:
-            logit = softmax(logit)
-        return logit
+        if len(predict_data) == 1:
+            # reuse one full-graph forward for all chunks
+            batches = iter([self.predict_step(predict_data)])
+        else:
+            batches = (self.predict_step([batch]) for batch in predict_data)
+
+        for logit in batches:
+            step = batch_size or logit.shape[0]
+            for start in range(0, logit.shape[0], step):
+                chunk = logit[start:start + step]
+                if return_prob:
+                    chunk = softmax(chunk)
+                yield chunk
 
     def predict_step(self, sequence):
         return self.predict_step_fn(self.model, sequence)
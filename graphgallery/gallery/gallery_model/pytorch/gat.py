@@ -81,7 +81,17 @@ class GAT(GalleryModel):
               dropout=0.6,
               weight_decay=5e-4,
               lr=0.01,
-              use_bias=True):
+              use_bias=True,
+              sparse=True):
+        """
+        Parameters:
+        ----------
+        sparse: bool. optional
+            Whether to compute the attention on the edges only
+            (`SparseGraphAttention`), otherwise on the dense
+            adjacency matrix (`GraphAttention`), which costs
+            O(N^2) memory. (default :obj: `True`)
+        """
 
         self.model = pyGAT(self.graph.num_node_attrs,
                            self.graph.num_node_classes,
@@ -91,7 +101,8 @@ class GAT(GalleryModel):
                            dropout=dropout,
                            weight_decay=weight_decay,
                            lr=lr,
-                           use_bias=use_bias).to(self.device)
+                           use_bias=use_bias,
+                           sparse=sparse).to(self.device)
 
     def train_sequence(self, index):
 
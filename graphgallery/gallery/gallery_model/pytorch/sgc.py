@@ -1,4 +1,3 @@
-from graphgallery.nn.layers.pytorch import SGConvolution
 from graphgallery.nn.models.pytorch import SGC as pySGC
 from graphgallery.gallery import GalleryModel
 from graphgallery.sequence import FullBatchNodeSequence
@@ -75,13 +74,8 @@ class SGC(GalleryModel):
         adj_matrix = self.adj_transform(graph.adj_matrix)
         node_attr = self.attr_transform(graph.node_attr)
 
-        feature_inputs, structure_inputs = gf.astensors(node_attr,
-                                                        adj_matrix,
-                                                        device=self.device)
-
-        feature_inputs = SGConvolution(order=self.order)(
-            [feature_inputs, structure_inputs])
-        self.feature_inputs, self.structure_inputs = feature_inputs, structure_inputs
+        self.feature_inputs = gf.propagate_attr(adj_matrix, node_attr, order=self.order)
+        self.structure_inputs = adj_matrix
 
     # use decorator to make sure all list arguments have the same length
     @gf.equal()
@@ -103,7 +97,6 @@ class SGC(GalleryModel):
                            use_bias=use_bias).to(self.device)
 
     def train_sequence(self, index):
-        index = gf.astensor(index)
         labels = self.graph.node_label[index]
 
         feature_inputs = self.feature_inputs[index]
@@ -1,4 +1,5 @@
 import tensorflow as tf
+import scipy.sparse as sp
 
 from graphgallery.gallery import GalleryModel
 from graphgallery.sequence import FullBatchNodeSequence
@@ -44,7 +45,9 @@ class ChebyNet(GalleryModel):
             A sparse, attributed, labeled graph.
         adj_transform: string, `transform`, or None. optional
             How to transform the adjacency matrix. See `graphgallery.functional`
-            (default: :obj:`'cheby_basis'`) 
+            (default: :obj:`'cheby_basis'`). Use `'cheby_operator'` to keep the
+            scaled Laplacian only, and apply the Chebyshev polynomials to the
+            hidden features at run time, so that the memory is O(nnz) at any order.
         attr_transform: string, `transform`, or None. optional
             How to transform the node attribute matrix. See `graphgallery.functional`
             (default :obj: `None`)
@@ -71,6 +74,11 @@ class ChebyNet(GalleryModel):
         adj_matrix = self.adj_transform(graph.adj_matrix)
         node_attr = self.attr_transform(graph.node_attr)
 
+        # `ChebyOperator` returns the scaled Laplacian only
+        self.operator = sp.isspmatrix(adj_matrix)
+        if self.operator:
+            adj_matrix = [adj_matrix]
+
         self.feature_inputs, self.structure_inputs = gf.astensors(
             node_attr, adj_matrix, device=self.device)
 
@@ -94,7 +102,8 @@ class ChebyNet(GalleryModel):
                                         weight_decay=weight_decay,
                                         order=self.adj_transform.order,
                                         lr=lr,
-                                        use_bias=use_bias)
+                                        use_bias=use_bias,
+                                        operator=self.operator)
         else:
             raise NotImplementedError
 
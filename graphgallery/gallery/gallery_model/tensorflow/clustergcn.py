@@ -1,8 +1,12 @@
 import numpy as np
 import tensorflow as tf
 
+from concurrent.futures import ThreadPoolExecutor
+
+import graphgallery as gg
 from graphgallery.gallery import GalleryModel
-from graphgallery.sequence import MiniBatchSequence
+from graphgallery.nn.functions import softmax
+from graphgallery.sequence import Sequence, MiniBatchSequence, ClusterMiniBatchSequence
 
 from graphgallery.nn.models.tensorflow import GCN as tfGCN
 from graphgallery import functional as gf
@@ -25,6 +29,8 @@ class ClusterGCN(GalleryModel):
     def __init__(self,
                  *graph,
                  n_clusters=None,
+                 partition="auto",
+                 n_clusters_per_batch=1,
                  adj_transform="normalize_adj",
                  attr_transform=None,
                  device='cpu:0',
@@ -53,6 +59,16 @@ class ClusterGCN(GalleryModel):
             The number of clusters that the graph being seperated, 
             if not specified (`None`), it will be set to the number 
             of classes automatically. (default :obj: `None`).            
+        partition: string. optional
+            The method to partition the graph, one of `'metis'`, `'bfs'`
+            (the built-in locality-preserving partitioner), `'random'`
+            and `'auto'` (`'metis'` if installed, otherwise `'bfs'`).
+            See `graphgallery.functional.graph_partition`.
+            (default :obj: `'auto'`).
+        n_clusters_per_batch: integer. optional
+            The number of random clusters merged into each training batch,
+            including the edges between them (the stochastic multiple
+            partitions of ClusterGCN). (default :obj: `1`).
         adj_transform: string, `transform`, or None. optional
             How to transform the adjacency matrix. See `graphgallery.functional`
             (default: :obj:`'normalize_adj'` with normalize rate `-0.5`.
@@ -77,6 +93,8 @@ class ClusterGCN(GalleryModel):
             n_clusters = self.graph.num_node_classes
 
         self.n_clusters = n_clusters
+        self.partition = partition
+        self.n_clusters_per_batch = n_clusters_per_batch
         self.adj_transform = gf.get(adj_transform)
         self.attr_transform = gf.get(attr_transform)
         self.process()
@@ -86,7 +104,14 @@ class ClusterGCN(GalleryModel):
         node_attr = self.attr_transform(graph.node_attr)
 
         batch_adj, batch_x, self.cluster_member = gf.graph_partition(
-            graph.adj_matrix, node_attr, n_clusters=self.n_clusters)
+            graph.adj_matrix, node_attr, n_clusters=self.n_clusters,
+            partition=self.partition)
+        self.node_cluster, self.node_local = gf.cluster_mapping(self.cluster_member)
+
+        if self.n_clusters_per_batch > 1:
+            self.cluster_blocks = gf.ClusterBlocks(graph.adj_matrix,
+                                                   self.cluster_member)
+            self.node_attr = node_attr
 
         batch_adj = self.adj_transform(*batch_adj)
 
@@ -117,6 +142,14 @@ class ClusterGCN(GalleryModel):
 
     def train_sequence(self, index):
 
+        if self.n_clusters_per_batch > 1:
+            return ClusterMiniBatchSequence(
+                [self.cluster_blocks, self.node_attr, index],
+                self.graph.node_label,
+                n_clusters_per_batch=self.n_clusters_per_batch,
+                adj_transform=self.adj_transform,
+                device=self.device)
+
         mask = gf.indices2mask(index, self.graph.num_nodes)
         labels = self.graph.node_label
 
@@ -140,34 +173,144 @@ class ClusterGCN(GalleryModel):
                                      device=self.device)
         return sequence
 
-    def predict(self, index):
-
-        mask = gf.indices2mask(index, self.graph.num_nodes)
-
-        orders_dict = {idx: order for order, idx in enumerate(index)}
-        batch_idx, orders = [], []
-        batch_x, batch_adj = [], []
-        for cluster in range(self.n_clusters):
-            nodes = self.cluster_member[cluster]
-            mini_mask = mask[nodes]
-            batch_nodes = np.asarray(nodes)[mini_mask]
-            if batch_nodes.size == 0:
-                continue
-            batch_x.append(self.batch_x[cluster])
-            batch_adj.append(self.batch_adj[cluster])
-            batch_idx.append(np.where(mini_mask)[0])
-            orders.append([orders_dict[n] for n in batch_nodes])
+    def predict(self, predict_data=None, return_prob=False, batch_size=None,
+                out=None, *, workers=1):
+        """
+        Predict the output logit of `predict_data` cluster by cluster,
+        where each cluster is forwarded once and its outputs are written
+        into the positions of its nodes in `out`.
 
-        batch_data = tuple(zip(batch_x, batch_adj, batch_idx))
+        Parameters:
+        ----------
+        predict_data: Numpy 1D array, optional.
+            The indices of nodes to predict.
+            if None, predict the all nodes.
+        return_prob: bool, optional.
+            whether to return the probability of prediction
+            rather than the logit. (default :obj: `False`)
+        batch_size: integer, optional.
+            unused, since the outputs are always computed cluster by cluster,
+            it is kept for the signature of `GalleryModel.predict`.
+        out: Numpy 2D array or string, optional.
+            the array to write the outputs into, or a file path to
+            write them into a `.npy` memmap, so that large outputs
+            do not reside in memory.
+        workers: integer, optional.
+            The number of threads predicting cluster batches concurrently.
+            (default :obj: `1`)
+        """
+        index = self._predict_index(predict_data)
+        shape = (index.size, self.graph.num_node_classes)
+        if out is None:
+            out = np.zeros(shape, dtype=self.floatx)
+        elif isinstance(out, str):
+            out = np.lib.format.open_memmap(out, mode='w+', dtype=self.floatx,
+                                            shape=shape)
+
+        def predict_cluster(cluster, position):
+            logit = self._forward_cluster(cluster, index[position])
+            out[position] = softmax(logit) if return_prob else logit
+
+        clusters, positions = self._cluster_positions(index)
+        self._map(predict_cluster, clusters, positions, workers)
+
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+    def predict_iter(self, predict_data=None, batch_size=None, return_prob=True,
+                     *, workers=1):
+        """
+        Predict the output probability of `predict_data` cluster by cluster,
+        and yield them chunk by chunk of `batch_size` nodes, in the order
+        of `predict_data`.
 
-        logit = np.zeros((index.size, self.graph.num_node_classes),
-                         dtype=self.floatx)
-        batch_data = gf.astensors(batch_data, device=self.device)
+        Each cluster is forwarded once, when a chunk first requests it,
+        and its outputs are kept until its last node is yielded,
+        so that the memory is bounded by the chunk size only if
+        the nodes of each cluster are close in `predict_data`,
+        e.g., sorted by `self.node_cluster`.
 
-        model = self.model
+        Parameters:
+        ----------
+        predict_data: Numpy 1D array, optional.
+            The indices of nodes to predict.
+            if None, predict the all nodes.
+        batch_size: integer, optional.
+            The maximum number of nodes in each chunk.
+            if None, all nodes are in one chunk.
+        return_prob: bool.
+            whether to return the probability of prediction.
+        workers: integer, optional.
+            The number of threads predicting cluster batches concurrently.
+            (default :obj: `1`)
+        """
+        index = self._predict_index(predict_data)
+        if not batch_size or batch_size >= index.size:
+            yield self.predict(index, return_prob=return_prob, workers=workers)
+            return
+
+        clusters, positions = self._cluster_positions(index)
+        # the outputs of each cluster, in the order of its positions
+        cache = {}
+
+        def predict_cluster(cluster, position):
+            logit = self._forward_cluster(cluster, index[position])
+            cache[cluster] = softmax(logit) if return_prob else logit
+
+        node_cluster = self.node_cluster[index]
+        positions = dict(zip(clusters, positions))
+        for start in range(0, index.size, batch_size):
+            chunk_cluster = node_cluster[start:start + batch_size]
+            chunk_clusters = np.unique(chunk_cluster)
+            missing = [cluster for cluster in chunk_clusters if cluster not in cache]
+            self._map(predict_cluster, missing,
+                      [positions[cluster] for cluster in missing], workers)
+
+            chunk = np.empty((chunk_cluster.size, self.graph.num_node_classes),
+                             dtype=self.floatx)
+            for cluster in chunk_clusters:
+                mask = chunk_cluster == cluster
+                position = positions[cluster]
+                chunk[mask] = cache[cluster][np.searchsorted(position, start + np.nonzero(mask)[0])]
+                if position[-1] < start + batch_size:
+                    # all nodes of the cluster are yielded
+                    del cache[cluster]
+            yield chunk
+
+    def _predict_index(self, index):
+        if not self.model:
+            raise RuntimeError(
+                'You must compile your model before training/testing/predicting. Use `model.build()`.'
+            )
+        if index is None:
+            return np.arange(self.graph.num_nodes, dtype=gg.intx())
+        if isinstance(index, Sequence):
+            raise ValueError(
+                "ClusterGCN predicts the indices of nodes cluster by cluster, rather than a `Sequence`."
+            )
+        return np.asarray(index)
+
+    def _cluster_positions(self, index):
+        """Group the positions of `index` by cluster,
+        return the clusters and the (sorted) positions of each cluster."""
+        node_cluster = self.node_cluster[index]
+        order = np.argsort(node_cluster, kind="stable")
+        clusters, starts = np.unique(node_cluster[order], return_index=True)
+        return clusters, np.split(order, starts[1:])
+
+    @staticmethod
+    def _map(fn, clusters, positions, workers=1):
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(fn, clusters, positions))
+        else:
+            for cluster, position in zip(clusters, positions):
+                fn(cluster, position)
+
+    def _forward_cluster(self, cluster, nodes):
+        """Return the output logit of `nodes` in `cluster`."""
+        batch_idx = gf.astensor(self.node_local[nodes], device=self.device)
+        inputs = (self.batch_x[cluster], self.batch_adj[cluster], batch_idx)
         with tf.device(self.device):
-            for order, inputs in zip(orders, batch_data):
-                output = model.predict_on_batch(inputs)
-                logit[order] = output
-
-        return logit
+            return np.asarray(self.model.predict_on_batch(inputs))
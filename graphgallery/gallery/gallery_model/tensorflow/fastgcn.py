@@ -1,3 +1,4 @@
+import numpy as np
 import tensorflow as tf
 
 from graphgallery.gallery import GalleryModel
@@ -81,10 +82,10 @@ class FastGCN(GalleryModel):
         adj_matrix = self.adj_transform(graph.adj_matrix)
         node_attr = self.attr_transform(graph.node_attr)
 
-        node_attr = adj_matrix @ node_attr
-
-        self.feature_inputs, self.structure_inputs = gf.astensor(
-            node_attr, device=self.device), adj_matrix
+        self.feature_inputs = gf.propagate_attr(adj_matrix, node_attr)
+        self.structure_inputs = adj_matrix
+        # the normalized adjacency matrix of training nodes
+        self.train_adj_cache = None
 
     # use decorator to make sure all list arguments have the same length
     @gf.equal()
@@ -112,10 +113,13 @@ class FastGCN(GalleryModel):
     def train_sequence(self, index):
 
         labels = self.graph.node_label[index]
-        adj_matrix = self.graph.adj_matrix[index][:, index]
-        adj_matrix = self.adj_transform(adj_matrix)
+        if self.train_adj_cache is None or not np.array_equal(self.train_adj_cache[0], index):
+            adj_matrix = self.graph.adj_matrix[index][:, index]
+            adj_matrix = self.adj_transform(adj_matrix)
+            self.train_adj_cache = (np.array(index), adj_matrix)
+        adj_matrix = self.train_adj_cache[1]
 
-        feature_inputs = tf.gather(self.feature_inputs, index)
+        feature_inputs = self.feature_inputs[index]
         sequence = FastGCNBatchSequence([feature_inputs, adj_matrix],
                                         labels,
                                         batch_size=self.batch_size,
@@ -50,7 +50,9 @@ class GraphSAGE(GalleryModel):
             `5` sencond-order neighbors, and the radius for `GraphSAGE` is `2`)
         adj_transform: string, `transform`, or None. optional
             How to transform the adjacency matrix. See `graphgallery.functional`
-            (default: :obj:`'neighbor_sampler'`) 
+            (default: :obj:`'neighbor_sampler'`, i.e., sample a fixed neighbor table
+            in advance. If `None`, neighbors are freshly sampled from the sparse
+            adjacency matrix for the nodes of each batch.)
         attr_transform: string, `transform`, or None. optional
             How to transform the node attribute matrix. See `graphgallery.functional`
             (default :obj: `None`)
@@ -76,7 +78,8 @@ class GraphSAGE(GalleryModel):
 
     def process_step(self):
         graph = self.graph
-        # Dense matrix, shape [num_nodes, max_degree]
+        # Dense matrix, shape [num_nodes + 1, max_degree]
+        # or sparse matrix, shape [num_nodes, num_nodes]
         adj_matrix = self.adj_transform(graph.adj_matrix)
         node_attr = self.attr_transform(graph.node_attr)
 
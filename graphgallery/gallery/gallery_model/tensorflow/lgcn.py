@@ -69,7 +69,7 @@ class LGCN(GalleryModel):
 
     def process_step(self):
         graph = self.graph
-        adj_matrix = self.adj_transform(graph.adj_matrix).toarray()
+        adj_matrix = self.adj_transform(graph.adj_matrix).tocsr()
         node_attr = self.attr_transform(graph.node_attr)
 
         self.feature_inputs, self.structure_inputs = node_attr, adj_matrix
@@ -124,9 +124,10 @@ def get_indice_graph(adj_matrix, indices, size=np.inf, dropout=0.):
     if dropout > 0.:
         indices = np.random.choice(indices, int(indices.size * (1 - dropout)),
                                    False)
-    neighbors = adj_matrix[indices].sum(axis=0).nonzero()[0]
+    # the neighbors of `indices` in the sparse `adj_matrix`
+    neighbors = np.unique(adj_matrix[indices].indices)
     if neighbors.size > size - indices.size:
-        neighbors = np.random.choice(list(neighbors), size - len(indices),
+        neighbors = np.random.choice(neighbors, size - len(indices),
                                      False)
     indices = np.union1d(indices, neighbors)
     return indices
@@ -1,6 +1,5 @@
 import tensorflow as tf
 
-from graphgallery.nn.layers.tensorflow import SGConvolution
 from graphgallery.nn.models.tensorflow import SGC as tfSGC
 
 from graphgallery.gallery import GalleryModel
@@ -78,23 +77,8 @@ class SGC(GalleryModel):
         adj_matrix = self.adj_transform(graph.adj_matrix)
         node_attr = self.attr_transform(graph.node_attr)
 
-        feature_inputs, structure_inputs = gf.astensors(node_attr,
-                                                        adj_matrix,
-                                                        device=self.device)
-
-        # To avoid this tensorflow error in large dataset:
-        # InvalidArgumentError: Cannot use GPU when output.shape[1] * nnz(a) > 2^31 [Op:SparseTensorDenseMatMul]
-        if self.graph.num_node_attrs * adj_matrix.nnz > 2**31:
-            device = "CPU"
-        else:
-            device = self.device
-
-        with tf.device(device):
-            feature_inputs = SGConvolution(order=self.order)(
-                [feature_inputs, structure_inputs])
-
-        with tf.device(self.device):
-            self.feature_inputs, self.structure_inputs = feature_inputs, structure_inputs
+        self.feature_inputs = gf.propagate_attr(adj_matrix, node_attr, order=self.order)
+        self.structure_inputs = adj_matrix
 
     # use decorator to make sure all list arguments have the same length
     @gf.equal()
@@ -117,10 +101,9 @@ class SGC(GalleryModel):
                                use_bias=use_bias)
 
     def train_sequence(self, index):
-        index = gf.astensor(index)
         labels = self.graph.node_label[index]
 
-        feature_inputs = tf.gather(self.feature_inputs, index)
+        feature_inputs = self.feature_inputs[index]
         sequence = FullBatchNodeSequence(feature_inputs,
                                          labels,
                                          device=self.device)
@@ -1,9 +1,9 @@
 import numpy as np
 
-from numba import njit
 from gensim.models import Word2Vec
 
 from .sklearn_model import SklearnModel
+from graphgallery.utils.walker import WalkCorpus
 
 
 class Deepwalk(SklearnModel):
@@ -58,13 +58,11 @@ class Deepwalk(SklearnModel):
               num_neg_samples=1):
         super().build()
 
-        adj_matrix = self.graph.adj_matrix
-        walks = self.deepwalk_random_walk(adj_matrix.indices,
-                                          adj_matrix.indptr,
-                                          walk_length=walk_length,
-                                          walks_per_node=walks_per_node)
-
-        sentences = [list(map(str, walk)) for walk in walks]
+        # walks are generated in parallel blocks while Word2Vec
+        # iterates over them, instead of materializing all sentences
+        sentences = WalkCorpus(self.graph.adj_matrix,
+                               walk_length=walk_length,
+                               walks_per_node=walks_per_node)
 
         model = Word2Vec(sentences,
                          size=embedding_dim,
@@ -79,29 +77,6 @@ class Deepwalk(SklearnModel):
 
         self.model = model
 
-    @staticmethod
-    @njit
-    def deepwalk_random_walk(indices,
-                             indptr,
-                             walk_length=80,
-                             walks_per_node=10):
-
-        N = len(indptr) - 1
-
-        for _ in range(walks_per_node):
-            for n in range(N):
-                single_walk = [n]
-                current_node = n
-                for _ in range(walk_length - 1):
-                    neighbors = indices[
-                        indptr[current_node]:indptr[current_node + 1]]
-                    if neighbors.size == 0:
-                        break
-                    current_node = np.random.choice(neighbors)
-                    single_walk.append(current_node)
-
-                yield single_walk
-
     def get_embeddings(self, norm=True):
         embeddings = self.model.wv.vectors[np.fromiter(
             map(int, self.model.wv.index2word), np.int32).argsort()]
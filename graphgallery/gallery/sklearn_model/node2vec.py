@@ -1,10 +1,9 @@
 import numpy as np
-import networkx as nx
 
 from gensim.models import Word2Vec
 
 from .sklearn_model import SklearnModel
-from graphgallery.utils.walker import RandomWalker, alias_sample
+from graphgallery.utils.walker import WalkCorpus
 
 
 class Node2vec(SklearnModel):
@@ -51,9 +50,6 @@ class Node2vec(SklearnModel):
         """
         super().__init__(*graph, device=device, seed=seed, name=name, **kwargs)
 
-        self.walker = None
-        self.nxgraph = self.graph.nxgraph()
-
     def build(self,
               walk_length=80,
               walks_per_node=10,
@@ -66,16 +62,12 @@ class Node2vec(SklearnModel):
               q=0.5):
         super().build()
 
-        self.walker = RandomWalker(self.nxgraph, p=p, q=q)
-        self.walker.preprocess_transition_probs()
-
-        walks = self.node2vec_random_walk(self.nxgraph,
-                                          self.walker.alias_nodes,
-                                          self.walker.alias_edges,
-                                          walk_length=walk_length,
-                                          walks_per_node=walks_per_node)
-
-        sentences = [list(map(str, walk)) for walk in walks]
+        # walks are generated in parallel blocks while Word2Vec
+        # iterates over them, instead of materializing all sentences
+        sentences = WalkCorpus(self.graph.adj_matrix,
+                               walk_length=walk_length,
+                               walks_per_node=walks_per_node,
+                               p=p, q=q)
 
         model = Word2Vec(sentences,
                          size=embedding_dim,
@@ -90,34 +82,6 @@ class Node2vec(SklearnModel):
 
         self.model = model
 
-    @staticmethod
-    def node2vec_random_walk(G,
-                             alias_nodes,
-                             alias_edges,
-                             walk_length=80,
-                             walks_per_node=10):
-        for _ in range(walks_per_node):
-            for n in G.nodes():
-                single_walk = [n]
-                current_node = n
-                for _ in range(walk_length - 1):
-                    neighbors = list(G.neighbors(current_node))
-                    if len(neighbors) > 0:
-                        if len(single_walk) == 1:
-                            current_node = neighbors[alias_sample(
-                                alias_nodes[current_node][0],
-                                alias_nodes[current_node][1])]
-                        else:
-                            prev = single_walk[-2]
-                            edge = (prev, current_node)
-                            current_node = neighbors[alias_sample(
-                                alias_edges[edge][0], alias_edges[edge][1])]
-                    else:
-                        break
-
-                    single_walk.append(current_node)
-                yield single_walk
-
     def get_embeddings(self, norm=True):
         embeddings = self.model.wv.vectors[np.fromiter(
             map(int, self.model.wv.index2word), np.int32).argsort()]
@@ -88,10 +88,10 @@ class GraphAttention(Module):
 
             zero_vec = -9e15 * torch.ones_like(e)
             attention = torch.where(dense_adj > 0, e, zero_vec)
-            attention = gf.softmax(attention, dim=1)
-            attention = gf.dropout(attention,
-                                   self.dropout,
-                                   training=self.training)
+            attention = F.softmax(attention, dim=1)
+            attention = F.dropout(attention,
+                                  self.dropout,
+                                  training=self.training)
             h_prime = torch.matmul(attention, Wh)
 
             if self.use_bias:
@@ -115,37 +115,15 @@ class GraphAttention(Module):
 #########################Sparse Version of `GraphAttention` layer###################
 
 
-class SpecialSpmmFunction(torch.autograd.Function):
-    """Special function for only sparse region backpropataion layer."""
-    @staticmethod
-    def forward(ctx, indices, values, shape, b):
-        assert indices.requires_grad == False
-        a = torch.sparse.FloatTensor(indices, values, shape)
-        ctx.save_for_backward(a, b)
-        ctx.N = shape[0]
-        return torch.spmm(a, b)
-
-    @staticmethod
-    def backward(ctx, grad_output):
-        a, b = ctx.saved_tensors
-        grad_values = grad_b = None
-        if ctx.needs_input_grad[1]:
-            grad_a_dense = grad_output.matmul(b.t())
-            edge_idx = a._indices()[0, :] * ctx.N + a._indices()[1, :]
-            grad_values = grad_a_dense.view(-1)[edge_idx]
-        if ctx.needs_input_grad[3]:
-            grad_b = a.t().matmul(grad_output)
-        return None, grad_values, None, grad_b
-
-
-class SpecialSpmm(Module):
-    def forward(self, indices, values, shape, b):
-        return SpecialSpmmFunction.apply(indices, values, shape, b)
-
-
 class SparseGraphAttention(Module):
     """
     Sparse version GAT layer, similar to https://arxiv.org/abs/1710.10903
+
+    The attention scores are computed on the edges of `adj` only,
+    normalized with a softmax over the neighbors of each node,
+    and the neighbors are aggregated by scattering the weighted messages,
+    where all heads are computed at once. It costs O(E * heads) rather
+    than O(N^2 * heads) of `GraphAttention`.
     """
 
     def __init__(self,
@@ -166,75 +144,62 @@ class SparseGraphAttention(Module):
         self.out_channels = out_channels
         self.activation = get_activation(activation)
 
-        self.dropout = Dropout(dropout)
+        self.dropout = dropout
         self.attn_heads = attn_heads
         self.reduction = reduction
-
-        self.kernels = ParameterList()
-        self.att_kernels = ParameterList()
-        self.biases = ParameterList()
         self.use_bias = use_bias
 
-        if not use_bias:
-            self.register_parameter('bias', None)
+        # the kernels of all heads are stacked
+        self.kernel = Parameter(torch.Tensor(in_channels, attn_heads * out_channels))
+        self.attn_kernel_self = Parameter(torch.Tensor(attn_heads, out_channels))
+        self.attn_kernel_neighs = Parameter(torch.Tensor(attn_heads, out_channels))
 
-        # Initialize weights for each attention head
-        for head in range(self.attn_heads):
-            W = Parameter(torch.Tensor(in_channels, out_channels))
-            self.kernels.append(W)
-            a = Parameter(torch.Tensor(1, 2 * out_channels))
-            self.att_kernels.append(a)
-
-            if use_bias:
-                bias = Parameter(torch.Tensor(out_channels))
-                self.biases.append(bias)
+        if use_bias:
+            self.bias = Parameter(torch.Tensor(attn_heads, out_channels))
+        else:
+            self.register_parameter('bias', None)
 
         self.leakyrelu = LeakyReLU(alpha)
-        self.special_spmm = SpecialSpmm()
         self.reset_parameters()
 
     def reset_parameters(self):
-        for head in range(self.attn_heads):
-            glorot_uniform(self.kernels[head])
-            glorot_uniform(self.att_kernels[head])
+        glorot_uniform(self.kernel)
+        glorot_uniform(self.attn_kernel_self)
+        glorot_uniform(self.attn_kernel_neighs)
 
-            if self.use_bias:
-                zeros(self.biases[head])
+        if self.use_bias:
+            zeros(self.bias)
 
     def forward(self, inputs):
         x, adj = inputs
-
-        dv = x.device
-        N = x.size()[0]
-        edge = adj._indices()
-
-        outputs = []
-        for head in range(self.attn_heads):
-            W, a = self.kernels[head], self.att_kernels[head]
-            h = x @ W
-
-            # Self-attention on the nodes - Shared attention mechanism
-            edge_h = torch.cat((h[edge[0, :], :], h[edge[1, :], :]), dim=1).t()
-            # edge: 2*D x E
-
-            edge_e = torch.exp(-self.leakyrelu(a.mm(edge_h).squeeze()))
-
-            e_rowsum = self.special_spmm(edge, edge_e, torch.Size([N, N]),
-                                         torch.ones(size=(N, 1), device=dv))
-            edge_e = self.dropout(edge_e)
-            h_prime = self.special_spmm(edge, edge_e, torch.Size([N, N]), h)
-            h_prime = h_prime.div(e_rowsum)
-            #             h_prime[torch.isnan(h_prime)] = 0.
-
-            if self.use_bias:
-                h_prime += self.biases[head]
-
-            outputs.append(h_prime)
+        N = x.size(0)
+        adj = adj.coalesce()
+        row, col = adj.indices()
+
+        Wh = torch.mm(x, self.kernel).view(N, self.attn_heads, self.out_channels)
+        f_1 = (Wh * self.attn_kernel_self).sum(-1)  # (N, heads)
+        f_2 = (Wh * self.attn_kernel_neighs).sum(-1)  # (N, heads)
+        e = self.leakyrelu(f_1[row] + f_2[col])  # (E, heads)
+
+        # softmax over the neighbors of each node, i.e., over the
+        # entries of each row, which is shifted by the row max
+        attention = torch.sparse_coo_tensor(torch.stack([row, col]), e,
+                                            (N, N, self.attn_heads))
+        attention = torch.sparse.softmax(attention, dim=1).coalesce()
+        row, col = attention.indices()
+        attention = F.dropout(attention.values(),
+                              self.dropout,
+                              training=self.training)
+
+        h_prime = torch.zeros_like(Wh).index_add_(0, row, attention.unsqueeze(-1) * Wh[col])
+
+        if self.use_bias:
+            h_prime += self.bias
 
         if self.reduction == 'concat':
-            output = torch.cat(outputs, dim=1)
+            output = h_prime.reshape(N, -1)
         else:
-            output = torch.mean(torch.stack(outputs), 0)
+            output = h_prime.mean(1)
 
         return self.activation(output)
 
@@ -42,6 +42,10 @@ class ChebyConvolution(Layer):
           tuple/list with `order + 2` 2-D tensor: Tensor `x` and `order + 1` SparseTensor `adj`: 
           `[(num_nodes, num_node_attrs), (num_nodes, num_nodes), (num_nodes, num_nodes), ...]`.
           The former one is the node attribute matrix (Tensor) and the last is adjacency matrix (SparseTensor).
+          Or tuple/list with 2 tensors: Tensor `x` and the scaled Laplacian (SparseTensor)
+          `[(num_nodes, num_node_attrs), (num_nodes, num_nodes)]`, i.e., the operator mode,
+          where the Chebyshev polynomials are applied with the Clenshaw recurrence,
+          i.e., `order` sparse-dense products on the outputs of width `units`.
 
         Output shape:
           2-D tensor with shape: `(num_nodes, units)`.  
@@ -99,6 +103,9 @@ class ChebyConvolution(Layer):
     def call(self, inputs):
 
         x, adjs = inputs
+        if isinstance(adjs, tf.SparseTensor):
+            return self.activation(self.clenshaw(x, adjs))
+
         supports = []
         for adj, kernel, bias in zip(adjs, self.kernel, self.bias):
             support = x @ kernel
@@ -111,6 +118,24 @@ class ChebyConvolution(Layer):
 
         return self.activation(output)
 
+    def clenshaw(self, x, laplacian):
+        """Return `sum_k T_k(laplacian) @ x @ kernel_k + bias_k` without
+        materializing `T_k`, using the Clenshaw recurrence:
+        `b_k = y_k + 2 * laplacian @ b_{k+1} - b_{k+2}`, where `y_k = x @ kernel_k`."""
+        supports = [x @ kernel for kernel in self.kernel]
+        b1, b2 = supports[-1], None
+        for support in reversed(supports[1:-1]):
+            b = support + 2. * tf.sparse.sparse_dense_matmul(laplacian, b1)
+            if b2 is not None:
+                b -= b2
+            b1, b2 = b, b1
+        output = supports[0] + tf.sparse.sparse_dense_matmul(laplacian, b1)
+        if b2 is not None:
+            output -= b2
+        if self.use_bias:
+            output += tf.add_n(self.bias)
+        return output
+
     def get_config(self):
         config = {'units': self.units,
                   'order': self.order,
@@ -1,16 +1,40 @@
+import numpy as np
 from tensorflow.keras import activations, constraints, initializers, regularizers
 from tensorflow.keras.layers import Layer
 
 import tensorflow as tf
-try:
-    import tensorflow_probability as tfp
-except ImportError:
-    tfp = None
 
 
 class MedianConvolution(Layer):
+    """
+        Median aggregation of the neighbors of each node.
+
+        `MedianConvolution` implements the operation:
+        `output = activation(median({x_j @ kernel: j in neighbors(i)}) + bias)`,
+        where the median of an even number of values is the midpoint
+        of the two middle ones, and nodes without neighbors output zeros.
+
+        All nodes are computed at once: they are grouped into buckets
+        by degree (powers of two), and the messages of each bucket are
+        padded to its maximum degree and sorted along the neighbor axis.
+
+        Parameters:
+          units: Positive integer, dimensionality of the output space.
+          n_buckets: Positive integer, the number of degree buckets, nodes with
+            degree larger than `2**(n_buckets-1)` share the last bucket.
+
+        Input shape:
+          tuple/list with two tensors: 2-D Tensor `x` and 2-D RaggedTensor `neighbors`
+          (or a list of 1-D arrays): `[(num_nodes, num_node_attrs), (num_nodes, None)]`.
+          The former one is the node attribute matrix (Tensor) and the other is
+          the neighbors of each node.
+
+        Output shape:
+          2-D tensor with shape: `(num_nodes, units)`.
+    """
 
     def __init__(self, units,
+                 n_buckets=16,
                  use_bias=False,
                  activation=None,
                  kernel_initializer='glorot_uniform',
@@ -24,6 +48,7 @@ class MedianConvolution(Layer):
 
         super().__init__(**kwargs)
         self.units = units
+        self.n_buckets = n_buckets
         self.use_bias = use_bias
 
         self.activation = activations.get(activation)
@@ -52,25 +77,44 @@ class MedianConvolution(Layer):
 
         super().build(input_shapes)
 
-    @tf.function
     def call(self, inputs):
 
         x, neighbors = inputs
+        if not isinstance(neighbors, tf.RaggedTensor):
+            neighbors = tf.RaggedTensor.from_row_lengths(
+                np.concatenate(neighbors), [len(neighbor) for neighbor in neighbors])
         h = x @ self.kernel
 
-        aggregation = tf.TensorArray(tf.float32, size=0, dynamic_size=True, clear_after_read=False)
-        for neighbor in neighbors:
-            msg = tf.gather(h, neighbor)
-            agg = tfp.stats.percentile(msg, q=50., axis=0, interpolation='midpoint')
-            aggregation = aggregation.write(aggregation.size(), agg)
+        degree = neighbors.row_lengths()
+        bucket = tf.math.log(tf.cast(tf.maximum(degree, 1), tf.float32)) / np.log(2.)
+        bucket = tf.minimum(tf.cast(bucket, tf.int32), self.n_buckets - 1)
+        nodes = tf.range(tf.shape(degree)[0])
+        partitions = tf.dynamic_partition(nodes, bucket, self.n_buckets)
+
+        aggregations = []
+        for bucket_nodes in partitions:
+            bucket_neighbors = tf.gather(neighbors, bucket_nodes)
+            bucket_degree = bucket_neighbors.row_lengths()
+            # padded with `inf`, which is sorted behind the neighbors,
+            # to at least one column for buckets of isolated nodes
+            width = tf.maximum(tf.reduce_max(bucket_degree), 1)
+            msg = tf.gather(h, bucket_neighbors).to_tensor(default_value=np.inf,
+                                                           shape=[None, width, self.units])
+            msg = tf.sort(msg, axis=1)  # (n, max_degree, units)
+            lower = tf.gather(msg, tf.maximum(bucket_degree - 1, 0) // 2, batch_dims=1)
+            upper = tf.gather(msg, bucket_degree // 2, batch_dims=1)
+            agg = tf.where(tf.expand_dims(bucket_degree > 0, axis=1),
+                           (lower + upper) / 2., tf.zeros_like(lower))
+            aggregations.append(agg)
 
-        output = aggregation.stack()
+        output = tf.dynamic_stitch(partitions, aggregations)
         if self.use_bias:
             output += self.bias
         return self.activation(output)
 
     def get_config(self):
         config = {'units': self.units,
+                  'n_buckets': self.n_buckets,
                   'use_bias': self.use_bias,
                   'activation': activations.serialize(self.activation),
                   'kernel_initializer': initializers.serialize(
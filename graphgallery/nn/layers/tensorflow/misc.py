@@ -1,6 +1,8 @@
 import tensorflow as tf
 from tensorflow.keras.layers import Layer
 
+from graphgallery import functional as gf
+
 
 class SparseConversion(Layer):
     def __init__(self, num_nodes=None, *args, **kwargs):
@@ -120,13 +122,10 @@ class Laplacian(Layer):
         self.trainable = False
 
     def call(self, adj):
-        if self.fill_weight:
-            adj = adj + self.fill_weight * \
-                tf.eye(tf.shape(adj)[0], dtype=adj.dtype)
-        d = tf.reduce_sum(adj, axis=1)
-        d_power = tf.pow(d, self.rate)
-        d_power_mat = tf.linalg.diag(d_power)
-        return d_power_mat @ adj @ d_power_mat
+        # `adj` is either a dense Tensor or a SparseTensor
+        return gf.normalize_adj_tensor(adj, rate=self.rate,
+                                       fill_weight=self.fill_weight,
+                                       backend="tensorflow")
 
     def get_config(self):
         base_config = super().get_config()
@@ -1,3 +1,4 @@
+import numpy as np
 import tensorflow as tf
 from tensorflow.keras import backend as K
 from tensorflow.keras.layers import Layer
@@ -15,25 +16,32 @@ class Top_k_features(Layer):
 
         Parameters:
           K: Positive Integer, Number of top elements to look for.
+          n_buckets: Positive integer, the number of degree buckets for a SparseTensor `adj`,
+            nodes with degree larger than `2**(n_buckets-1)` share the last bucket.
 
         Input shape:
           tuple/list with two 2-D tensor: Tensor `x` and SparseTensor `adj`: `[(num_nodes, num_node_attrs), (num_nodes, num_nodes)]`.
           The former one is the node attribute matrix (Tensor) and the other is adjacency matrix (SparseTensor).
+          For a SparseTensor `adj`, the nodes are grouped into buckets by degree
+          (powers of two), and only the neighbors of the nodes in each bucket are gathered
+          into a zero-padded tensor of shape `(bucket_size, bucket_max_degree + K, num_node_attrs)`,
+          which is equivalent to the dense computation on `(num_nodes, num_node_attrs, num_nodes)`.
 
         Output shape:
           3-D tensor with shape: `(num_nodes, K+1, num_node_attrs)`.
     """
 
-    def __init__(self, K, **kwargs):
+    def __init__(self, K, n_buckets=16, **kwargs):
 
         super().__init__(**kwargs)
         self.K = K
+        self.n_buckets = n_buckets
 
     def call(self, inputs):
 
         x, adj = inputs
         if K.is_sparse(adj):
-            adj = tf.sparse.to_dense(adj)  # the adjacency matrix will be transformed into dense matrix
+            return self.sparse_call(x, adj)
         adj = tf.expand_dims(adj, axis=1)  # (N, 1, N)
         x = tf.expand_dims(x, axis=-1)  # (N, F, 1)
         h = adj * x  # (N, F, N)
@@ -43,8 +51,36 @@ class Top_k_features(Layer):
         h = tf.transpose(h, perm=(0, 2, 1))
         return h  # (N, K+1, F)
 
+    def sparse_call(self, x, adj):
+        # the neighbors of node `j` are the nonzeros of column `j` in `adj`
+        adj = tf.sparse.reorder(tf.sparse.transpose(adj))
+        rows, neighbors = adj.indices[:, 0], adj.indices[:, 1]
+        num_nodes = tf.shape(x, out_type=tf.int64)[0]
+        h = tf.gather(x, neighbors) * tf.expand_dims(adj.values, axis=1)  # (E, F)
+        h = tf.RaggedTensor.from_value_rowids(h, rows, nrows=num_nodes)  # (N, None, F)
+
+        degree = h.row_lengths()
+        bucket = tf.math.log(tf.cast(tf.maximum(degree, 1), tf.float32)) / np.log(2.)
+        bucket = tf.minimum(tf.cast(bucket, tf.int32), self.n_buckets - 1)
+        nodes = tf.range(tf.shape(degree)[0])
+        partitions = tf.dynamic_partition(nodes, bucket, self.n_buckets)
+
+        outputs = []
+        for bucket_nodes in partitions:
+            bucket_h = tf.gather(h, bucket_nodes)
+            # at least K zeros for each node, as the non-neighbors in the dense computation
+            width = tf.maximum(tf.reduce_max(bucket_h.row_lengths()), 0) + self.K
+            bucket_h = bucket_h.to_tensor(shape=[None, width, None])  # (n, D, F)
+            bucket_h = tf.transpose(bucket_h, perm=(0, 2, 1))  # (n, F, D)
+            outputs.append(tf.math.top_k(bucket_h, k=self.K, sorted=True).values)  # (n, F, K)
+
+        h = tf.dynamic_stitch(partitions, outputs)
+        h = tf.concat([tf.expand_dims(x, axis=-1), h], axis=-1)
+        h = tf.transpose(h, perm=(0, 2, 1))
+        return h  # (N, K+1, F)
+
     def get_config(self):
-        config = {'K': self.K}
+        config = {'K': self.K, 'n_buckets': self.n_buckets}
 
         base_config = super().get_config()
         return {**base_config, **config}
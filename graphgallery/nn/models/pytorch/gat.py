@@ -19,9 +19,11 @@ class GAT(TorchKeras):
                  dropout=0.6,
                  weight_decay=5e-4,
                  lr=0.01,
-                 use_bias=True):
+                 use_bias=True,
+                 sparse=True):
 
         super().__init__()
+        Layer = SparseGraphAttention if sparse else GraphAttention
 
         layers = ModuleList()
         paras = []
@@ -29,23 +31,23 @@ class GAT(TorchKeras):
         inc = in_channels
         pre_head = 1
         for hidden, n_head, activation in zip(hiddens, n_heads, activations):
-            layer = SparseGraphAttention(inc * pre_head,
-                                         hidden,
-                                         activation=activation,
-                                         attn_heads=n_head,
-                                         reduction='concat',
-                                         use_bias=use_bias)
+            layer = Layer(inc * pre_head,
+                          hidden,
+                          activation=activation,
+                          attn_heads=n_head,
+                          reduction='concat',
+                          use_bias=use_bias)
             layers.append(layer)
             paras.append(
                 dict(params=layer.parameters(), weight_decay=weight_decay))
             inc = hidden
             pre_head = n_head
 
-        layer = SparseGraphAttention(inc * pre_head,
-                                     out_channels,
-                                     attn_heads=1,
-                                     reduction='average',
-                                     use_bias=use_bias)
+        layer = Layer(inc * pre_head,
+                      out_channels,
+                      attn_heads=1,
+                      reduction='average',
+                      use_bias=use_bias)
         layers.append(layer)
         # do not use weight_decay in the final layer
         paras.append(dict(params=layer.parameters(), weight_decay=0.))
@@ -16,24 +16,31 @@ class ChebyNet(TFKeras):
                  activations=['relu'],
                  dropout=0.5,
                  weight_decay=5e-4,
-                 lr=0.01, order=2, use_bias=False):
+                 lr=0.01, order=2, use_bias=False, operator=False):
 
         x = Input(batch_shape=[None, in_channels],
                   dtype=floatx(), name='node_attr')
-        adj = [Input(batch_shape=[None, None],
-                     dtype=floatx(), sparse=True,
-                     name=f'adj_matrix_{i}') for i in range(order + 1)]
+        if operator:
+            # the scaled Laplacian only, see `graphgallery.functional.ChebyOperator`
+            adj = [Input(batch_shape=[None, None],
+                         dtype=floatx(), sparse=True,
+                         name='scaled_laplacian')]
+        else:
+            adj = [Input(batch_shape=[None, None],
+                         dtype=floatx(), sparse=True,
+                         name=f'adj_matrix_{i}') for i in range(order + 1)]
         index = Input(batch_shape=[None], dtype=intx(), name='node_index')
+        adj_inputs = adj[0] if operator else adj
 
         h = x
         for hidden, activation in zip(hiddens, activations):
             h = ChebyConvolution(hidden, order=order, use_bias=use_bias,
                                  activation=activation,
-                                 kernel_regularizer=regularizers.l2(weight_decay))([h, adj])
+                                 kernel_regularizer=regularizers.l2(weight_decay))([h, adj_inputs])
             h = Dropout(rate=dropout)(h)
 
         h = ChebyConvolution(out_channels,
-                             order=order, use_bias=use_bias)([h, adj])
+                             order=order, use_bias=use_bias)([h, adj_inputs])
         h = Gather()([h, index])
 
         super().__init__(inputs=[x, *adj, index], outputs=h)
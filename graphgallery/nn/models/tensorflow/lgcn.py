@@ -4,7 +4,7 @@ from tensorflow.keras.optimizers import Nadam
 from tensorflow.keras import regularizers
 from tensorflow.keras.losses import SparseCategoricalCrossentropy
 
-from graphgallery.nn.layers.tensorflow import Top_k_features, LGConvolution, DenseConvolution, Mask
+from graphgallery.nn.layers.tensorflow import Top_k_features, LGConvolution, GraphConvolution, Mask
 from graphgallery import floatx, intx
 from graphgallery.nn.models import TFKeras
 
@@ -20,13 +20,13 @@ class LGCN(TFKeras):
         x = Input(batch_shape=[None, in_channels],
                   dtype=floatx(), name='node_attr')
         adj = Input(batch_shape=[None, None], dtype=floatx(),
-                    sparse=False, name='adj_matrix')
+                    sparse=True, name='adj_matrix')
         mask = Input(batch_shape=[None], dtype='bool', name='node_mask')
 
         h = x
         for idx, hidden in enumerate(hiddens):
             h = Dropout(rate=dropout)(h)
-            h = DenseConvolution(hidden,
+            h = GraphConvolution(hidden,
                                  use_bias=use_bias,
                                  activation=activations[idx],
                                  kernel_regularizer=regularizers.l2(weight_decay))([h, adj])
@@ -43,7 +43,7 @@ class LGCN(TFKeras):
             h = Concatenate()([h, cur_h])
 
         h = Dropout(rate=dropout)(h)
-        h = DenseConvolution(out_channels,
+        h = GraphConvolution(out_channels,
                              use_bias=use_bias,
                              activation=activations[-1],
                              kernel_regularizer=regularizers.l2(weight_decay))([h, adj])
@@ -4,6 +4,7 @@ import tensorflow as tf
 import scipy.sparse as sp
 
 from graphgallery.sequence.base_sequence import Sequence
+from graphgallery import functional as gf
 
 
 class MiniBatchSequence(Sequence):
@@ -42,6 +43,75 @@ class MiniBatchSequence(Sequence):
         random.shuffle(self.indices)
 
 
+class ClusterMiniBatchSequence(Sequence):
+    """Stochastic multiple partitions of ClusterGCN, where each batch
+    merges `n_clusters_per_batch` random clusters into one subgraph,
+    including the edges between them.
+    """
+
+    def __init__(
+        self,
+        x,
+        y,
+        n_clusters_per_batch=2,
+        adj_transform=None,
+        shuffle=True,
+        *args, **kwargs
+    ):
+        """
+        Parameters
+        ----------
+        x: a list of `cluster_blocks`, `node_attr` and `batch_nodes`, where
+            `cluster_blocks` is a `graphgallery.functional.ClusterBlocks`
+            of the partitioned graph, and `batch_nodes` are the nodes to
+            compute outputs for. Clusters without them are skipped.
+        y: the labels of all nodes.
+        n_clusters_per_batch: the number of clusters merged in each batch.
+        adj_transform: the transform applied to each merged adjacency matrix,
+            e.g., `graphgallery.functional.NormalizeAdj`.
+        """
+        super().__init__(*args, **kwargs)
+        self.cluster_blocks, self.node_attr, batch_nodes = x
+        self.y = y
+        self.adj_transform = adj_transform
+        self.mask = gf.indices2mask(batch_nodes, len(self.node_attr))
+        # the clusters containing any of `batch_nodes`
+        blocks = self.cluster_blocks
+        counts = np.r_[0, np.cumsum(self.mask[blocks.order])]
+        self.clusters = np.flatnonzero(counts[blocks.offsets[1:]] - counts[blocks.offsets[:-1]])
+        self.n_batches = int(np.ceil(self.clusters.size / n_clusters_per_batch))
+        self.n_clusters_per_batch = n_clusters_per_batch
+        self.shuffle = shuffle
+        self.indices = np.arange(self.clusters.size)
+        if shuffle:
+            self._shuffle_batches()
+
+    def __len__(self):
+        return self.n_batches
+
+    def __getitem__(self, index):
+        idx = self.indices[index * self.n_clusters_per_batch:
+                           (index + 1) * self.n_clusters_per_batch]
+        # ascending clusters keep the merged indices sorted
+        adj_matrix, nodes = self.cluster_blocks.merge(np.sort(self.clusters[idx]))
+        if self.adj_transform is not None:
+            adj_matrix = self.adj_transform(adj_matrix)
+        mini_mask = self.mask[nodes]
+        batch_idx = np.where(mini_mask)[0]
+        y = self.y[nodes][mini_mask]
+        return self.astensors((self.node_attr[nodes], adj_matrix, batch_idx), y)
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            self._shuffle_batches()
+
+    def _shuffle_batches(self):
+        """
+         Shuffle all clusters at the end of each epoch
+        """
+        np.random.shuffle(self.indices)
+
+
 class SAGEMiniBatchSequence(Sequence):
 
     def __init__(
@@ -51,8 +121,21 @@ class SAGEMiniBatchSequence(Sequence):
         n_samples=[5, 5],
         shuffle=False,
         batch_size=512,
+        replace=False,
         *args, **kwargs
     ):
+        """
+        Parameters
+        ----------
+        x: a list of `node_attr`, `adj_matrix` and `batch_nodes`, where
+            `adj_matrix` is either the dense neighbor table of shape
+            [num_nodes + 1, max_degree] returned by
+            `graphgallery.functional.neighbor_sampler`, or a Scipy
+            sparse matrix, where neighbors are sampled fresh for
+            the nodes of each batch.
+        replace: whether to sample neighbors with replacement,
+            only used when `adj_matrix` is a Scipy sparse matrix.
+        """
         super().__init__(*args, **kwargs)
         self.node_attr, self.adj_matrix, self.batch_nodes = x
         self.y = y
@@ -61,7 +144,10 @@ class SAGEMiniBatchSequence(Sequence):
         self.batch_size = batch_size
         self.indices = np.arange(len(self.batch_nodes))
         self.n_samples = n_samples
+        self.replace = replace
 
+        if sp.isspmatrix(self.adj_matrix):
+            self.adj_matrix = self.adj_matrix.tocsr(copy=False)
         self.node_attr = self.astensor(self.node_attr)
 
     def __len__(self):
@@ -77,7 +163,8 @@ class SAGEMiniBatchSequence(Sequence):
         nodes_input = [self.batch_nodes[idx]]
         for n_sample in self.n_samples:
             neighbors = sample_neighbors(
-                self.adj_matrix, nodes_input[-1], n_sample).ravel()
+                self.adj_matrix, nodes_input[-1], n_sample,
+                replace=self.replace).ravel()
             nodes_input.append(neighbors)
 
         y = self.y[idx] if self.y is not None else None
@@ -95,9 +182,15 @@ class SAGEMiniBatchSequence(Sequence):
         random.shuffle(self.indices)
 
 
-def sample_neighbors(adj_matrix, nodes, n_neighbors):
-    np.random.shuffle(adj_matrix.T)
-    return adj_matrix[nodes, :n_neighbors]
+def sample_neighbors(adj_matrix, nodes, n_neighbors, replace=False):
+    if sp.isspmatrix(adj_matrix):
+        return gf.sample_batch_neighbors(adj_matrix, nodes, n_neighbors,
+                                         replace=replace)
+    # rows of the neighbor table are randomly ordered,
+    # so any `n_neighbors` columns form a random sample
+    columns = np.random.choice(adj_matrix.shape[1], n_neighbors,
+                               replace=n_neighbors > adj_matrix.shape[1])
+    return adj_matrix[np.asarray(nodes)[:, None], columns]
 
 
 class FastGCNBatchSequence(Sequence):
@@ -109,8 +202,21 @@ class FastGCNBatchSequence(Sequence):
         shuffle=False,
         batch_size=None,
         rank=None,
+        replace=False,
         *args, **kwargs
     ):
+        """
+        Parameters
+        ----------
+        x: a list of `node_attr` and `adj_matrix`.
+        rank: the number of nodes sampled for each batch, with the
+            importance distribution proportional to the column norms
+            of `adj_matrix`. If None, no sampling is performed.
+        replace: whether to sample with replacement, i.e., i.i.d. samples
+            over all nodes as in the FastGCN paper, drawn from the precomputed
+            CDF. Otherwise, nodes are sampled without replacement from
+            the neighbors of the batch nodes.
+        """
         super().__init__(*args, **kwargs)
         node_attr, adj_matrix = x
         self.y = y
@@ -120,10 +226,12 @@ class FastGCNBatchSequence(Sequence):
         self.batch_size = batch_size
         self.indices = np.arange(adj_matrix.shape[0])
         self.rank = rank
+        self.replace = replace
         if rank:
             self.p = column_prop(adj_matrix)
+            self.cdf = np.cumsum(self.p)
 
-        self.node_attr, self.adj_matrix = node_attr, adj_matrix
+        self.node_attr, self.adj_matrix = node_attr, adj_matrix.tocsr(copy=False)
 
     def __len__(self):
         return self.n_batches
@@ -135,15 +243,8 @@ class FastGCNBatchSequence(Sequence):
             (node_attr, adj_matrix), y = self.mini_batch(index)
 
         if self.rank:
-            p = self.p
-            rank = self.rank
-            distr = adj_matrix.sum(0).A1.nonzero()[0]
-            if rank > distr.size:
-                q = distr
-            else:
-                q = np.random.choice(
-                    distr, rank, replace=False, p=p[distr] / p[distr].sum())
-            adj_matrix = adj_matrix[:, q].dot(sp.diags(1.0 / (p[q] * rank)))
+            q = self.sample(adj_matrix)
+            adj_matrix = adj_matrix[:, q].dot(sp.diags(1.0 / (self.p[q] * self.rank)))
 
             if tf.is_tensor(node_attr):
                 node_attr = tf.gather(node_attr, q)
@@ -152,6 +253,23 @@ class FastGCNBatchSequence(Sequence):
 
         return self.astensors((node_attr, adj_matrix), y)
 
+    def sample(self, adj_matrix):
+        """Sample `rank` nodes for the batch rows `adj_matrix`."""
+        rank = self.rank
+        if self.replace:
+            return np.searchsorted(self.cdf, np.random.random(rank) * self.cdf[-1],
+                                   side='right').clip(max=self.cdf.size - 1)
+
+        # the neighbors of the batch nodes
+        distr = np.unique(adj_matrix.indices)
+        if rank >= distr.size:
+            return distr
+        # weighted sampling without replacement with exponential keys,
+        # which follows the same distribution as `np.random.choice`
+        # but requires no renormalized CDF for each batch
+        keys = np.log(np.random.random(distr.size)) / self.p[distr]
+        return distr[np.argpartition(keys, distr.size - rank)[distr.size - rank:]]
+
     def full_batch(self):
         return (self.node_attr, self.adj_matrix), self.y
 
@@ -0,0 +1,86 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from graphgallery.sequence.base_sequence import Sequence
+
+
+class PrefetchSequence(Sequence):
+    """Wrap a `graphgallery.Sequence` and build its batches in
+    background threads, so that batch construction (sampling,
+    slicing and `astensors`) overlaps with the model step.
+
+    Example
+    -------
+    >>> sequence = PrefetchSequence(sequence, workers=2, max_queue_size=10)
+    >>> for inputs, labels in sequence:
+    ...     model.train_on_batch(inputs, labels)
+    """
+
+    def __init__(
+        self,
+        sequence,
+        workers=1,
+        max_queue_size=10,
+        ordered=True,
+        *args, **kwargs
+    ):
+        """
+        Parameters
+        ----------
+        sequence: `graphgallery.Sequence`, the sequence to wrap.
+        workers: positive integer, the number of background threads.
+        max_queue_size: positive integer, the maximum number of batches
+            that are built ahead of the consumer.
+        ordered: bool, whether to yield batches in the order of `sequence`.
+            If False, batches are yielded as soon as they are ready.
+        """
+        kwargs.setdefault('device', sequence.device)
+        super().__init__(*args, **kwargs)
+        assert workers >= 1 and max_queue_size >= 1
+        self.sequence = sequence
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.ordered = ordered
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def __getitem__(self, index):
+        return self.sequence[index]
+
+    def __iter__(self):
+        n_batches = len(self.sequence)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                for index in range(n_batches):
+                    if len(pending) >= self.max_queue_size:
+                        yield from self._next_ready(pending)
+                    pending.append(executor.submit(self.sequence.__getitem__, index))
+                while pending:
+                    yield from self._next_ready(pending)
+            finally:
+                # stop building batches when the consumer breaks early
+                for future in pending:
+                    future.cancel()
+
+    def _next_ready(self, pending):
+        if self.ordered:
+            future = pending.popleft()
+        else:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            future = done.pop()
+            pending.remove(future)
+        yield future.result()
+
+    def on_epoch_end(self):
+        self.sequence.on_epoch_end()
+
+    def _shuffle_batches(self):
+        self.sequence._shuffle_batches()
+
+    def __getattr__(self, attr):
+        # delegate sequence-specific attributes, e.g., `x` and `y`
+        if attr == 'sequence':
+            raise AttributeError(attr)
+        return getattr(self.sequence, attr)
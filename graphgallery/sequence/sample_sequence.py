@@ -3,6 +3,7 @@ import numpy as np
 import tensorflow as tf
 
 from graphgallery.sequence.base_sequence import Sequence
+from graphgallery import functional as gf
 
 
 class SBVATSampleSequence(Sequence):
@@ -20,6 +21,8 @@ class SBVATSampleSequence(Sequence):
         self.x = x
         self.y = y
         self.neighbors = neighbors
+        # CSR layout of `neighbors` for the compiled sampler
+        self._neighbors_csr = gf.neighbors_to_csr(neighbors)
         self.num_nodes = x[0].shape[0]
         self.n_samples = n_samples
         self.adv_mask = self.smple_nodes()
@@ -36,17 +39,7 @@ class SBVATSampleSequence(Sequence):
             self.adv_mask = self.smple_nodes()
 
     def smple_nodes(self):
-        N = self.num_nodes
-        flag = np.zeros(N, dtype=np.bool)
-        adv_index = np.zeros(self.n_samples, dtype='int32')
-        for i in range(self.n_samples):
-            n = np.random.randint(0, N)
-            while flag[n]:
-                n = np.random.randint(0, N)
-            adv_index[i] = n
-            flag[self.neighbors[n]] = True
-            if flag.sum() == N:
-                break
-        adv_mask = np.zeros(N, dtype='float32')
+        adv_index = gf.sample_independent_nodes(self._neighbors_csr, self.n_samples)
+        adv_mask = np.zeros(self.num_nodes, dtype='float32')
         adv_mask[adv_index] = 1.
         return adv_mask
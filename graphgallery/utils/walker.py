@@ -1,115 +1,305 @@
-import random
 import numpy as np
+import scipy.sparse as sp
 
+from numba import njit, prange
 
-def create_alias_table(area_ratio):
-    """
+__all__ = ['alias_tables', 'deepwalk_random_walk', 'node2vec_random_walk',
+           'WalkCorpus']
 
-    :param area_ratio: sum(area_ratio)=1
-    :return: accept,alias
-    """
-    l = len(area_ratio)
-    accept, alias = [0] * l, [0] * l
-    small, large = [], []
-    area_ratio_ = np.array(area_ratio) * l
-    for i, prob in enumerate(area_ratio_):
-        if prob < 1.0:
-            small.append(i)
-        else:
-            large.append(i)
-
-    while small and large:
-        small_idx, large_idx = small.pop(), large.pop()
-        accept[small_idx] = area_ratio_[small_idx]
-        alias[small_idx] = large_idx
-        area_ratio_[large_idx] = area_ratio_[large_idx] - (1 - area_ratio_[small_idx])
-        if area_ratio_[large_idx] < 1.0:
-            small.append(large_idx)
-        else:
-            large.append(large_idx)
+# walks starting from the nodes in the same chunk share one seeded
+# random stream, which makes the walks independent of the number of threads
+CHUNK_SIZE = 1024
 
-    while large:
-        large_idx = large.pop()
-        accept[large_idx] = 1
-    while small:
-        small_idx = small.pop()
-        accept[small_idx] = 1
+
+@njit(parallel=True, nogil=True)
+def _alias_tables(indptr, data):
+    """Build the alias tables of all nodes, stored aligned with
+    the CSR `indices`, where `alias` refers to positions in `indices`."""
+    N = indptr.size - 1
+    accept = np.ones(data.size, dtype=np.float64)
+    alias = np.arange(data.size)
+    for n in prange(N):
+        start, end = indptr[n], indptr[n + 1]
+        degree = end - start
+        if degree == 0:
+            continue
+        area_ratio = data[start:end] * (degree / data[start:end].sum())
+        small = np.empty(degree, dtype=np.int64)
+        large = np.empty(degree, dtype=np.int64)
+        n_small = n_large = 0
+        for i in range(degree):
+            if area_ratio[i] < 1.0:
+                small[n_small] = i
+                n_small += 1
+            else:
+                large[n_large] = i
+                n_large += 1
+
+        while n_small > 0 and n_large > 0:
+            n_small -= 1
+            n_large -= 1
+            small_idx, large_idx = small[n_small], large[n_large]
+            accept[start + small_idx] = area_ratio[small_idx]
+            alias[start + small_idx] = start + large_idx
+            area_ratio[large_idx] -= 1.0 - area_ratio[small_idx]
+            if area_ratio[large_idx] < 1.0:
+                small[n_small] = large_idx
+                n_small += 1
+            else:
+                large[n_large] = large_idx
+                n_large += 1
 
     return accept, alias
 
 
-def alias_sample(accept, alias):
-    """
+def alias_tables(adj_matrix: sp.csr_matrix):
+    """Build the alias tables for weighted neighbor sampling of all nodes.
 
-    :param accept:
-    :param alias:
-    :return: sample index
+    Returns
+    -------
+    accept, alias: np.ndarray
+        arrays aligned with `adj_matrix.indices`, a neighbor of node `n`
+        is sampled by picking a position `i` in `indptr[n]:indptr[n+1]`
+        uniformly and returning `indices[i]` with probability `accept[i]`
+        and `indices[alias[i]]` otherwise.
     """
-    N = len(accept)
-    i = int(random.random() * N)
-    r = random.random()
-    if r < accept[i]:
+    adj_matrix = adj_matrix.tocsr(copy=False)
+    return _alias_tables(adj_matrix.indptr, adj_matrix.data.astype(np.float64))
+
+
+@njit(nogil=True)
+def _alias_sample(start, degree, accept, alias):
+    i = start + np.random.randint(0, degree)
+    if np.random.random() < accept[i]:
         return i
-    else:
-        return alias[i]
+    return alias[i]
 
 
-class RandomWalker:
-    def __init__(self, G, p=1, q=1):
-        """
-        :param G:
-        :param p: Return parameter,controls the likelihood of immediately revisiting a node in the walk.
-        :param q: In-out parameter,allows the search to differentiate between “inward” and “outward” nodes
-        """
-        self.G = G
-        self.p = p
-        self.q = q
+@njit(nogil=True)
+def _is_neighbor(indices, indptr, u, v):
+    """Binary search of `v` in the sorted neighbors of `u`."""
+    lo, hi = indptr[u], indptr[u + 1]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if indices[mid] < v:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo < indptr[u + 1] and indices[lo] == v
 
-    def get_alias_edge(self, t, v):
-        """
-        compute unnormalized transition probability between nodes v and its neighbors give the previous visited node t.
-        :param t:
-        :param v:
-        :return:
-        """
-        G = self.G
-        p = self.p
-        q = self.q
 
-        unnormalized_probs = []
-        for x in G.neighbors(v):
-            weight = G[v][x].get('weight', 1.0)  # w_vx
+@njit(parallel=True, nogil=True)
+def _deepwalk_random_walk(indices, indptr, start_nodes, walk_length, seed):
+    n_walks = start_nodes.size
+    walks = np.full((n_walks, walk_length), -1, dtype=indices.dtype)
+    n_chunks = (n_walks + CHUNK_SIZE - 1) // CHUNK_SIZE
+    for chunk in prange(n_chunks):
+        np.random.seed(seed + chunk)
+        end = min(n_walks, (chunk + 1) * CHUNK_SIZE)
+        for w in range(chunk * CHUNK_SIZE, end):
+            walk = walks[w]
+            current = start_nodes[w]
+            walk[0] = current
+            for step in range(1, walk_length):
+                start = indptr[current]
+                degree = indptr[current + 1] - start
+                if degree == 0:
+                    break
+                current = indices[start + np.random.randint(0, degree)]
+                walk[step] = current
+
+    return walks
+
 
-            if x == t:  # d_tx == 0
-                unnormalized_probs.append(weight / p)
-            elif G.has_edge(x, t):  # d_tx == 1
-                unnormalized_probs.append(weight)
-            else:  # d_tx > 1
-                unnormalized_probs.append(weight / q)
+@njit(parallel=True, nogil=True)
+def _node2vec_random_walk(indices, indptr, accept, alias, start_nodes,
+                          walk_length, p, q, seed):
+    n_walks = start_nodes.size
+    walks = np.full((n_walks, walk_length), -1, dtype=indices.dtype)
+    inv_p, inv_q = 1.0 / p, 1.0 / q
+    max_prob = max(inv_p, 1.0, inv_q)
+    n_chunks = (n_walks + CHUNK_SIZE - 1) // CHUNK_SIZE
+    for chunk in prange(n_chunks):
+        np.random.seed(seed + chunk)
+        end = min(n_walks, (chunk + 1) * CHUNK_SIZE)
+        for w in range(chunk * CHUNK_SIZE, end):
+            walk = walks[w]
+            current = start_nodes[w]
+            walk[0] = current
+            for step in range(1, walk_length):
+                start = indptr[current]
+                degree = indptr[current + 1] - start
+                if degree == 0:
+                    break
+                if step == 1:
+                    nxt = indices[_alias_sample(start, degree, accept, alias)]
+                else:
+                    # rejection sampling: propose by the edge weights and
+                    # accept by the (unnormalized) return/in-out bias
+                    prev = walk[step - 2]
+                    while True:
+                        nxt = indices[_alias_sample(start, degree, accept, alias)]
+                        if nxt == prev:
+                            prob = inv_p
+                        elif _is_neighbor(indices, indptr, nxt, prev):
+                            prob = 1.0
+                        else:
+                            prob = inv_q
+                        if np.random.random() * max_prob < prob:
+                            break
+                walk[step] = nxt
+                current = nxt
 
-        norm_const = sum(unnormalized_probs)
-        normalized_probs = [float(u_prob) / norm_const for u_prob in unnormalized_probs]
+    return walks
 
-        return create_alias_table(normalized_probs)
 
-    def preprocess_transition_probs(self):
+def deepwalk_random_walk(adj_matrix: sp.csr_matrix,
+                         walk_length: int = 80,
+                         walks_per_node: int = 10,
+                         seed: int = None) -> np.ndarray:
+    """Generate the uniform first-order random walks of DeepWalk,
+    in parallel over the start nodes.
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the adjacency matrix of the graph.
+    walk_length : int, optional
+        the length of each walk, by default 80
+    walks_per_node : int, optional
+        the number of walks starting from each node, by default 10
+    seed : int, optional
+        the random seed, by default None, i.e., drawn from `np.random`.
+
+    Returns
+    -------
+    np.ndarray
+        shape [walks_per_node * num_nodes, walk_length], the walks,
+        where walks stopping at nodes without neighbors are padded with -1.
+    """
+    corpus = WalkCorpus(adj_matrix, walk_length=walk_length,
+                        walks_per_node=walks_per_node, seed=seed)
+    return corpus.walks(0, corpus.num_walks)
+
+
+def node2vec_random_walk(adj_matrix: sp.csr_matrix,
+                         walk_length: int = 80,
+                         walks_per_node: int = 10,
+                         p: float = 1.0,
+                         q: float = 1.0,
+                         seed: int = None) -> np.ndarray:
+    """Generate the (biased) second-order random walks of node2vec,
+    in parallel over the start nodes.
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the (weighted) adjacency matrix of the graph.
+    walk_length : int, optional
+        the length of each walk, by default 80
+    walks_per_node : int, optional
+        the number of walks starting from each node, by default 10
+    p : float, optional
+        return parameter, controls the likelihood of immediately
+        revisiting a node in the walk, by default 1.0
+    q : float, optional
+        in-out parameter, allows the search to differentiate
+        between "inward" and "outward" nodes, by default 1.0
+    seed : int, optional
+        the random seed, by default None, i.e., drawn from `np.random`.
+
+    Returns
+    -------
+    np.ndarray
+        shape [walks_per_node * num_nodes, walk_length], the walks,
+        where walks stopping at nodes without neighbors are padded with -1.
+    """
+    corpus = WalkCorpus(adj_matrix, walk_length=walk_length,
+                        walks_per_node=walks_per_node, p=p, q=q, seed=seed)
+    return corpus.walks(0, corpus.num_walks)
+
+
+class WalkCorpus:
+    """A re-iterable corpus of random walks for `gensim.models.Word2Vec`,
+    where each walk is a sentence of node ids (as strings).
+
+    Walks are generated in parallel block by block while iterating,
+    so memory is bounded by `batch_size` walks rather than all of them.
+    Every iteration yields the same walks for a fixed `seed`, which are
+    also identical to the walks returned by `deepwalk_random_walk`
+    or `node2vec_random_walk` with the same `seed`.
+
+    Example
+    -------
+    >>> corpus = WalkCorpus(adj_matrix, walk_length=80, walks_per_node=10)
+    >>> model = Word2Vec(corpus, min_count=0, sg=1)
+    """
+
+    def __init__(self, adj_matrix: sp.csr_matrix,
+                 walk_length: int = 80,
+                 walks_per_node: int = 10,
+                 p: float = None,
+                 q: float = None,
+                 batch_size: int = 2**16,
+                 seed: int = None):
         """
-        Preprocessing of transition probabilities for guiding the random walks.
+        Parameters
+        ----------
+        adj_matrix : sp.csr_matrix
+            the (weighted) adjacency matrix of the graph.
+        walk_length : int, optional
+            the length of each walk, by default 80
+        walks_per_node : int, optional
+            the number of walks starting from each node, by default 10
+        p, q : float, optional
+            the return and in-out parameters of node2vec walks,
+            by default None, i.e., uniform DeepWalk walks.
+        batch_size : int, optional
+            the number of walks generated at once, by default 2**16
+        seed : int, optional
+            the random seed, by default None, i.e., drawn from `np.random`.
         """
-        G = self.G
+        adj_matrix = adj_matrix.tocsr(copy=False)
+        self.node2vec = p is not None or q is not None
+        if self.node2vec:
+            if not adj_matrix.has_sorted_indices:
+                adj_matrix = adj_matrix.sorted_indices()
+            self.accept, self.alias = alias_tables(adj_matrix)
+            self.p = 1.0 if p is None else p
+            self.q = 1.0 if q is None else q
 
-        alias_nodes = {}
-        for node in G.nodes():
-            unnormalized_probs = [G[node][nbr].get('weight', 1.0)
-                                  for nbr in G.neighbors(node)]
-            norm_const = sum(unnormalized_probs)
-            normalized_probs = [float(u_prob) / norm_const for u_prob in unnormalized_probs]
-            alias_nodes[node] = create_alias_table(normalized_probs)
+        if seed is None:
+            seed = np.random.randint(0, 2**31 - 1)
 
-        alias_edges = {}
+        self.adj_matrix = adj_matrix
+        self.num_nodes = adj_matrix.shape[0]
+        self.num_walks = walks_per_node * self.num_nodes
+        self.walk_length = walk_length
+        # blocks are aligned with the random streams of chunks
+        self.batch_size = max(1, -(-batch_size // CHUNK_SIZE)) * CHUNK_SIZE
+        self.seed = seed
+
+    def walks(self, start: int, end: int) -> np.ndarray:
+        """Return the walks in [start, end) as an int array, padded with -1.
+        The i-th walk starts from node `i % num_nodes`."""
+        assert start % CHUNK_SIZE == 0
+        adj_matrix = self.adj_matrix
+        start_nodes = np.arange(start, end) % self.num_nodes
+        start_nodes = start_nodes.astype(adj_matrix.indices.dtype)
+        seed = self.seed + start // CHUNK_SIZE
+        if self.node2vec:
+            return _node2vec_random_walk(adj_matrix.indices, adj_matrix.indptr,
+                                         self.accept, self.alias, start_nodes,
+                                         self.walk_length, self.p, self.q, seed)
+        else:
+            return _deepwalk_random_walk(adj_matrix.indices, adj_matrix.indptr,
+                                         start_nodes, self.walk_length, seed)
 
-        for edge in G.edges():
-            alias_edges[edge] = self.get_alias_edge(edge[0], edge[1])
+    def __len__(self):
+        return self.num_walks
 
-        self.alias_nodes = alias_nodes
-        self.alias_edges = alias_edges
+    def __iter__(self):
+        for start in range(0, self.num_walks, self.batch_size):
+            walks = self.walks(start, min(start + self.batch_size, self.num_walks))
+            for walk in walks:
+                yield [str(node) for node in walk.tolist() if node >= 0]
@@ -14,7 +14,7 @@ install_requires = [
     'tensorflow>=2.1.0',
     'networkx>=2.3',
     'gensim>=3.8.0',
-    'numba>=0.46.0',
+    'numba>=0.49.0',
 ]
 
 setup_requires = ['pytest-runner']
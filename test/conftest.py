@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+
+@pytest.fixture
+def random_adj():
+    """A factory of random symmetric adjacency matrices in CSR format."""
+    def make(num_nodes, density=0.1, seed=42, dtype=np.float64, binary=False):
+        adj = sp.random(num_nodes, num_nodes, density=density, random_state=seed,
+                        format='csr', dtype=dtype)
+        if binary:
+            adj.data[:] = 1.
+        return adj.maximum(adj.T).tocsr()
+    return make
@@ -0,0 +1,23 @@
+import numpy as np
+import scipy.sparse as sp
+
+from graphgallery.data import Graph, is_npy_dir
+
+
+def test_npy_round_trip(tmp_path):
+    rng = np.random.RandomState(42)
+    adj = sp.random(20, 20, density=0.2, random_state=42, format='csr', dtype=np.float32)
+    node_attr = rng.rand(20, 5).astype(np.float32)
+    node_label = rng.randint(0, 3, size=20).astype(np.int32)
+    graph = Graph(adj, node_attr, node_label, metadata={"name": "test"})
+
+    dirpath = graph.to_npy(str(tmp_path / "graph"))
+    assert is_npy_dir(dirpath)
+    for mmap_mode in ('r', None):
+        loaded = Graph.from_npy(dirpath, mmap_mode=mmap_mode)
+        assert (loaded.adj_matrix != adj).nnz == 0
+        assert np.array_equal(loaded.node_attr, node_attr)
+        assert np.array_equal(loaded.node_label, node_label)
+        assert loaded.metadata == {"name": "test"}
+        # memory-mapped rather than loaded into memory
+        assert isinstance(loaded.node_attr, np.memmap) == (mmap_mode is not None)
@@ -0,0 +1,43 @@
+import numpy as np
+import scipy.sparse as sp
+
+from graphgallery import functional as gf
+
+
+def test_largest_eigval(random_adj):
+    adj = random_adj(50)
+    I = sp.eye(50)
+    lap = (I - gf.normalize_adj(adj, rate=-0.5)).tocsr()
+    exact = gf.largest_eigval(lap, method="exact")
+    assert np.isclose(exact, np.linalg.eigvalsh(lap.toarray()).max())
+    # Gershgorin, an upper bound
+    assert gf.largest_eigval(lap, method="bound") >= exact - 1e-8
+
+
+def test_scaled_laplacian_bound(random_adj):
+    adj = random_adj(50)
+    I = sp.eye(50)
+    lap = (I - gf.normalize_adj(adj, rate=-0.5)).tocsr()
+    for eigval in ("exact", "bound", 2.):
+        scaled_lap = gf.scaled_laplacian(adj, rate=-0.5, eigval=eigval)
+        if eigval == "exact":
+            lambda_max = gf.largest_eigval(lap)
+        elif eigval == "bound":
+            lambda_max = min(gf.largest_eigval(lap, method="bound"), 2.)
+        else:
+            lambda_max = eigval
+        assert np.allclose(scaled_lap.toarray(), (2. / lambda_max * lap - I).toarray())
+        # the spectrum of the scaled Laplacian is within [-1, 1]
+        assert np.abs(np.linalg.eigvalsh(scaled_lap.toarray())).max() <= 1. + 1e-6
+
+
+def test_cheby_basis(random_adj):
+    adj = random_adj(50)
+    scaled_lap = gf.scaled_laplacian(adj, eigval="bound").toarray()
+    basis = gf.cheby_basis(adj, order=4, eigval="bound")
+    expected = [np.eye(50), scaled_lap]
+    for _ in range(3):
+        expected.append(2 * scaled_lap @ expected[-1] - expected[-2])
+    assert len(basis) == 5
+    for t_k, expected_t_k in zip(basis, expected):
+        assert np.allclose(t_k.toarray(), expected_t_k)
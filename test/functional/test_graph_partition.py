@@ -0,0 +1,17 @@
+import numpy as np
+import scipy.sparse as sp
+
+from graphgallery import functional as gf
+
+
+def test_cluster_blocks_merge(random_adj):
+    # a weighted, directed graph
+    adj = sp.triu(random_adj(30, density=0.2), k=-3).tocsr()
+    cluster_member = [np.arange(c, 30, 4) for c in range(4)] + [np.arange(0)]
+    blocks = gf.ClusterBlocks(adj, cluster_member)
+    for clusters in ([0], [2, 0], [3, 4, 1], [1, 2, 3, 0]):
+        merged, nodes = blocks.merge(clusters)
+        assert np.array_equal(nodes, np.concatenate([cluster_member[c] for c in clusters]))
+        expected = adj[nodes][:, nodes]
+        assert merged.shape == expected.shape
+        assert (merged != expected).nnz == 0
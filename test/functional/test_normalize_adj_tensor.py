@@ -0,0 +1,42 @@
+import numpy as np
+import scipy.sparse as sp
+import tensorflow as tf
+import torch
+
+from graphgallery import functional as gf
+
+
+def with_isolated_node(adj):
+    adj = adj.tolil()
+    adj[0, :] = 0.
+    adj[:, 0] = 0.
+    return adj.tocoo()
+
+
+def test_normalize_adj_tensor_tensorflow(random_adj):
+    adj = with_isolated_node(random_adj(30, dtype=np.float32))
+    sparse_adj = tf.sparse.reorder(tf.SparseTensor(np.stack([adj.row, adj.col], axis=1).astype(np.int64),
+                                                   adj.data, adj.shape))
+    for rate, fill_weight in ((-0.5, 1.0), (-1.0, 0.), (-0.5, 0.)):
+        expected = gf.normalize_adj(adj.tocsr(), rate=rate, fill_weight=fill_weight).toarray()
+        out = gf.normalize_adj_tensor(sparse_adj, rate=rate, fill_weight=fill_weight,
+                                      backend="tensorflow")
+        assert isinstance(out, tf.SparseTensor)
+        assert np.allclose(tf.sparse.to_dense(tf.sparse.reorder(out)).numpy(), expected, atol=1e-6)
+        out = gf.normalize_adj_tensor(tf.constant(adj.toarray()), rate=rate, fill_weight=fill_weight,
+                                      backend="tensorflow")
+        assert np.allclose(out.numpy(), expected, atol=1e-6)
+
+
+def test_normalize_adj_tensor_torch(random_adj):
+    adj = with_isolated_node(random_adj(30, dtype=np.float32))
+    sparse_adj = torch.sparse_coo_tensor(np.stack([adj.row, adj.col]), adj.data, adj.shape)
+    for rate, fill_weight in ((-0.5, 1.0), (-1.0, 0.), (-0.5, 0.)):
+        expected = gf.normalize_adj(adj.tocsr(), rate=rate, fill_weight=fill_weight).toarray()
+        out = gf.normalize_adj_tensor(sparse_adj, rate=rate, fill_weight=fill_weight,
+                                      backend="torch")
+        assert out.is_sparse
+        assert np.allclose(out.to_dense().numpy(), expected, atol=1e-6)
+        out = gf.normalize_adj_tensor(torch.tensor(adj.toarray()), rate=rate, fill_weight=fill_weight,
+                                      backend="torch")
+        assert np.allclose(out.numpy(), expected, atol=1e-6)
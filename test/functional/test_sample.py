@@ -0,0 +1,22 @@
+import numpy as np
+
+from graphgallery import functional as gf
+
+
+def test_sample_independent_nodes(random_adj):
+    adj = random_adj(100, density=0.02)
+    neighbors = gf.find_4o_nbrs(adj, radius=1)
+    sampled = gf.sample_independent_nodes(neighbors, 20, seed=42)
+    assert 0 < sampled.size <= 20
+    assert ((sampled >= 0) & (sampled < 100)).all()
+    assert np.unique(sampled).size == sampled.size
+    # no sampled node is in the neighborhood of another
+    for i, node in enumerate(sampled):
+        assert not np.isin(np.delete(sampled, i), neighbors[node]).any()
+
+    assert np.array_equal(gf.sample_independent_nodes(neighbors, 20, seed=42), sampled)
+    # the same in CSR layout
+    csr = gf.neighbors_to_csr(neighbors)
+    assert np.array_equal(gf.sample_independent_nodes(csr, 20, seed=42), sampled)
+    # all nodes are visited
+    assert gf.sample_independent_nodes(neighbors, 1000, seed=42).size < 100
@@ -0,0 +1,36 @@
+import numpy as np
+import scipy.sparse as sp
+import pytest
+
+from graphgallery import functional as gf
+
+
+def test_spmm(random_adj):
+    adj = random_adj(150, density=0.05)
+    # an empty row and a row of all columns
+    adj = sp.vstack([adj, sp.csr_matrix((1, 150)), sp.csr_matrix(np.ones((1, 150)))]).tocsr()
+    x = np.random.RandomState(42).randn(150, 16)
+
+    for dtype in ('float32', 'float64'):
+        expected = (adj @ x).astype(dtype)
+        out = gf.spmm(adj, x, dtype=dtype)
+        assert out.dtype == dtype
+        assert np.allclose(out, expected, atol=1e-5)
+
+        buffer = np.empty_like(expected)
+        assert gf.spmm(adj, x, out=buffer) is buffer
+        assert np.allclose(buffer, expected, atol=1e-5)
+
+    assert np.allclose(gf.spmm(adj, x[:, 0], dtype='float64'), adj @ x[:, 0])
+
+
+def test_spmm_invalid_inputs(random_adj):
+    adj = random_adj(10, density=0.2)
+    x = np.ones((10, 4), dtype='float32')
+    with pytest.raises(ValueError):
+        gf.spmm(adj, np.ones((20, 4)))
+    with pytest.raises(ValueError):
+        gf.spmm(adj, x, out=np.empty((10, 4), dtype='float64'), dtype='float32')
+    with pytest.raises(ValueError):
+        # in place
+        gf.spmm(adj, x, out=x)
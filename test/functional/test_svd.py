@@ -0,0 +1,33 @@
+import numpy as np
+import scipy.sparse as sp
+import pytest
+
+from graphgallery import functional as gf
+
+
+def dense_svd(adj_matrix, k, threshold, top_k):
+    U, S, V = sp.linalg.svds(adj_matrix, k=k)
+    expected = U @ np.diag(S) @ V
+    expected[expected <= threshold] = 0.
+    if top_k is not None:
+        smallest = np.argsort(expected, axis=1)[:, :-top_k]
+        np.put_along_axis(expected, smallest, 0., axis=1)
+    return expected
+
+
+def test_svd(random_adj):
+    adj = random_adj(100)
+    for threshold, top_k in ((0.01, None), (0.01, 5), (-np.inf, 10)):
+        expected = dense_svd(adj, 10, threshold, top_k)
+        # several blocks, computed concurrently
+        out = gf.svd(adj, k=10, threshold=threshold, top_k=top_k,
+                     block_size=16, workers=4)
+        assert sp.isspmatrix_csr(out)
+        assert np.allclose(out.toarray(), expected, rtol=0., atol=1e-10)
+        if top_k is not None:
+            assert np.diff(out.indptr).max() <= top_k
+
+
+def test_svd_invalid_top_k(random_adj):
+    with pytest.raises(ValueError):
+        gf.svd(random_adj(20), k=2, top_k=0)
@@ -0,0 +1,101 @@
+import os
+import os.path as osp
+import numpy as np
+import scipy.sparse as sp
+import pytest
+
+import graphgallery as gg
+from graphgallery import functional as gf
+
+
+class CountedTransform(gf.Transform):
+    cacheable = True
+
+    def __init__(self, scale=1.):
+        super().__init__()
+        self.scale = scale
+        self.calls = 0
+
+    def __call__(self, adj_matrix):
+        self.calls += 1
+        return self.scale * adj_matrix
+
+    def extra_repr(self):
+        return f"scale={self.scale}"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    yield gf.set_transform_cache(str(tmp_path), max_size=2**30)
+    gf.disable_transform_cache()
+
+
+def test_key(cache, random_adj, monkeypatch):
+    adj = random_adj(20)
+    key = cache.key(CountedTransform(), (adj,))
+    assert cache.key(CountedTransform(), (adj.copy(),)) == key
+    assert cache.key(CountedTransform(scale=2.), (adj,)) != key
+    assert cache.key(CountedTransform(), (2 * adj,)) != key
+
+    monkeypatch.setattr(gg, "floatx", lambda: "float16")
+    assert cache.key(CountedTransform(), (adj,)) != key
+    monkeypatch.undo()
+    monkeypatch.setattr(gg, "intx", lambda: "int8")
+    assert cache.key(CountedTransform(), (adj,)) != key
+
+
+def test_save_load(cache, random_adj):
+    adj = random_adj(20)
+    x = np.arange(12.).reshape(3, 4)
+    assert cache.load("missing") is None
+    assert cache.save("key", (adj, [x, adj.tocsc()]))
+    assert not cache.save("object", np.array([None, 1], dtype=object))
+
+    out_adj, (out_x, out_csc) = cache.load("key")
+    assert sp.isspmatrix_csr(out_adj) and sp.isspmatrix_csc(out_csc)
+    assert (out_adj != adj).nnz == 0 and (out_csc != adj).nnz == 0
+    assert isinstance(out_x, np.memmap) and out_x.mode == "c"
+    assert np.array_equal(out_x, x)
+    # copy-on-write, the cached file is unchanged
+    out_x[:] = 0.
+    assert np.array_equal(cache.load("key")[1][0], x)
+
+    def fill(array):
+        array[:] = x
+
+    out = cache.save_memmap("memmap", (3, 4), x.dtype, fill)
+    assert isinstance(out, np.memmap) and out.mode == "c"
+    assert np.array_equal(out, x)
+
+
+def test_evict(cache):
+    x = np.zeros(1000)
+    cache.save("a", x)
+    cache.save("b", x)
+    size = cache.entries()[0][1]
+    for i, key in enumerate("ab"):
+        os.utime(osp.join(cache.root, key, "manifest.json"), (i, i))
+    # "a" becomes the most recently used
+    cache.load("a")
+    cache.max_size = 2 * size
+    cache.save("c", x)
+    assert sorted(key for key, _, _ in cache.entries()) == ["a", "c"]
+    assert cache.size() <= cache.max_size
+
+
+def test_cached_transform(cache, random_adj):
+    assert isinstance(gf.get(gf.SVD()), gf.CachedTransform)
+    assert isinstance(gf.get("svd"), gf.CachedTransform)
+    assert not isinstance(gf.get(gf.NormalizeAdj()), gf.CachedTransform)
+    assert not isinstance(gf.get(gf.get(gf.SVD())).transform, gf.CachedTransform)
+
+    adj = random_adj(20)
+    transform = gf.get(CountedTransform(scale=2.))
+    assert repr(transform) == "CountedTransform(scale=2.0)"
+    assert (transform(adj) != 2. * adj).nnz == 0
+    assert (transform(adj) != 2. * adj).nnz == 0
+    assert transform.calls == 1
+
+    gf.disable_transform_cache()
+    transform(adj)
+    assert transform.calls == 2
@@ -0,0 +1,39 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+from graphgallery import functional as gf
+from graphgallery.functional.adj_matrix.wavelet import laplacian, compute_cheb_coeff_basis
+
+
+def monomial_wavelet_basis(adj_matrix, order, wavelet_s, threshold, wavelet_normalize):
+    # the Chebyshev polynomials as full sparse matrix products
+    N = adj_matrix.shape[0]
+    I = sp.eye(N)
+    L = laplacian(adj_matrix) - I
+    monome = {0: I, 1: L}
+    for k in range(2, order + 1):
+        monome[k] = 2 * L @ monome[k - 1] - monome[k - 2]
+
+    def compute_wavelet(tau):
+        coeffs = compute_cheb_coeff_basis(tau, order)
+        w = np.sum([coeffs[k] * monome[k] for k in range(order + 1)])
+        w = gf.clip_matrix(w, threshold, strict=True)
+        if wavelet_normalize:
+            w = normalize(w, norm='l1', axis=1)
+        return w
+
+    return compute_wavelet(wavelet_s), compute_wavelet(-wavelet_s)
+
+
+def test_wavelet_basis(random_adj):
+    # rows of the 3-hop neighborhoods exceed the buffers of the first pass,
+    # which are recomputed, across several blocks
+    adj_matrix = random_adj(500, density=0.024, binary=True)
+    for order, wavelet_normalize in ((2, False), (3, True)):
+        expected = monomial_wavelet_basis(adj_matrix, order, 1.2, 1e-4, wavelet_normalize)
+        bases = gf.wavelet_basis(adj_matrix, order=order, wavelet_s=1.2, threshold=1e-4,
+                                 wavelet_normalize=wavelet_normalize, block_size=128)
+        for basis, expected_basis in zip(bases, expected):
+            assert basis.nnz == expected_basis.nnz
+            assert abs(basis - expected_basis).max() < 1e-6
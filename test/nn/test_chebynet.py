@@ -0,0 +1,24 @@
+import numpy as np
+import tensorflow as tf
+
+from graphgallery import functional as gf
+from graphgallery.nn.layers.tensorflow import ChebyConvolution
+
+
+def to_sparse_tensor(matrix):
+    matrix = matrix.tocoo()
+    indices = np.stack([matrix.row, matrix.col], axis=1).astype(np.int64)
+    return tf.sparse.reorder(tf.SparseTensor(indices, matrix.data.astype(np.float32), matrix.shape))
+
+
+def test_clenshaw(random_adj):
+    adj = random_adj(40)
+    x = np.random.RandomState(42).randn(40, 8).astype(np.float32)
+    for order in (2, 3, 5):
+        for eigval in ("exact", "bound"):
+            layer = ChebyConvolution(4, order=order, use_bias=True,
+                                     bias_initializer='glorot_uniform')
+            basis = [to_sparse_tensor(t_k) for t_k in gf.cheby_basis(adj, order=order, eigval=eigval)]
+            expected = layer([x, basis]).numpy()
+            laplacian = to_sparse_tensor(gf.scaled_laplacian(adj, eigval=eigval))
+            assert np.allclose(layer([x, laplacian]).numpy(), expected, atol=1e-4)
@@ -0,0 +1,55 @@
+import numpy as np
+import scipy.sparse as sp
+import torch
+
+from graphgallery.nn.layers.pytorch import GraphAttention, SparseGraphAttention
+
+
+def dense_copy(layer):
+    # the dense layer with the (stacked) weights of the sparse one
+    dense = GraphAttention(layer.in_channels, layer.out_channels,
+                           attn_heads=layer.attn_heads,
+                           reduction=layer.reduction,
+                           dropout=0.)
+    units = layer.out_channels
+    with torch.no_grad():
+        for head in range(layer.attn_heads):
+            dense.kernels[head].copy_(layer.kernel[:, head * units:(head + 1) * units])
+            dense.attn_kernel_self[head].copy_(layer.attn_kernel_self[head].view(-1, 1))
+            dense.attn_kernel_neighs[head].copy_(layer.attn_kernel_neighs[head].view(-1, 1))
+    return dense.eval()
+
+
+def to_sparse_tensor(matrix):
+    matrix = matrix.tocoo()
+    indices = torch.from_numpy(np.stack([matrix.row, matrix.col]).astype(np.int64))
+    return torch.sparse_coo_tensor(indices, torch.from_numpy(matrix.data),
+                                   matrix.shape).coalesce()
+
+
+def test_sparse_gat(random_adj):
+    torch.manual_seed(42)
+    x = torch.randn(50, 16)
+    # with self-loops, so that no node is isolated
+    adj = random_adj(50, density=0.08, dtype=np.float32, binary=True)
+    adj = to_sparse_tensor(adj + sp.eye(50, dtype=np.float32))
+    for reduction in ('concat', 'average'):
+        layer = SparseGraphAttention(16, 8, attn_heads=4, reduction=reduction, dropout=0.).eval()
+        dense = dense_copy(layer)
+        # large logits, where the scores of a node's neighbors
+        # are far from the largest score of the graph
+        for scale in (1., 1e3):
+            out = layer([scale * x, adj])
+            assert torch.isfinite(out).all()
+            assert torch.allclose(out, dense([scale * x, adj]), atol=1e-4, rtol=1e-4)
+
+
+def test_sparse_gat_isolated_nodes():
+    torch.manual_seed(42)
+    x = torch.randn(5, 16)
+    indices = torch.tensor([[0, 0, 1, 1], [0, 1, 0, 1]])
+    adj = torch.sparse_coo_tensor(indices, torch.ones(4), (5, 5))
+    layer = SparseGraphAttention(16, 8, attn_heads=2, dropout=0.).eval()
+    out = layer([x, adj])
+    assert torch.isfinite(out).all()
+    assert (out[2:] == 0).all()
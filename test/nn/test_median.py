@@ -0,0 +1,37 @@
+import numpy as np
+import tensorflow as tf
+
+from graphgallery.nn.layers.tensorflow.conv.median import MedianConvolution
+
+
+def median_aggregation(h, neighbors):
+    return np.stack([np.median(h[neighbor], axis=0) if len(neighbor)
+                     else np.zeros(h.shape[1], dtype=h.dtype)
+                     for neighbor in neighbors])
+
+
+def test_median_convolution(random_adj):
+    rng = np.random.RandomState(42)
+    x = rng.randn(30, 8).astype(np.float32)
+    # degrees from 1 to about 24, across several buckets
+    adj = random_adj(30, density=0.5)
+    neighbors = [adj.indices[adj.indptr[node]:adj.indptr[node + 1]][:node + 1]
+                 for node in range(30)]
+    layer = MedianConvolution(4, n_buckets=3)
+    out = layer([x, neighbors]).numpy()
+    h = x @ layer.kernel.numpy()
+    assert np.allclose(out, median_aggregation(h, neighbors), atol=1e-5)
+
+
+def test_median_convolution_isolated_nodes():
+    rng = np.random.RandomState(42)
+    x = rng.randn(6, 8).astype(np.float32)
+    # the first bucket holds isolated nodes only
+    neighbors = [np.array([], dtype=np.int64), np.array([], dtype=np.int64),
+                 np.array([0, 1, 3]), np.array([2, 4]), np.array([0, 1, 2, 5]),
+                 np.array([1, 3, 4])]
+    layer = MedianConvolution(4, n_buckets=2)
+    out = layer([x, neighbors]).numpy()
+    h = x @ layer.kernel.numpy()
+    assert np.allclose(out, median_aggregation(h, neighbors), atol=1e-5)
+    assert (out[:2] == 0).all()
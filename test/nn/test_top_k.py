@@ -0,0 +1,18 @@
+import numpy as np
+import scipy.sparse as sp
+import tensorflow as tf
+
+from graphgallery.nn.layers.tensorflow import Top_k_features
+
+
+def test_top_k_features(random_adj):
+    rng = np.random.RandomState(42)
+    x = rng.rand(40, 8).astype(np.float32)
+    # degrees from 0 to about 30, across several buckets
+    adj = sp.tril(random_adj(40, density=0.5, dtype=np.float32), k=-1).tocoo()
+    sparse_adj = tf.SparseTensor(np.stack([adj.row, adj.col], axis=1).astype(np.int64),
+                                 adj.data, adj.shape)
+    layer = Top_k_features(4, n_buckets=3)
+    out = layer([x, sparse_adj]).numpy()
+    assert out.shape == (40, 5, 8)
+    assert np.allclose(out, layer([x, adj.toarray()]).numpy())
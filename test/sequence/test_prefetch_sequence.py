@@ -0,0 +1,50 @@
+import time
+import threading
+
+from graphgallery.sequence import Sequence, PrefetchSequence
+
+
+class SlowSequence(Sequence):
+    def __init__(self, n_batches, delay=0.01):
+        super().__init__()
+        self.n_batches = n_batches
+        self.delay = delay
+        self.built = []
+
+    def __len__(self):
+        return self.n_batches
+
+    def __getitem__(self, index):
+        # the earlier batches are slower, so that they complete out of order
+        time.sleep(self.delay * (self.n_batches - index) / self.n_batches)
+        self.built.append(index)
+        return index
+
+
+def executor_threads():
+    return {thread for thread in threading.enumerate()
+            if thread.name.startswith("ThreadPoolExecutor")}
+
+
+def test_prefetch_order():
+    sequence = SlowSequence(20)
+    for workers in (1, 4):
+        assert list(PrefetchSequence(sequence, workers=workers, max_queue_size=5)) == list(range(20))
+    unordered = PrefetchSequence(sequence, workers=4, max_queue_size=5, ordered=False)
+    assert sorted(unordered) == list(range(20))
+
+
+def test_prefetch_early_break():
+    threads = executor_threads()
+    sequence = SlowSequence(1000, delay=0.05)
+    iterator = iter(PrefetchSequence(sequence, workers=4, max_queue_size=8))
+    assert [next(iterator) for _ in range(3)] == [0, 1, 2]
+
+    start = time.perf_counter()
+    iterator.close()
+    # the queued batches are cancelled, only the running ones are waited for
+    assert time.perf_counter() - start < 1.
+    assert executor_threads() == threads
+    n_built = len(sequence.built)
+    time.sleep(0.1)
+    assert len(sequence.built) == n_built <= 3 + 8